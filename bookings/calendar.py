@@ -0,0 +1,111 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from .models import EquipmentBooking, WorkspaceBooking
+
+VERSION_KEY = 'bookings:calendar:version'
+CACHE_TIMEOUT = getattr(settings, 'BOOKINGS_CALENDAR_CACHE_TIMEOUT', 300)
+
+STATUS_COLORS = {
+    'PENDING': '#FFC107',   # Yellow
+    'APPROVED': '#4CAF50',  # Green
+    'REJECTED': '#F44336',  # Red
+    'CANCELLED': '#9E9E9E', # Gray
+    'COMPLETED': '#2196F3'  # Blue
+}
+DEFAULT_COLOR = '#9C27B0'  # Purple
+
+# Columns shared by both booking tables, plus the resource's own
+COLUMNS = [
+    'id', 'status', 'purpose', 'project_name', 'notes', 'user_id',
+    'user__first_name', 'user__last_name', 'slot__date', 'slot__start_time', 'slot__end_time',
+]
+
+
+def current_version():
+    """
+    The stamp cached calendars are keyed by. It is kept in the shared cache so
+    every process sees a bump; the calendars themselves stay in the local one.
+    """
+    stamps = caches['shared']
+    version = stamps.get(VERSION_KEY)
+    if version is None:
+        # A fresh stamp can never match entries cached under an evicted one
+        stamps.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = stamps.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached calendar. Call it once the write has committed."""
+    # A new stamp rather than incr(): the file backend's incr is a read and a
+    # write, and two processes bumping at once could land on the same value
+    caches['shared'].set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _event(row, resource_type, resource):
+    user_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+    return {
+        'id': f"{resource_type.lower()}_{row['id']}",
+        'title': f"{row[resource + '__name']} - {user_name}",
+        'start': f"{row['slot__date']}T{row['slot__start_time']}",
+        'end': f"{row['slot__date']}T{row['slot__end_time']}",
+        'resourceType': resource_type,
+        'resourceId': row[resource + '_id'],
+        'resourceName': row[resource + '__name'],
+        'status': row['status'],
+        'userId': row['user_id'],
+        'userName': user_name,
+        'lab': row[resource + '__lab'],
+        'purpose': row['purpose'],
+        'projectName': row['project_name'],
+        'notes': row['notes'],
+        'color': STATUS_COLORS.get(row['status'], DEFAULT_COLOR),
+    }
+
+
+def build_events(start_date, end_date, resource_type=None, equipment_id=None, workspace_id=None,
+                 status=None, lab=None):
+    """
+    Calendar events for bookings whose slot falls in [start_date, end_date],
+    one joined values() query per booking table.
+    """
+    events = []
+    if resource_type != 'WORKSPACE':
+        bookings = EquipmentBooking.objects.filter(slot__date__gte=start_date, slot__date__lte=end_date)
+        if status:
+            bookings = bookings.filter(status=status)
+        if equipment_id:
+            bookings = bookings.filter(equipment_id=equipment_id)
+        if lab:
+            bookings = bookings.filter(equipment__lab=lab)
+        for row in bookings.values(*COLUMNS, 'equipment_id', 'equipment__name', 'equipment__lab'):
+            events.append(_event(row, 'EQUIPMENT', 'equipment'))
+
+    if resource_type != 'EQUIPMENT':
+        bookings = WorkspaceBooking.objects.filter(slot__date__gte=start_date, slot__date__lte=end_date)
+        if status:
+            bookings = bookings.filter(status=status)
+        if workspace_id:
+            bookings = bookings.filter(workspace_id=workspace_id)
+        if lab:
+            bookings = bookings.filter(workspace__lab=lab)
+        for row in bookings.values(*COLUMNS, 'participants_count', 'workspace_id', 'workspace__name', 'workspace__lab'):
+            event = _event(row, 'WORKSPACE', 'workspace')
+            event['participantsCount'] = row['participants_count']
+            events.append(event)
+    return events
+
+
+def get_events(**params):
+    """build_events(), cached per parameter set under the current version stamp."""
+    fingerprint = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    key = f'bookings:calendar:{current_version()}:{fingerprint}'
+    events = cache.get(key)
+    if events is None:
+        events = build_events(**params)
+        cache.set(key, events, CACHE_TIMEOUT)
+    return events
@@ -0,0 +1,38 @@
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .intervals import overlapping
+
+
+class BookingConflict(APIException):
+    """Raised from a save when the slot is taken; DRF turns it into a 409."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This time slot overlaps an existing booking.'
+    default_code = 'conflict'
+
+    def __init__(self, message=None, **extra):
+        super().__init__({'error': message or self.default_detail, **extra})
+
+
+def create_booking(model, resource, validated_data):
+    """
+    Insert a booking unless an active booking of the same resource overlaps
+    its slot. The check and the insert share one transaction that first
+    locks the resource row (SQLite's IMMEDIATE transactions hold the write
+    lock instead), so concurrent requests for one resource queue up and see
+    each other's bookings. The partial unique constraint on (resource, slot)
+    backs this up: losing that race is a conflict too, not a 500.
+    """
+    target = validated_data[resource]
+    message = f"This time slot overlaps an existing booking for this {resource}."
+    start_at, end_at = validated_data['slot'].interval
+    with transaction.atomic():
+        list(type(target).objects.select_for_update().filter(pk=target.pk).values_list('pk'))
+        if overlapping(model.objects.filter(**{resource: target}), start_at, end_at).exists():
+            raise BookingConflict(message)
+        try:
+            with transaction.atomic():
+                return model.objects.create(**validated_data)
+        except IntegrityError:
+            raise BookingConflict(message)
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+TTL = timedelta(seconds=getattr(settings, 'BOOKINGS_IDEMPOTENCY_TTL', 24 * 60 * 60))
+
+
+def fingerprint(request):
+    """A digest of what was asked for, to catch a key reused for a different request."""
+    payload = json.dumps([request.method, request.path, request.data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def replay(entry, digest):
+    if entry.fingerprint != digest:
+        return Response(
+            {"error": f"This {HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(entry.body, status=entry.status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def respond_once(request, handler):
+    """
+    Answer a POST with `handler()`, at most once per user and Idempotency-Key.
+
+    Without the header this is just handler(). With it, the key is claimed
+    by inserting its row before the handler runs, in the same transaction:
+    a concurrent retry waits on the unique constraint and then replays the
+    stored response. Exceptions (including 409 conflicts) and 5xx
+    responses roll the claim back, so those are retried for real.
+    """
+    key = request.headers.get(HEADER)
+    if not key:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {"error": f"{HEADER} may be at most {MAX_KEY_LENGTH} characters."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    digest = fingerprint(request)
+    now = timezone.now()
+    stored = IdempotencyKey.objects.filter(user=request.user, key=key, expires_at__gt=now)
+    entry = stored.first()
+    if entry is not None:
+        return replay(entry, digest)
+
+    with transaction.atomic():
+        IdempotencyKey.objects.filter(expires_at__lte=now).delete()
+        try:
+            with transaction.atomic():
+                entry = IdempotencyKey.objects.create(
+                    user=request.user, key=key, fingerprint=digest, expires_at=now + TTL
+                )
+        except IntegrityError:
+            entry = None
+        if entry is not None:
+            response = handler()
+            if response.status_code >= 500:
+                transaction.set_rollback(True)
+                return response
+            entry.status_code, entry.body = response.status_code, response.data
+            entry.save(update_fields=['status_code', 'body'])
+            return response
+    return replay(stored.get(), digest)
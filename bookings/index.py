@@ -0,0 +1,70 @@
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Subquery
+
+from .models import BookingIndex, EquipmentBooking, WorkspaceBooking
+
+# resource_type -> (booking model, resource field)
+RESOURCES = {
+    'EQUIPMENT': (EquipmentBooking, 'equipment'),
+    'WORKSPACE': (WorkspaceBooking, 'workspace'),
+}
+
+# Columns copied from the booking as they are
+COLUMNS = ['user_id', 'start_at', 'end_at', 'status', 'created_at']
+
+
+def resource_type_of(booking):
+    return 'EQUIPMENT' if isinstance(booking, EquipmentBooking) else 'WORKSPACE'
+
+
+def sync_booking(booking, created=False):
+    """
+    Write the index row of one booking, inserting it if it is new (or
+    missing). Updates read the lab in a subquery, so status changes don't
+    load the resource.
+    """
+    resource_type = resource_type_of(booking)
+    model, resource = RESOURCES[resource_type]
+    resource_id = getattr(booking, f'{resource}_id')
+    values = {'resource_id': resource_id}
+    values.update((column, getattr(booking, column)) for column in COLUMNS)
+    if not created:
+        labs = model._meta.get_field(resource).related_model.objects.filter(pk=resource_id).values('lab')
+        entries = BookingIndex.objects.filter(resource_type=resource_type, booking_id=booking.pk)
+        if entries.update(lab=Subquery(labs), **values):
+            return
+    BookingIndex.objects.create(
+        resource_type=resource_type, booking_id=booking.pk, lab=getattr(booking, resource).lab, **values
+    )
+
+
+def entries(resource_type, bookings):
+    """Unsaved index rows for a queryset of bookings, read with one values() query."""
+    resource = RESOURCES[resource_type][1]
+    rows = bookings.values('id', f'{resource}_id', f'{resource}__lab', *COLUMNS)
+    for row in rows.iterator(chunk_size=2000):
+        yield BookingIndex(
+            resource_type=resource_type,
+            booking_id=row['id'],
+            resource_id=row[f'{resource}_id'],
+            lab=row[f'{resource}__lab'],
+            **{column: row[column] for column in COLUMNS}
+        )
+
+
+def rebuild(batch_size=1000):
+    """
+    Replace the whole index with rows generated from the booking tables, in
+    one transaction. Returns the number of rows written.
+    """
+    written = 0
+    with transaction.atomic():
+        BookingIndex.objects.all().delete()
+        for resource_type, (model, _) in RESOURCES.items():
+            pending = entries(resource_type, model.objects.all())
+            while batch := list(islice(pending, batch_size)):
+                BookingIndex.objects.bulk_create(batch)
+                written += len(batch)
+    return written
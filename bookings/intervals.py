@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+# Bookings in these states hold their interval; the rest free it up
+ACTIVE_STATUSES = ['PENDING', 'APPROVED']
+
+# No booking is longer than this (a slot lies within one day, or wraps past
+# midnight into the next). Bounding the length turns "starts before my end
+# and ends after my start" into a range scan over (resource, start_at).
+MAX_BOOKING_SPAN = timedelta(hours=24)
+
+
+def slot_interval(day, start_time, end_time):
+    """The aware [start, end) datetimes of a slot; an end at or before the start is the next day."""
+    start = timezone.make_aware(datetime.combine(day, start_time))
+    end = timezone.make_aware(datetime.combine(day, end_time))
+    if end <= start:
+        end = timezone.make_aware(datetime.combine(day + timedelta(days=1), end_time))
+    return start, end
+
+
+def overlapping(queryset, start, end):
+    """
+    Active bookings in `queryset` whose [start_at, end_at) intersects
+    [start, end). The lower bound on start_at is implied by the overlap but
+    lets the (resource, start_at, end_at) index stop early instead of
+    walking every older booking of the resource.
+    """
+    return queryset.filter(
+        status__in=ACTIVE_STATUSES,
+        start_at__gt=start - MAX_BOOKING_SPAN,
+        start_at__lt=end,
+        end_at__gt=start,
+    )
+
+
+def overlapping_any(queryset, intervals):
+    """
+    Active bookings in `queryset` that intersect any of `intervals`, as one
+    query: the per-interval conditions of `overlapping` ORed together.
+    """
+    if not intervals:
+        return queryset.none()
+    condition = Q()
+    for start, end in intervals:
+        condition |= Q(start_at__gt=start - MAX_BOOKING_SPAN, start_at__lt=end, end_at__gt=start)
+    return queryset.filter(condition, status__in=ACTIVE_STATUSES)
+
+
+def merge_intervals(intervals):
+    """Sort and coalesce overlapping or touching intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def free_intervals(windows, busy):
+    """
+    The parts of `windows` (sorted, non-overlapping) that no `busy` interval
+    covers, in one sweep over both lists.
+    """
+    busy = merge_intervals(busy)
+    free, first = [], 0
+    for window_start, window_end in windows:
+        # Busy intervals that end before this window can't touch later ones either
+        while first < len(busy) and busy[first][1] <= window_start:
+            first += 1
+        cursor, index = window_start, first
+        while index < len(busy) and busy[index][0] < window_end:
+            if busy[index][0] > cursor:
+                free.append((cursor, busy[index][0]))
+            cursor = max(cursor, busy[index][1])
+            index += 1
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
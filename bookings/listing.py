@@ -0,0 +1,108 @@
+from django.db.models import Prefetch, Q
+from rest_framework.response import Response
+
+from inventory.models import MaintenanceRecord
+from inventory.pagination import MergedKeysetPagination
+from .models import EquipmentBooking, WorkspaceBooking
+from .serializers import EquipmentBookingSerializer, WorkspaceBookingSerializer
+
+# resource_type -> (model, serializer, select_related, prefetch_related). The
+# related lookups are exactly what the serializer walks, so loading a page
+# costs a fixed number of queries however many rows it holds.
+SOURCES = {
+    'EQUIPMENT': (EquipmentBooking, EquipmentBookingSerializer, [
+        'equipment__category', 'user', 'slot', 'approved_by',
+    ], [
+        Prefetch('equipment__maintenance_records', queryset=MaintenanceRecord.objects.select_related('performed_by')),
+    ]),
+    'WORKSPACE': (WorkspaceBooking, WorkspaceBookingSerializer, [
+        'workspace', 'user', 'slot', 'approved_by',
+    ], []),
+}
+
+ORDERING = ['created_at', 'resource_type', 'booking_id']
+
+
+def search_filter(text, fields):
+    """
+    Index rows whose booking's resource name or any of `fields` contains
+    `text`. Free text lives only in the booking tables, so each type is
+    matched there and joined back by id.
+    """
+    condition = Q()
+    for kind, (model, *_) in SOURCES.items():
+        matches = Q(**{f'{kind.lower()}__name__icontains': text})
+        for field in fields:
+            matches |= Q(**{f'{field}__icontains': text})
+        condition |= Q(resource_type=kind, booking_id__in=model.objects.filter(matches).values('id'))
+    return condition
+
+
+def _after(cursor, descending):
+    """
+    Rows strictly after the (created_at, resource_type, booking_id) cursor.
+    The bare bound on created_at is implied by the rest but gives the index
+    range a starting point.
+    """
+    at, kind, pk = cursor
+    before = 'lt' if descending else 'gt'
+    return Q(**{f'created_at__{before}e': at}) & (
+        Q(**{f'created_at__{before}': at})
+        | Q(**{f'resource_type__{before}': kind})
+        | Q(resource_type=kind, **{f'booking_id__{before}': pk})
+    )
+
+
+def index_queryset(bookings, cursor=None, descending=True):
+    """The keys of a filtered BookingIndex queryset, newest first, after `cursor`."""
+    if cursor is not None:
+        bookings = bookings.filter(_after(cursor, descending))
+    ordering = [f'-{field}' for field in ORDERING] if descending else ORDERING
+    return bookings.values(*ORDERING).order_by(*ordering)
+
+
+def serialize_bookings(rows):
+    """Serialize the bookings named by index `rows`, in order, tagged with their resource_type."""
+    ids = {}
+    for row in rows:
+        ids.setdefault(row['resource_type'], []).append(row['booking_id'])
+
+    loaded = {}
+    for kind, pks in ids.items():
+        model, serializer_class, related, prefetch = SOURCES[kind]
+        bookings = list(model.objects.select_related(*related).prefetch_related(*prefetch).filter(pk__in=pks))
+        for booking, data in zip(bookings, serializer_class(bookings, many=True).data):
+            data['resource_type'] = kind
+            loaded[kind, booking.pk] = data
+    keys = [(row['resource_type'], row['booking_id']) for row in rows]
+    return [loaded[key] for key in keys if key in loaded]
+
+
+class BookingListPagination(MergedKeysetPagination):
+    """
+    Keyset pagination over the booking index, newest first. `count` costs
+    one COUNT and is left out (null) with `?count=false`.
+    """
+    page_size = 10
+    max_page_size = 100
+    kinds = SOURCES
+
+    def paginate_bookings(self, bookings, request):
+        if request.query_params.get('count', '').lower() == 'false':
+            self.count = None
+        else:
+            self.count = bookings.count()
+        return self.paginate_union(
+            lambda cursor, descending: index_queryset(bookings, cursor, descending), request
+        )
+
+    def cursor_key(self, obj):
+        return obj['created_at'], obj['resource_type'], obj['booking_id']
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        })
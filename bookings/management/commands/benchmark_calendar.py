@@ -0,0 +1,119 @@
+import random
+import statistics
+import time
+from datetime import date, time as clock, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from bookings.calendar import build_events, get_events
+from bookings.intervals import slot_interval
+from bookings.models import BookingSlot, EquipmentBooking, Workspace, WorkspaceBooking
+from inventory.models import Category, Equipment
+
+LABS = ['IVE', 'CEZERI', 'MEDTECH']
+
+
+def per_object_events(start_date, end_date):
+    # What CalendarView did before: walk model instances and their relations
+    events = []
+    for booking in EquipmentBooking.objects.filter(slot__date__gte=start_date, slot__date__lte=end_date):
+        events.append((booking.slot.date, booking.equipment.name, booking.user.get_full_name(), booking.equipment.lab))
+    for booking in WorkspaceBooking.objects.filter(slot__date__gte=start_date, slot__date__lte=end_date):
+        events.append((booking.slot.date, booking.workspace.name, booking.user.get_full_name(), booking.workspace.lab))
+    return events
+
+
+class Command(BaseCommand):
+    help = 'Time the booking calendar over a synthetic window, against the old per-object loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        start_date = date.today() + timedelta(days=1)
+        end_date = start_date + timedelta(days=options['days'] - 1)
+        # Everything is seeded inside a transaction that is rolled back
+        with transaction.atomic():
+            self.seed(options['events'], start_date, options['days'])
+            self.stdout.write(
+                f"{options['events']} bookings over {options['days']} days in {len(LABS)} labs, "
+                f"{options['repeat']} runs each (median ms)"
+            )
+            cases = [
+                ('per-object loop', lambda: per_object_events(start_date, end_date)),
+                ('values() build', lambda: build_events(start_date, end_date)),
+                ('cached', lambda: get_events(start_date=start_date, end_date=end_date)),
+            ]
+            cache.clear()
+            self.stdout.write(f"{'':<18}{'ms':>10}{'queries':>9}{'events':>8}")
+            for label, fn in cases:
+                ms, queries, count = self.time(fn, options['repeat'])
+                self.stdout.write(f"{label:<18}{ms:>10.2f}{queries:>9}{count:>8}")
+            transaction.set_rollback(True)
+        cache.clear()
+
+    def seed(self, events, start_date, days):
+        rng = random.Random(0)
+        users = [
+            get_user_model().objects.create_user(
+                username=f'bench-calendar-{i}', first_name='Bench', last_name=f'User {i}'
+            )
+            for i in range(50)
+        ]
+        category = Category.objects.create(name='Bench calendar')
+        equipment = Equipment.objects.bulk_create([
+            Equipment(
+                name=f'Bench item {i}', serial_number=f'BENCH-CAL-SN-{i}', barcode=f'BENCH-CAL-BC-{i}',
+                category=category, lab=LABS[i % len(LABS)]
+            )
+            for i in range(150)
+        ])
+        workspaces = Workspace.objects.bulk_create([
+            Workspace(name=f'Bench space {i}', lab=LABS[i % len(LABS)], location='Bench')
+            for i in range(30)
+        ])
+        BookingSlot.objects.bulk_create([
+            BookingSlot(date=start_date + timedelta(days=day), start_time=clock(hour), end_time=clock(hour + 1))
+            for day in range(days) for hour in range(8, 18)
+        ], ignore_conflicts=True)
+        slots = list(BookingSlot.objects.filter(
+            date__gte=start_date, date__lt=start_date + timedelta(days=days), start_time__gte=clock(8)
+        ))
+
+        # Distinct (resource, slot) pairs, four in five of them for equipment
+        pairs = set()
+        while len(pairs) < events:
+            if rng.random() < 0.8:
+                pairs.add(('equipment', rng.choice(equipment), rng.choice(slots)))
+            else:
+                pairs.add(('workspace', rng.choice(workspaces), rng.choice(slots)))
+        rows = {'equipment': [], 'workspace': []}
+        for kind, resource, slot in pairs:
+            model = EquipmentBooking if kind == 'equipment' else WorkspaceBooking
+            start_at, end_at = slot_interval(slot.date, slot.start_time, slot.end_time)
+            rows[kind].append(model(
+                user=rng.choice(users), slot=slot, purpose='Benchmark', start_at=start_at, end_at=end_at,
+                status=rng.choice(['PENDING', 'APPROVED', 'COMPLETED']), **{kind: resource}
+            ))
+        EquipmentBooking.objects.bulk_create(rows['equipment'], batch_size=500)
+        WorkspaceBooking.objects.bulk_create(rows['workspace'], batch_size=500)
+
+    def time(self, fn, repeat):
+        timings, queries = [], []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        for _ in range(repeat):
+            queries.append(0)
+            with connection.execute_wrapper(count):
+                start = time.perf_counter()
+                result = fn()
+                timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), queries[-1], len(result)
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.models import SlotTemplate
+from bookings.slot_templates import generate_slots
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+
+def parse_weekdays(value):
+    """'mon-fri', 'tue,thu' or '0,2,4' -> sorted weekday numbers (Monday = 0)."""
+    days = set()
+    for part in value.lower().split(','):
+        bounds = [WEEKDAYS.index(name[:3]) if not name.isdigit() else int(name) for name in part.strip().split('-')]
+        if len(bounds) == 1:
+            bounds *= 2
+        if len(bounds) != 2 or not all(0 <= day <= 6 for day in bounds) or bounds[0] > bounds[1]:
+            raise ValueError(part)
+        days.update(range(bounds[0], bounds[1] + 1))
+    return sorted(days)
+
+
+class Command(BaseCommand):
+    help = (
+        'Expand slot templates into booking slots. Pass template IDs (default: all), '
+        'or describe a new template with --name, --weekdays, --start, --end, --minutes, --from and --to.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('templates', nargs='*', type=int, help='IDs of saved templates to expand.')
+        parser.add_argument('--name', help='Save a new template under this name and expand it.')
+        parser.add_argument('--weekdays', default='mon-fri', help="e.g. 'mon-fri' or 'tue,thu'. Default: mon-fri.")
+        parser.add_argument('--start', default='08:00', help='First slot start, HH:MM. Default: 08:00.')
+        parser.add_argument('--end', default='18:00', help='Last slot end, HH:MM. Default: 18:00.')
+        parser.add_argument('--minutes', type=int, default=30, help='Slot length. Default: 30.')
+        parser.add_argument('--from', dest='start_date', help='First day, YYYY-MM-DD.')
+        parser.add_argument('--to', dest='end_date', help='Last day, YYYY-MM-DD.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['name']:
+            templates = [self.create_template(options)]
+        elif options['templates']:
+            templates = list(SlotTemplate.objects.filter(id__in=options['templates']))
+            missing = set(options['templates']) - {template.id for template in templates}
+            if missing:
+                raise CommandError(f"No slot template with ID {', '.join(map(str, sorted(missing)))}.")
+        else:
+            templates = list(SlotTemplate.objects.all())
+
+        for template in templates:
+            total, created = generate_slots(template, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{template}: {created} slot(s) created, {total - created} already existed."
+            ))
+
+    def create_template(self, options):
+        try:
+            weekdays = parse_weekdays(options['weekdays'])
+        except ValueError:
+            raise CommandError("Invalid --weekdays. Use e.g. 'mon-fri', 'tue,thu' or '0,2,4'.")
+        try:
+            start_time = datetime.strptime(options['start'], '%H:%M').time()
+            end_time = datetime.strptime(options['end'], '%H:%M').time()
+        except ValueError:
+            raise CommandError("Invalid --start or --end time. Please use HH:MM.")
+        if not options['start_date'] or not options['end_date']:
+            raise CommandError("--from and --to are required with --name.")
+        try:
+            start_date = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(options['end_date'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError("Invalid --from or --to date. Please use YYYY-MM-DD.")
+        if start_time >= end_time or start_date > end_date or options['minutes'] < 5:
+            raise CommandError("The window and date range must not be empty, and slots must be at least 5 minutes.")
+        return SlotTemplate.objects.create(
+            name=options['name'], weekdays=weekdays, start_time=start_time, end_time=end_time,
+            slot_minutes=options['minutes'], start_date=start_date, end_date=end_date
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from bookings.index import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the booking index from the equipment and workspace booking tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the booking index with {written} row(s)."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_initial'),
+        ('inventory', '0008_hot_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['equipment', 'status'], name='bookings_eq_equipme_502ea7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['user', 'status'], name='bookings_eq_user_id_7959bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacebooking',
+            index=models.Index(fields=['workspace', 'status'], name='bookings_wo_workspa_d7ffb8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacebooking',
+            index=models.Index(fields=['user', 'status'], name='bookings_wo_user_id_efd1b2_idx'),
+        ),
+    ]
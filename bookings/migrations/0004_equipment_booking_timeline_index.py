@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_hot_filter_indexes'),
+        ('inventory', '0010_timeline_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['equipment', 'created_at', 'id'], name='bookings_eq_equipme_f9b3cc_idx'),
+        ),
+    ]
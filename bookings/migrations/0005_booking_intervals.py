@@ -0,0 +1,78 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:02
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+from bookings.intervals import slot_interval
+
+
+def copy_slot_intervals(apps, schema_editor):
+    BookingSlot = apps.get_model('bookings', 'BookingSlot')
+    EquipmentBooking = apps.get_model('bookings', 'EquipmentBooking')
+    WorkspaceBooking = apps.get_model('bookings', 'WorkspaceBooking')
+    for slot in BookingSlot.objects.iterator():
+        start_at, end_at = slot_interval(slot.date, slot.start_time, slot.end_time)
+        for model in (EquipmentBooking, WorkspaceBooking):
+            model.objects.filter(slot=slot).update(start_at=start_at, end_at=end_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_equipment_booking_timeline_index'),
+        ('inventory', '0012_open_checkout_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='equipmentbooking',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='workspacebooking',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='equipmentbooking',
+            name='end_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='equipmentbooking',
+            name='start_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='workspacebooking',
+            name='end_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='workspacebooking',
+            name='start_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_slot_intervals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['equipment', 'start_at', 'end_at'], name='bookings_eq_equipme_3b4d5d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacebooking',
+            index=models.Index(fields=['workspace', 'start_at', 'end_at'], name='bookings_wo_workspa_6baf35_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='equipmentbooking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['PENDING', 'APPROVED'])), fields=('equipment', 'slot'), name='bookings_equipment_slot_active_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='workspacebooking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['PENDING', 'APPROVED'])), fields=('workspace', 'slot'), name='bookings_workspace_slot_active_uniq'),
+        ),
+    ]
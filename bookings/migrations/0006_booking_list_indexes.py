@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_booking_intervals'),
+        ('inventory', '0012_open_checkout_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['created_at', 'id'], name='bookings_eq_created_cb7a4a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentbooking',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='bookings_eq_user_id_9aa414_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacebooking',
+            index=models.Index(fields=['created_at', 'id'], name='bookings_wo_created_6a645d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacebooking',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='bookings_wo_user_id_d2e1ee_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_booking_index(apps, schema_editor):
+    BookingIndex = apps.get_model('bookings', 'BookingIndex')
+    for resource_type, model_name, resource in [
+        ('EQUIPMENT', 'EquipmentBooking', 'equipment'),
+        ('WORKSPACE', 'WorkspaceBooking', 'workspace'),
+    ]:
+        rows = apps.get_model('bookings', model_name).objects.values(
+            'id', f'{resource}_id', f'{resource}__lab', 'user_id', 'start_at', 'end_at', 'status', 'created_at'
+        )
+        BookingIndex.objects.bulk_create(
+            (
+                BookingIndex(
+                    resource_type=resource_type, booking_id=row['id'], resource_id=row[f'{resource}_id'],
+                    lab=row[f'{resource}__lab'], user_id=row['user_id'], start_at=row['start_at'],
+                    end_at=row['end_at'], status=row['status'], created_at=row['created_at'],
+                )
+                for row in rows.iterator(chunk_size=2000)
+            ),
+            batch_size=1000
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_booking_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource_type', models.CharField(choices=[('EQUIPMENT', 'Equipment'), ('WORKSPACE', 'Workspace')], max_length=10)),
+                ('booking_id', models.BigIntegerField()),
+                ('resource_id', models.BigIntegerField()),
+                ('lab', models.CharField(max_length=20)),
+                ('start_at', models.DateTimeField()),
+                ('end_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled'), ('COMPLETED', 'Completed')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Booking index',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='equipmentbooking',
+            name='bookings_eq_created_cb7a4a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='equipmentbooking',
+            name='bookings_eq_user_id_9aa414_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='workspacebooking',
+            name='bookings_wo_created_6a645d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='workspacebooking',
+            name='bookings_wo_user_id_d2e1ee_idx',
+        ),
+        migrations.AddField(
+            model_name='bookingindex',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='bookingindex',
+            index=models.Index(fields=['resource_type', 'resource_id', 'start_at', 'end_at'], name='bookings_bo_resourc_3607af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingindex',
+            index=models.Index(fields=['created_at', 'resource_type', 'booking_id'], name='bookings_bo_created_555066_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingindex',
+            index=models.Index(fields=['user', 'created_at', 'resource_type', 'booking_id'], name='bookings_bo_user_id_58d93c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingindex',
+            index=models.Index(fields=['lab', 'created_at', 'resource_type', 'booking_id'], name='bookings_bo_lab_edbabd_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookingindex',
+            constraint=models.UniqueConstraint(fields=('resource_type', 'booking_id'), name='bookings_index_booking_uniq'),
+        ),
+        migrations.RunPython(fill_booking_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_slot_templates'),
+        ('inventory', '0012_open_checkout_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource_type', models.CharField(choices=[('EQUIPMENT', 'Equipment'), ('WORKSPACE', 'Workspace')], max_length=10)),
+                ('rule', models.CharField(max_length=200)),
+                ('start_date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('purpose', models.TextField()),
+                ('project_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('participants_count', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('ACTIVE', 'Active'), ('CANCELLED', 'Cancelled')], default='ACTIVE', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('equipment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to='inventory.equipment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to=settings.AUTH_USER_MODEL)),
+                ('workspace', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='booking_series', to='bookings.workspace')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='equipmentbooking',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='equipment_bookings', to='bookings.bookingseries'),
+        ),
+        migrations.AddField(
+            model_name='workspacebooking',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='workspace_bookings', to='bookings.bookingseries'),
+        ),
+    ]
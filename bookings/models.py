@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from inventory.models import Equipment
+from .intervals import ACTIVE_STATUSES, slot_interval
 
 class Workspace(models.Model):
     LAB_CHOICES = [
@@ -30,6 +32,73 @@ class BookingSlot(models.Model):
     
     def __str__(self):
         return f"{self.date} ({self.start_time} - {self.end_time})"
+    
+    @property
+    def interval(self):
+        return slot_interval(self.date, self.start_time, self.end_time)
+
+class SlotTemplate(models.Model):
+    """
+    A recurring pattern of booking slots, e.g. weekdays 08:00-18:00 in 30
+    minute slots from January to April. bookings.slot_templates expands it
+    into BookingSlot rows; generating twice creates nothing new.
+    """
+    name = models.CharField(max_length=100)
+    # Python weekday numbers, Monday = 0
+    weekdays = models.JSONField(default=list)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    slot_minutes = models.PositiveSmallIntegerField(default=30)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='slot_templates'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.start_date} - {self.end_date})"
+
+class BookingSeries(models.Model):
+    """
+    A booking repeated on the dates an RRULE-like `rule` produces, e.g. one
+    bench every Tuesday for a term. bookings.series books all free dates at
+    once and cancels the series as a unit; its bookings point back here.
+    """
+    RESOURCE_TYPES = [
+        ('EQUIPMENT', 'Equipment'),
+        ('WORKSPACE', 'Workspace'),
+    ]
+    STATUS_CHOICES = [
+        ('ACTIVE', 'Active'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='booking_series')
+    resource_type = models.CharField(max_length=10, choices=RESOURCE_TYPES)
+    equipment = models.ForeignKey(
+        Equipment, on_delete=models.CASCADE, null=True, blank=True, related_name='booking_series'
+    )
+    workspace = models.ForeignKey(
+        Workspace, on_delete=models.CASCADE, null=True, blank=True, related_name='booking_series'
+    )
+    rule = models.CharField(max_length=200)
+    start_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    purpose = models.TextField()
+    project_name = models.CharField(max_length=200, blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    participants_count = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.rule} from {self.start_date}"
 
 class EquipmentBooking(models.Model):
     STATUS_CHOICES = [
@@ -56,12 +125,41 @@ class EquipmentBooking(models.Model):
         blank=True, 
         related_name='approved_equipment_bookings'
     )
+    series = models.ForeignKey(
+        BookingSeries,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='equipment_bookings'
+    )
+    # The slot's interval, copied on save (and when the slot moves, see
+    # bookings.signals) so overlap checks are range lookups on this table
+    start_at = models.DateTimeField(editable=False)
+    end_at = models.DateTimeField(editable=False)
     
     class Meta:
-        unique_together = ('equipment', 'slot')
+        constraints = [
+            # Cancelled and rejected bookings leave the slot free to book again
+            models.UniqueConstraint(
+                fields=['equipment', 'slot'], condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='bookings_equipment_slot_active_uniq'
+            ),
+        ]
+        indexes = [
+            # Overlap lookups, see bookings.intervals.overlapping
+            models.Index(fields=['equipment', 'start_at', 'end_at']),
+            models.Index(fields=['equipment', 'status']),
+            models.Index(fields=['user', 'status']),
+            # Per-item timeline in inventory.timeline
+            models.Index(fields=['equipment', 'created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.equipment.name} - {self.user.username} - {self.slot}"
+    
+    def save(self, *args, **kwargs):
+        self.start_at, self.end_at = self.slot.interval
+        super().save(*args, **kwargs)
 
 class WorkspaceBooking(models.Model):
     STATUS_CHOICES = [
@@ -89,9 +187,92 @@ class WorkspaceBooking(models.Model):
         blank=True, 
         related_name='approved_workspace_bookings'
     )
+    series = models.ForeignKey(
+        BookingSeries,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='workspace_bookings'
+    )
+    start_at = models.DateTimeField(editable=False)
+    end_at = models.DateTimeField(editable=False)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['workspace', 'slot'], condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='bookings_workspace_slot_active_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['workspace', 'start_at', 'end_at']),
+            models.Index(fields=['workspace', 'status']),
+            models.Index(fields=['user', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.workspace.name} - {self.user.username} - {self.slot}"
+    
+    def save(self, *args, **kwargs):
+        self.start_at, self.end_at = self.slot.interval
+        super().save(*args, **kwargs)
+
+class BookingIndex(models.Model):
+    """
+    One row per equipment or workspace booking with the columns that
+    cross-resource reads filter and order on, so lists and availability hit
+    one table instead of two. Maintained by bookings.signals; rebuild with
+    the `rebuild_booking_index` command.
+    """
+    RESOURCE_TYPES = [
+        ('EQUIPMENT', 'Equipment'),
+        ('WORKSPACE', 'Workspace'),
+    ]
+    
+    resource_type = models.CharField(max_length=10, choices=RESOURCE_TYPES)
+    booking_id = models.BigIntegerField()
+    resource_id = models.BigIntegerField()
+    lab = models.CharField(max_length=20)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    start_at = models.DateTimeField()
+    end_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=EquipmentBooking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name_plural = 'Booking index'
+        constraints = [
+            models.UniqueConstraint(fields=['resource_type', 'booking_id'], name='bookings_index_booking_uniq'),
+        ]
+        indexes = [
+            # Overlap lookups, see bookings.intervals.overlapping
+            models.Index(fields=['resource_type', 'resource_id', 'start_at', 'end_at']),
+            # Newest-first lists, see bookings.listing
+            models.Index(fields=['created_at', 'resource_type', 'booking_id']),
+            models.Index(fields=['user', 'created_at', 'resource_type', 'booking_id']),
+            models.Index(fields=['lab', 'created_at', 'resource_type', 'booking_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.resource_type} booking {self.booking_id}"
+
+class IdempotencyKey(models.Model):
+    """
+    The response to a booking POST sent with an Idempotency-Key header, so a
+    retry of the same request gets it back instead of booking twice. Rows
+    expire after BOOKINGS_IDEMPOTENCY_TTL seconds; see bookings.idempotency.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField(db_index=True)
     
     class Meta:
-        unique_together = ('workspace', 'slot')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='bookings_idempotency_key_uniq'),
+        ]
     
     def __str__(self):
-        return f"{self.workspace.name} - {self.user.username} - {self.slot}"
\ No newline at end of file
+        return f"{self.key} ({self.user_id})"
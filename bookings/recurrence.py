@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from itertools import count
+
+from django.conf import settings
+
+# Longest series one request may create
+MAX_OCCURRENCES = getattr(settings, 'BOOKINGS_SERIES_MAX_OCCURRENCES', 100)
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+
+def parse_rule(rule):
+    """
+    Parse the subset of an iCalendar RRULE that booking series use, e.g.
+    "FREQ=WEEKLY;BYDAY=TU,TH;UNTIL=20270430" or "FREQ=DAILY;INTERVAL=2;COUNT=10".
+    FREQ is DAILY or WEEKLY, BYDAY only applies to WEEKLY, and exactly one
+    of COUNT or UNTIL (a date, inclusive) bounds the series. Raises
+    ValueError with a message fit for the client.
+    """
+    parts = {}
+    for part in rule.upper().removeprefix('RRULE:').split(';'):
+        name, _, value = part.strip().partition('=')
+        if not name or not value or name in parts:
+            raise ValueError(f"Malformed rule part '{part}'.")
+        parts[name] = value
+    unknown = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'COUNT', 'UNTIL'}
+    if unknown:
+        raise ValueError(f"Unsupported rule part(s): {', '.join(sorted(unknown))}.")
+
+    if parts.get('FREQ') not in ('DAILY', 'WEEKLY'):
+        raise ValueError("FREQ must be DAILY or WEEKLY.")
+    parsed = {'freq': parts['FREQ'], 'interval': 1, 'byday': [], 'count': None, 'until': None}
+    try:
+        parsed['interval'] = int(parts.get('INTERVAL', 1))
+        if 'COUNT' in parts:
+            parsed['count'] = int(parts['COUNT'])
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be whole numbers.")
+    if parsed['interval'] < 1 or (parsed['count'] is not None and parsed['count'] < 1):
+        raise ValueError("INTERVAL and COUNT must be at least 1.")
+    if 'UNTIL' in parts:
+        try:
+            parsed['until'] = datetime.strptime(parts['UNTIL'][:8], '%Y%m%d').date()
+        except ValueError:
+            raise ValueError("UNTIL must be a date, YYYYMMDD.")
+    if (parsed['count'] is None) == (parsed['until'] is None):
+        raise ValueError("Give exactly one of COUNT or UNTIL.")
+    if 'BYDAY' in parts:
+        if parsed['freq'] != 'WEEKLY':
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY.")
+        try:
+            parsed['byday'] = sorted({WEEKDAYS.index(day.strip()) for day in parts['BYDAY'].split(',')})
+        except ValueError:
+            raise ValueError(f"BYDAY takes {','.join(WEEKDAYS)}.")
+    return parsed
+
+
+def occurrences(rule, start_date):
+    """
+    The dates a parsed rule produces from start_date on. Raises ValueError
+    if there are none or more than MAX_OCCURRENCES.
+    """
+    if rule['freq'] == 'DAILY':
+        candidates = (start_date + timedelta(days=offset) for offset in count(0, rule['interval']))
+    else:
+        weekdays = rule['byday'] or [start_date.weekday()]
+        week = start_date - timedelta(days=start_date.weekday())
+        candidates = (
+            week + timedelta(weeks=offset, days=weekday)
+            for offset in count(0, rule['interval'])
+            for weekday in weekdays
+        )
+
+    # COUNT, UNTIL or MAX_OCCURRENCES ends the walk; a huge INTERVAL ends it
+    # by stepping past date.max
+    dates = []
+    try:
+        for day in candidates:
+            if day < start_date:
+                continue
+            if (rule['until'] and day > rule['until']) or (rule['count'] and len(dates) == rule['count']):
+                break
+            if len(dates) == MAX_OCCURRENCES:
+                raise ValueError(f"A series may have at most {MAX_OCCURRENCES} occurrences.")
+            dates.append(day)
+    except OverflowError:
+        raise ValueError("The rule runs past the last representable date.")
+    if not dates:
+        raise ValueError("The rule has no occurrences on or after the start date.")
+    return dates
+
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Workspace, BookingSlot, EquipmentBooking, WorkspaceBooking
+from .conflicts import create_booking
+from .models import Workspace, BookingSeries, BookingSlot, EquipmentBooking, SlotTemplate, WorkspaceBooking
+from .recurrence import occurrences, parse_rule
 from inventory.serializers import EquipmentSerializer
 from users.serializers import UserUpdateSerializer
 
@@ -8,6 +10,31 @@ class BookingSlotSerializer(serializers.ModelSerializer):
         model = BookingSlot
         fields = '__all__'
 
+class SlotTemplateSerializer(serializers.ModelSerializer):
+    weekdays = serializers.ListField(child=serializers.IntegerField(min_value=0, max_value=6), allow_empty=False)
+    slot_minutes = serializers.IntegerField(min_value=5, max_value=24 * 60, default=30)
+    max_days = 366
+    
+    class Meta:
+        model = SlotTemplate
+        fields = '__all__'
+        read_only_fields = ('created_by', 'created_at')
+    
+    def validate(self, data):
+        # Partial updates validate against the stored values
+        def value(name):
+            return data[name] if name in data else getattr(self.instance, name, None)
+        
+        if value('start_time') >= value('end_time'):
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
+        if value('start_date') > value('end_date'):
+            raise serializers.ValidationError({"end_date": "End date must not be before start date."})
+        if (value('end_date') - value('start_date')).days >= self.max_days:
+            raise serializers.ValidationError({"end_date": f"A template may span at most {self.max_days} days."})
+        if 'weekdays' in data:
+            data['weekdays'] = sorted(set(data['weekdays']))
+        return data
+
 class WorkspaceSerializer(serializers.ModelSerializer):
     lab_display = serializers.CharField(source='get_lab_display', read_only=True)
     
@@ -25,12 +52,14 @@ class EquipmentBookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = EquipmentBooking
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at', 'status', 'approved_by')
+        read_only_fields = ('created_at', 'updated_at', 'status', 'approved_by', 'series')
 
 class EquipmentBookingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = EquipmentBooking
         fields = ('equipment', 'slot', 'purpose', 'project_name', 'notes')
+        # The (resource, slot) constraint is enforced by the insert itself, as a 409
+        validators = []
     
     def validate(self, data):
         # Check if equipment is available
@@ -40,14 +69,12 @@ class EquipmentBookingCreateSerializer(serializers.ModelSerializer):
                 "equipment": f"Equipment is not available for booking. Current status: {equipment.get_status_display()}"
             })
         
-        # Check if slot is already booked for this equipment
-        slot = data['slot']
-        if EquipmentBooking.objects.filter(equipment=equipment, slot=slot).exists():
-            raise serializers.ValidationError({
-                "slot": "This time slot is already booked for this equipment."
-            })
-        
         return data
+    
+    def create(self, validated_data):
+        # Overlaps with other active bookings are checked under a lock as
+        # part of the insert, and answered with a 409
+        return create_booking(EquipmentBooking, 'equipment', validated_data)
 
 class WorkspaceBookingSerializer(serializers.ModelSerializer):
     workspace_details = WorkspaceSerializer(source='workspace', read_only=True)
@@ -59,12 +86,13 @@ class WorkspaceBookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkspaceBooking
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at', 'status', 'approved_by')
+        read_only_fields = ('created_at', 'updated_at', 'status', 'approved_by', 'series')
 
 class WorkspaceBookingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkspaceBooking
         fields = ('workspace', 'slot', 'purpose', 'project_name', 'participants_count', 'notes')
+        validators = []
     
     def validate(self, data):
         # Check if workspace has enough capacity
@@ -76,11 +104,50 @@ class WorkspaceBookingCreateSerializer(serializers.ModelSerializer):
                 "participants_count": f"The workspace capacity ({workspace.capacity}) is less than the number of participants ({participants_count})."
             })
         
-        # Check if slot is already booked for this workspace
-        slot = data['slot']
-        if WorkspaceBooking.objects.filter(workspace=workspace, slot=slot).exists():
+        return data
+    
+    def create(self, validated_data):
+        return create_booking(WorkspaceBooking, 'workspace', validated_data)
+
+class BookingSeriesSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = BookingSeries
+        fields = '__all__'
+        read_only_fields = ('user', 'status', 'created_at')
+
+class BookingSeriesCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BookingSeries
+        fields = (
+            'resource_type', 'equipment', 'workspace', 'rule', 'start_date', 'start_time', 'end_time',
+            'purpose', 'project_name', 'notes', 'participants_count'
+        )
+    
+    def validate(self, data):
+        resource = data['resource_type'].lower()
+        if not data.get(resource):
+            raise serializers.ValidationError({resource: f"A {resource} series needs a {resource}."})
+        other = 'workspace' if resource == 'equipment' else 'equipment'
+        data[other] = None
+        
+        equipment = data['equipment']
+        if equipment and equipment.status not in ['AVAILABLE', 'IN_USE']:
             raise serializers.ValidationError({
-                "slot": "This time slot is already booked for this workspace."
+                "equipment": f"Equipment is not available for booking. Current status: {equipment.get_status_display()}"
             })
+        workspace = data['workspace']
+        participants_count = data.get('participants_count', 1)
+        if workspace and participants_count > workspace.capacity:
+            raise serializers.ValidationError({
+                "participants_count": f"The workspace capacity ({workspace.capacity}) is less than the number of participants ({participants_count})."
+            })
+        if data['start_time'] >= data['end_time']:
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
         
-        return data
\ No newline at end of file
+        try:
+            data['dates'] = occurrences(parse_rule(data['rule']), data['start_date'])
+        except ValueError as error:
+            raise serializers.ValidationError({"rule": str(error)})
+        return data
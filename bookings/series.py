@@ -0,0 +1,93 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import calendar, index
+from .conflicts import BookingConflict
+from .intervals import ACTIVE_STATUSES, merge_intervals, overlapping_any, slot_interval
+from .models import BookingIndex, BookingSeries, BookingSlot
+
+# Fields copied from the series onto each of its bookings
+BOOKING_FIELDS = {
+    'EQUIPMENT': ['purpose', 'project_name', 'notes'],
+    'WORKSPACE': ['purpose', 'project_name', 'notes', 'participants_count'],
+}
+
+
+def book_series(dates, **fields):
+    """
+    Create a BookingSeries and a PENDING booking on each of `dates` whose
+    slot is free. The series' resource row is locked, every occurrence is
+    checked against existing bookings in one query, and the free ones are
+    inserted with bulk_create, all in one transaction. Returns the series
+    (None if every date conflicts; nothing is written then) and the
+    (date, start_at, end_at) of the conflicting occurrences.
+    """
+    resource_type = fields['resource_type']
+    model, resource = index.RESOURCES[resource_type]
+    target = fields[resource]
+    start_time, end_time = fields['start_time'], fields['end_time']
+    intervals = [(day, *slot_interval(day, start_time, end_time)) for day in dates]
+
+    with transaction.atomic():
+        list(type(target).objects.select_for_update().filter(pk=target.pk).values_list('pk'))
+        busy = merge_intervals(
+            overlapping_any(
+                model.objects.filter(**{resource: target}), [(start, end) for _, start, end in intervals]
+            ).values_list('start_at', 'end_at')
+        )
+        free, conflicts = [], []
+        for occurrence in intervals:
+            _, start, end = occurrence
+            clash = any(busy_start < end and start < busy_end for busy_start, busy_end in busy)
+            (conflicts if clash else free).append(occurrence)
+        if not free:
+            return None, conflicts
+
+        series = BookingSeries.objects.create(**fields)
+        BookingSlot.objects.bulk_create(
+            [BookingSlot(date=day, start_time=start_time, end_time=end_time) for day, _, _ in free],
+            ignore_conflicts=True,
+        )
+        slots = dict(
+            BookingSlot.objects.filter(
+                date__in=[day for day, _, _ in free], start_time=start_time, end_time=end_time
+            ).values_list('date', 'pk')
+        )
+        values = {name: getattr(series, name) for name in BOOKING_FIELDS[resource_type]}
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([
+                    model(
+                        series=series, user=series.user, status='PENDING', slot_id=slots[day],
+                        start_at=start, end_at=end, **{resource: target}, **values
+                    )
+                    for day, start, end in free
+                ])
+        except IntegrityError:
+            raise BookingConflict(f"This series overlaps an existing booking for this {resource}.")
+        # bulk_create skips the signals that keep the index and calendar current
+        BookingIndex.objects.bulk_create(index.entries(resource_type, model.objects.filter(series=series)))
+        transaction.on_commit(calendar.bump_version)
+    return series, conflicts
+
+
+def cancel_series(series):
+    """
+    Cancel a series and those of its bookings that are still active and
+    haven't started yet; past occurrences keep their status. Returns the
+    number of bookings cancelled.
+    """
+    model, _ = index.RESOURCES[series.resource_type]
+    with transaction.atomic():
+        pks = list(
+            model.objects.filter(series=series, status__in=ACTIVE_STATUSES, start_at__gt=timezone.now())
+            .values_list('pk', flat=True)
+        )
+        model.objects.filter(pk__in=pks).update(status='CANCELLED', updated_at=timezone.now())
+        BookingIndex.objects.filter(resource_type=series.resource_type, booking_id__in=pks).update(
+            status='CANCELLED'
+        )
+        series.status = 'CANCELLED'
+        series.save(update_fields=['status'])
+        transaction.on_commit(calendar.bump_version)
+    return len(pks)
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from inventory.models import Equipment
+from . import calendar
+from .index import RESOURCES, resource_type_of, sync_booking
+from .models import BookingIndex, BookingSlot, EquipmentBooking, Workspace, WorkspaceBooking
+
+
+@receiver(post_save, sender=BookingSlot)
+def move_slot_bookings(sender, instance, created, **kwargs):
+    # Bookings carry a copy of their slot's interval for overlap checks
+    if created:
+        return
+    start_at, end_at = instance.interval
+    for resource_type, (model, _) in RESOURCES.items():
+        bookings = model.objects.filter(slot=instance)
+        BookingIndex.objects.filter(
+            resource_type=resource_type, booking_id__in=bookings.values('id')
+        ).update(start_at=start_at, end_at=end_at)
+        bookings.update(start_at=start_at, end_at=end_at)
+
+
+@receiver(post_save, sender=EquipmentBooking)
+@receiver(post_save, sender=WorkspaceBooking)
+def index_booking(sender, instance, created, **kwargs):
+    sync_booking(instance, created)
+
+
+@receiver(post_delete, sender=EquipmentBooking)
+@receiver(post_delete, sender=WorkspaceBooking)
+def unindex_booking(sender, instance, **kwargs):
+    BookingIndex.objects.filter(resource_type=resource_type_of(instance), booking_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Equipment)
+@receiver(post_save, sender=Workspace)
+def relabel_bookings(sender, instance, created, **kwargs):
+    # The index carries the resource's lab for technician-scoped lists
+    if created:
+        return
+    resource_type = 'EQUIPMENT' if sender is Equipment else 'WORKSPACE'
+    BookingIndex.objects.filter(resource_type=resource_type, resource_id=instance.pk).exclude(
+        lab=instance.lab
+    ).update(lab=instance.lab)
+
+
+@receiver([post_save, post_delete], sender=EquipmentBooking)
+@receiver([post_save, post_delete], sender=WorkspaceBooking)
+@receiver([post_save, post_delete], sender=BookingSlot)
+@receiver([post_save, post_delete], sender=Workspace)
+@receiver([post_save, post_delete], sender=Equipment)
+def invalidate_calendar(sender, instance, **kwargs):
+    # Events embed resource names and labs as well as the bookings themselves.
+    # queryset.update() and bulk_create() skip these; their callers bump too
+    transaction.on_commit(calendar.bump_version)
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.db import transaction
+
+from .models import BookingSlot
+
+
+def expand(template):
+    """
+    Yield the (date, start_time, end_time) of every slot a template
+    describes. A day's last slot must end by the template's end_time.
+    """
+    step = timedelta(minutes=template.slot_minutes)
+    weekdays = set(template.weekdays)
+    day = template.start_date
+    while day <= template.end_date:
+        if day.weekday() in weekdays:
+            start = datetime.combine(day, template.start_time)
+            close = datetime.combine(day, template.end_time)
+            while start + step <= close:
+                yield day, start.time(), (start + step).time()
+                start += step
+        day += timedelta(days=1)
+
+
+def generate_slots(template, batch_size=1000):
+    """
+    Insert the template's slots with bulk_create in batches, skipping slots
+    that already exist (date, start and end are unique), so re-running a
+    template is a no-op. Returns the number of slots in the template and
+    how many of them were created.
+    """
+    total = created = 0
+    with transaction.atomic():
+        pending = (
+            BookingSlot(date=day, start_time=start_time, end_time=end_time)
+            for day, start_time, end_time in expand(template)
+        )
+        while batch := list(islice(pending, batch_size)):
+            # ignore_conflicts can't report what it inserted, so the count
+            # comes from the keys that were missing before the insert
+            existing = set(
+                BookingSlot.objects.filter(date__gte=batch[0].date, date__lte=batch[-1].date)
+                .values_list('date', 'start_time', 'end_time')
+            )
+            missing = [slot for slot in batch if (slot.date, slot.start_time, slot.end_time) not in existing]
+            BookingSlot.objects.bulk_create(missing, ignore_conflicts=True)
+            total += len(batch)
+            created += len(missing)
+    return total, created
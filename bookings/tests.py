@@ -1,3 +1,620 @@
-from django.test import TestCase
+import threading
+from collections import Counter
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from inventory.models import Category
+from offlineIMS.testing import QueryPlanMixin, make_equipment, query_plan
+from . import calendar
+from .index import rebuild
+from .intervals import free_intervals, overlapping, slot_interval
+from .models import (
+    Workspace, BookingSeries, BookingSlot, BookingIndex, EquipmentBooking, IdempotencyKey, SlotTemplate,
+    WorkspaceBooking
+)
+from .recurrence import occurrences, parse_rule
+
+User = get_user_model()
+
+
+class BookingQueryPlanTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        # The calendar would otherwise be answered from the cache, without queries
+        cache.clear()
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.tech = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN', lab='IVE')
+        category = Category.objects.create(name='Printers')
+        self.equipment = [make_equipment(category, i) for i in range(3)]
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        self.slots = [
+            BookingSlot.objects.create(date=date.today() + timedelta(days=i), start_time=time(9), end_time=time(10))
+            for i in range(4)
+        ]
+        for i, slot in enumerate(self.slots):
+            EquipmentBooking.objects.create(equipment=self.equipment[i % 3], user=self.student, slot=slot, purpose='Print')
+            WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=slot, purpose='Build')
+
+    def test_filtered_endpoints_use_indexes(self):
+        today = date.today().isoformat()
+        for user, url, params in [
+            (self.student, '/api/bookings/equipment-bookings/', {'status': 'PENDING'}),
+            (self.tech, '/api/bookings/equipment-bookings/', {'equipment': self.equipment[0].id, 'status': 'PENDING'}),
+            (self.tech, '/api/bookings/workspace-bookings/', {'workspace': self.workspace.id, 'status': 'PENDING'}),
+            (self.student, '/api/bookings/slots/', {'date': today}),
+            (self.student, '/api/bookings/slots/by_date_range/', None),
+            (self.student, f'/api/bookings/workspaces/{self.workspace.id}/available_slots/', {'date': today}),
+            (self.student, '/api/bookings/calendar/', {'equipment_id': self.equipment[0].id}),
+            (self.student, '/api/bookings/my_bookings/', {'status': 'PENDING'}),
+            (self.student, '/api/bookings/', None),
+            (self.student, '/api/bookings/availability/', {
+                'resource_type': 'EQUIPMENT', 'resource_id': self.equipment[0].id,
+                'start_time': f'{today}T08:00:00', 'end_time': f'{today}T12:00:00',
+            }),
+            (self.student, '/api/bookings/availability/batch/', {
+                'equipment': ','.join(str(item.id) for item in self.equipment), 'workspace': self.workspace.id,
+            }),
+        ]:
+            with self.subTest(url=url, params=params):
+                self.client.force_authenticate(user)
+                self.assertNoFullScans(url, params)
+
+
+class BookingIntervalTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.student)
+        category = Category.objects.create(name='Printers')
+        self.printer, self.other = make_equipment(category, 1), make_equipment(category, 2)
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        self.day = date.today() + timedelta(days=1)
+        self.booking = EquipmentBooking.objects.create(
+            equipment=self.printer, user=self.student, slot=self.slot(9, 11), purpose='Print'
+        )
+
+    def slot(self, start, end):
+        return BookingSlot.objects.get_or_create(date=self.day, start_time=time(start), end_time=time(end))[0]
+
+    def book(self, slot, equipment=None):
+        return self.client.post('/api/bookings/', {
+            'resource_type': 'EQUIPMENT', 'equipment': (equipment or self.printer).id,
+            'slot': slot.id, 'purpose': 'Print',
+        }, format='json')
+
+    def test_partial_overlaps_are_rejected(self):
+        response = self.book(self.slot(10, 12))
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('overlaps', response.data['error'])
+        self.assertEqual(self.book(self.slot(8, 13)).status_code, 409)
+        # Touching intervals and other equipment are fine
+        self.assertEqual(self.book(self.slot(11, 12)).status_code, 201)
+        self.assertEqual(self.book(self.slot(10, 12), self.other).status_code, 201)
+
+    def test_cancelled_bookings_free_their_interval(self):
+        self.booking.status = 'CANCELLED'
+        self.booking.save()
+        self.assertEqual(self.book(self.booking.slot).status_code, 201)
+
+    def test_availability_checks_partial_overlaps(self):
+        def available(start, end):
+            return self.client.get('/api/bookings/availability/', {
+                'resource_type': 'EQUIPMENT', 'resource_id': self.printer.id,
+                'start_time': f'{self.day}T{start}', 'end_time': f'{self.day}T{end}',
+            }).data['available']
+
+        self.assertFalse(available('10:30:00', '10:45:00'))
+        self.assertFalse(available('08:00:00', '09:30:00'))
+        self.assertTrue(available('11:00:00', '12:00:00'))
+
+    def test_workspace_slots_overlapping_a_booking_are_unavailable(self):
+        WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=self.slot(9, 11), purpose='Build')
+        free = self.slot(11, 12)
+        self.slot(10, 12)
+        response = self.client.get(f'/api/bookings/workspaces/{self.workspace.id}/available_slots/', {'date': self.day.isoformat()})
+        self.assertEqual([slot['id'] for slot in response.data], [free.id])
+
+    def test_moving_a_slot_moves_its_bookings(self):
+        slot = self.booking.slot
+        slot.start_time, slot.end_time = time(14), time(15)
+        slot.save()
+        self.booking.refresh_from_db()
+        self.assertEqual((self.booking.start_at, self.booking.end_at), slot_interval(self.day, time(14), time(15)))
+
+    def test_overlap_lookup_is_a_bounded_index_range(self):
+        start, end = slot_interval(self.day, time(10), time(12))
+        plan = query_plan(overlapping(EquipmentBooking.objects.filter(equipment=self.printer), start, end))
+        self.assertRegex(plan, r'SEARCH bookings_equipmentbooking USING INDEX \w+ \(equipment_id=\? AND start_at>\? AND start_at<\?\)')
+
+
+class BatchAvailabilityTests(APITestCase):
+    url = '/api/bookings/availability/batch/'
+
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.student)
+        category = Category.objects.create(name='Printers')
+        self.printers = [make_equipment(category, i) for i in range(3)]
+        self.broken = make_equipment(category, 9, status='MAINTENANCE')
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        self.day = date.today() + timedelta(days=1)
+        for equipment, (start, end) in [(self.printers[0], (9, 11)), (self.printers[0], (10, 12)), (self.printers[0], (14, 15))]:
+            slot, _ = BookingSlot.objects.get_or_create(date=self.day, start_time=time(start), end_time=time(end))
+            EquipmentBooking.objects.create(equipment=equipment, user=self.student, slot=slot, purpose='Print')
+        slot, _ = BookingSlot.objects.get_or_create(date=self.day, start_time=time(16), end_time=time(18))
+        WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=slot, purpose='Build')
+        cancelled = WorkspaceBooking.objects.create(
+            workspace=self.workspace, user=self.student, purpose='Build',
+            slot=BookingSlot.objects.create(date=self.day, start_time=time(8), end_time=time(9))
+        )
+        cancelled.status = 'CANCELLED'
+        cancelled.save()
+
+    def hours(self, entry):
+        return [(interval['start'].hour, interval['end'].hour) for interval in entry['free']]
+
+    def test_free_intervals_per_resource_in_one_booking_query(self):
+        ids = ','.join(str(item.id) for item in self.printers + [self.broken])
+        # resources' bookings (booking index), equipment, workspaces
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {
+                'equipment': ids, 'workspace': self.workspace.id,
+                'start': self.day.isoformat(), 'end': self.day.isoformat(), 'open': '08:00', 'close': '18:00',
+            })
+        self.assertEqual(response.status_code, 200)
+        resources = {(entry['resource_type'], entry['resource_id']): entry for entry in response.data['resources']}
+        # 09-11 and 10-12 merge into one busy block
+        self.assertEqual(self.hours(resources[('EQUIPMENT', self.printers[0].id)]), [(8, 9), (12, 14), (15, 18)])
+        self.assertEqual(self.hours(resources[('EQUIPMENT', self.printers[1].id)]), [(8, 18)])
+        self.assertFalse(resources[('EQUIPMENT', self.broken.id)]['bookable'])
+        self.assertEqual(self.hours(resources[('WORKSPACE', self.workspace.id)]), [(8, 16)])
+
+    def test_whole_days_and_validation(self):
+        response = self.client.get(self.url, {'workspace': f'{self.workspace.id},999999', 'start': self.day.isoformat()})
+        entries = response.data['resources']
+        self.assertEqual(entries[0]['free'][0]['end'].hour, 16)
+        self.assertEqual(entries[0]['free'][1]['start'].hour, 18)
+        self.assertEqual(len(entries[0]['free']), 2)
+        self.assertEqual(entries[1]['reason'], 'Not found')
+
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'equipment': 'a,b'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'equipment': '1', 'open': '08:00'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'equipment': '1', 'start': '2025-01-01', 'end': '2025-03-01'}).status_code, 400)
+
+    def test_sweep_skips_intervals_outside_each_window(self):
+        windows = [(0, 10), (20, 30)]
+        self.assertEqual(free_intervals(windows, [(5, 8), (7, 12), (18, 22), (28, 40)]), [(0, 5), (22, 28)])
+        self.assertEqual(free_intervals(windows, [(0, 30)]), [])
+        self.assertEqual(free_intervals(windows, []), windows)
+
+
+class CalendarTests(APITestCase):
+    url = '/api/bookings/calendar/'
+
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(username='student', password='pass', first_name='Sam', last_name='Student')
+        self.client.force_authenticate(self.student)
+        category = Category.objects.create(name='Printers')
+        self.printers = [make_equipment(category, i) for i in range(5)]
+        self.workspace = Workspace.objects.create(name='Bench', lab='CEZERI', location='Room 1')
+        self.day = date.today() + timedelta(days=1)
+        for hour in range(8, 12):
+            slot = BookingSlot.objects.create(date=self.day, start_time=time(hour), end_time=time(hour + 1))
+            for printer in self.printers:
+                EquipmentBooking.objects.create(equipment=printer, user=self.student, slot=slot, purpose='Print')
+            WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=slot, purpose='Build', participants_count=3)
+
+    def test_events_come_from_one_query_per_table_and_are_cached(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 24)
+        event = next(event for event in response.data if event['resourceType'] == 'WORKSPACE')
+        self.assertEqual(event['title'], 'Bench - Sam Student')
+        self.assertEqual(event['start'], f'{self.day}T08:00:00')
+        self.assertEqual((event['lab'], event['participantsCount'], event['color']), ('CEZERI', 3, '#FFC107'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, response.data)
+        # Each filter combination is cached on its own
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'lab': 'CEZERI', 'resource_type': 'WORKSPACE'})
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(len(self.client.get(self.url, {'equipment_id': self.printers[0].id, 'resource_type': 'EQUIPMENT'}).data), 4)
+        self.assertEqual(self.client.get(self.url, {'equipment_id': 'x'}).status_code, 400)
+
+    def test_booking_changes_invalidate(self):
+        self.client.get(self.url)
+        booking = EquipmentBooking.objects.filter(equipment=self.printers[0]).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/bookings/equipment-bookings/{booking.id}/cancel/')
+        events = {event['id']: event for event in self.client.get(self.url).data}
+        self.assertEqual(events[f'equipment_{booking.id}']['status'], 'CANCELLED')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workspace.name = 'Big bench'
+            self.workspace.save()
+        events = self.client.get(self.url, {'resource_type': 'WORKSPACE'}).data
+        self.assertEqual({event['resourceName'] for event in events}, {'Big bench'})
+
+    def test_bumps_from_another_process_invalidate(self):
+        self.client.get(self.url)
+        EquipmentBooking.objects.filter(equipment=self.printers[0]).update(status='APPROVED')
+        # What a worker or management command with its own cache connection sees
+        self.assertIn('offlineIMS-test-cache-', str(settings.CACHES['shared']['LOCATION']))
+        other = FileBasedCache(settings.CACHES['shared']['LOCATION'], {})
+        other.set(calendar.VERSION_KEY, other.get(calendar.VERSION_KEY) + 1, timeout=None)
+        events = self.client.get(self.url, {'equipment_id': self.printers[0].id, 'resource_type': 'EQUIPMENT'}).data
+        self.assertEqual({event['status'] for event in events}, {'APPROVED'})
+
+
+class BookingListTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='pass', role='ADMIN')
+        self.student = User.objects.create_user(username='student', password='pass')
+        other = User.objects.create_user(username='other', password='pass')
+        category = Category.objects.create(name='Printers')
+        printers = [make_equipment(category, i) for i in range(5)]
+        workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        day = date.today() + timedelta(days=1)
+        start = timezone.now() - timedelta(days=1)
+        for hour in range(8, 12):
+            slot = BookingSlot.objects.create(date=day, start_time=time(hour), end_time=time(hour + 1))
+            for printer in printers:
+                booking = EquipmentBooking.objects.create(equipment=printer, user=self.student, slot=slot, purpose='Print')
+                # Equal timestamps across the two tables are ordered by type, then id
+                EquipmentBooking.objects.filter(pk=booking.pk).update(created_at=start + timedelta(minutes=hour))
+            booking = WorkspaceBooking.objects.create(workspace=workspace, user=self.student, slot=slot, purpose='Build')
+            WorkspaceBooking.objects.filter(pk=booking.pk).update(created_at=start + timedelta(minutes=hour))
+        EquipmentBooking.objects.filter(user=self.student).first().delete()
+        slot = BookingSlot.objects.create(date=day, start_time=time(13), end_time=time(14))
+        EquipmentBooking.objects.create(equipment=printers[0], user=other, slot=slot, purpose='Scan')
+        # queryset.update() skipped the signals that keep the index in step
+        self.assertEqual(rebuild(batch_size=7), 24)
+
+    def expected(self, user=None):
+        keys = []
+        for model, kind in [(EquipmentBooking, 'EQUIPMENT'), (WorkspaceBooking, 'WORKSPACE')]:
+            bookings = model.objects.filter(user=user) if user else model.objects.all()
+            keys += [(created_at, kind, pk) for pk, created_at in bookings.values_list('id', 'created_at')]
+        return [(kind, pk) for _, kind, pk in sorted(keys, reverse=True)]
+
+    def walk(self, url, params):
+        seen, response = [], self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [(row['resource_type'], row['id']) for row in response.data['results']]
+            if not response.data['next']:
+                return seen, response
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_walk_matches_created_at_order(self):
+        self.client.force_authenticate(self.admin)
+        seen, last = self.walk('/api/bookings/', {'page_size': 4})
+        self.assertEqual(seen, self.expected())
+        self.assertEqual(last.data['count'], 24)
+        # Stepping back lands on the page before
+        previous = self.client.get(last.data['previous']).data
+        self.assertEqual([(row['resource_type'], row['id']) for row in previous['results']], seen[-8:-4])
+
+        self.client.force_authenticate(self.student)
+        seen, _ = self.walk('/api/bookings/my_bookings/', {'page_size': 5})
+        self.assertEqual(seen, self.expected(self.student))
+        seen, _ = self.walk('/api/bookings/', {'resource_type': 'WORKSPACE'})
+        self.assertEqual({kind for kind, _ in seen}, {'WORKSPACE'})
+        self.assertEqual(self.client.get('/api/bookings/', {'cursor': 'junk'}).status_code, 404)
+
+    def test_only_the_page_is_loaded(self):
+        self.client.force_authenticate(self.admin)
+        # Index keys, then each type's page rows (and the printers' maintenance records)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/bookings/', {'page_size': 6, 'count': 'false'})
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(response.data['results'][0]['equipment_details']['name'], 'Item 0')
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/bookings/', {'page_size': 50})
+        self.assertEqual(response.data['count'], 24)
+
+    def test_search_and_lab_filters_go_through_the_index(self):
+        self.client.force_authenticate(self.admin)
+        seen, _ = self.walk('/api/bookings/', {'search': 'scan'})
+        self.assertEqual([kind for kind, _ in seen], ['EQUIPMENT'])
+        seen, _ = self.walk('/api/bookings/', {'search': 'bench', 'lab': 'IVE'})
+        self.assertEqual(len(seen), 4)
+
+
+class BookingIndexTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', password='pass')
+        category = Category.objects.create(name='Printers')
+        self.printer = make_equipment(category, 0)
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        self.slot = BookingSlot.objects.create(date=date.today(), start_time=time(9), end_time=time(10))
+        self.equipment_booking = EquipmentBooking.objects.create(
+            equipment=self.printer, user=self.student, slot=self.slot, purpose='Print'
+        )
+        self.workspace_booking = WorkspaceBooking.objects.create(
+            workspace=self.workspace, user=self.student, slot=self.slot, purpose='Build'
+        )
+
+    def snapshot(self):
+        return sorted(BookingIndex.objects.values_list(
+            'resource_type', 'booking_id', 'resource_id', 'lab', 'user_id', 'start_at', 'end_at', 'status', 'created_at'
+        ))
+
+    def test_signals_keep_the_index_in_step(self):
+        entry = BookingIndex.objects.get(resource_type='WORKSPACE', booking_id=self.workspace_booking.id)
+        self.assertEqual((entry.lab, entry.status, entry.start_at), ('IVE', 'PENDING', self.slot.interval[0]))
+
+        self.workspace_booking.status = 'APPROVED'
+        self.workspace_booking.save()
+        self.workspace.lab = 'CEZERI'
+        self.workspace.save()
+        self.slot.start_time = time(8)
+        self.slot.save()
+        entry.refresh_from_db()
+        self.assertEqual((entry.lab, entry.status, entry.start_at), ('CEZERI', 'APPROVED', self.slot.interval[0]))
+
+        self.equipment_booking.delete()
+        self.assertFalse(BookingIndex.objects.filter(resource_type='EQUIPMENT').exists())
+
+    def test_rebuild_command_regenerates_the_index(self):
+        expected = self.snapshot()
+        BookingIndex.objects.all().delete()
+        call_command('rebuild_booking_index', stdout=StringIO())
+        self.assertEqual(self.snapshot(), expected)
+
+
+class IdempotentBookingTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.student)
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1', capacity=4)
+        self.slot = BookingSlot.objects.create(date=date.today() + timedelta(days=1), start_time=time(9), end_time=time(10))
+
+    def book(self, key, **data):
+        payload = {'resource_type': 'WORKSPACE', 'workspace': self.workspace.id, 'slot': self.slot.id,
+                   'purpose': 'Build', 'participants_count': 2, **data}
+        return self.client.post('/api/bookings/', payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retries_replay_the_first_response(self):
+        first = self.book('retry-1')
+        self.assertEqual(first.status_code, 201)
+        retry = self.book('retry-1')
+        self.assertEqual((retry.status_code, retry.data['id']), (201, first.data['id']))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(WorkspaceBooking.objects.count(), 1)
+
+        # The same key for a different request is refused; a new key is a new booking attempt
+        self.assertEqual(self.book('retry-1', participants_count=3).status_code, 422)
+        self.assertEqual(self.book('retry-2').status_code, 409)
+        # Conflicts are not stored, so a retry is checked again
+        self.assertFalse(IdempotencyKey.objects.filter(key='retry-2').exists())
+
+    def test_expired_keys_are_forgotten(self):
+        self.assertEqual(self.book('old').status_code, 201)
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        WorkspaceBooking.objects.update(status='CANCELLED')
+        self.assertEqual(self.book('old').status_code, 201)
+        self.assertEqual(WorkspaceBooking.objects.count(), 2)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Students hitting submit for the same bench at once against one SQLite file."""
+    threads = 12
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'student{i}', password='pass') for i in range(self.threads)]
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1')
+        self.slot = BookingSlot.objects.create(date=date.today() + timedelta(days=1), start_time=time(9), end_time=time(10))
+
+    def race(self, users, key=None):
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def worker(user):
+            try:
+                client = APIClient()
+                client.force_authenticate(user)
+                headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+                barrier.wait()
+                response = client.post('/api/bookings/', {
+                    'resource_type': 'WORKSPACE', 'workspace': self.workspace.id,
+                    'slot': self.slot.id, 'purpose': 'Build', 'participants_count': 1,
+                }, format='json', **headers)
+                results.append((response.status_code, response.data.get('id')))
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker, args=(user,)) for user in users]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return results
+
+    def test_one_booking_wins_and_the_rest_conflict(self):
+        results = self.race(self.users)
+        self.assertEqual(Counter(code for code, _ in results), {201: 1, 409: self.threads - 1})
+        self.assertEqual(WorkspaceBooking.objects.count(), 1)
+
+    def test_concurrent_retries_share_one_booking(self):
+        results = self.race([self.users[0]] * 6, key='double-tap')
+        self.assertEqual({code for code, _ in results}, {201})
+        self.assertEqual(len({booking_id for _, booking_id in results}), 1)
+        self.assertEqual(WorkspaceBooking.objects.count(), 1)
+
+
+class SlotTemplateTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='pass', role='LAB_MANAGER')
+        self.client.force_authenticate(self.manager)
+        # Two full weeks, Monday to Sunday
+        self.monday = date.today() + timedelta(days=7 - date.today().weekday())
+        self.template = {
+            'name': 'Term', 'weekdays': [4, 0, 1, 2, 3], 'start_time': '08:00', 'end_time': '18:00',
+            'slot_minutes': 30, 'start_date': self.monday.isoformat(),
+            'end_date': (self.monday + timedelta(days=13)).isoformat(),
+        }
+
+    def test_generate_is_batched_and_idempotent(self):
+        response = self.client.post('/api/bookings/slot-templates/', self.template, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['weekdays'], [0, 1, 2, 3, 4])
+        url = f"/api/bookings/slot-templates/{response.data['id']}/generate/"
+        # One slot is already there and is kept as it is
+        kept = BookingSlot.objects.create(date=self.monday, start_time=time(8), end_time=time(8, 30))
+
+        # template, the existing keys, one bulk insert (plus the savepoint pair)
+        with self.assertNumQueries(5):
+            response = self.client.post(url)
+        self.assertEqual((response.data['slots'], response.data['created'], response.data['existing']), (200, 199, 1))
+        self.assertEqual(BookingSlot.objects.count(), 200)
+        self.assertTrue(BookingSlot.objects.filter(pk=kept.pk).exists())
+        self.assertFalse(BookingSlot.objects.filter(date=self.monday + timedelta(days=5)).exists())
+        self.assertEqual(BookingSlot.objects.filter(date=self.monday).order_by('start_time').last().end_time, time(18))
+
+        response = self.client.post(url)
+        self.assertEqual((response.data['created'], response.data['existing']), (0, 200))
+        self.assertEqual(BookingSlot.objects.count(), 200)
+
+    def test_validation_and_permissions(self):
+        for change in [{'end_time': '07:00'}, {'weekdays': [7]}, {'slot_minutes': 2},
+                       {'end_date': (self.monday + timedelta(days=400)).isoformat()}]:
+            with self.subTest(change=change):
+                response = self.client.post('/api/bookings/slot-templates/', {**self.template, **change}, format='json')
+                self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(User.objects.create_user(username='student', password='pass'))
+        self.assertEqual(self.client.post('/api/bookings/slot-templates/', self.template, format='json').status_code, 403)
+
+    def test_command_saves_and_expands_a_template(self):
+        args = ['--name', 'Evenings', '--weekdays', 'tue,thu', '--start', '18:00', '--end', '20:00',
+                '--minutes', '60', '--from', self.monday.isoformat(),
+                '--to', (self.monday + timedelta(days=13)).isoformat()]
+        call_command('generate_slots', *args, stdout=StringIO())
+        self.assertEqual(BookingSlot.objects.count(), 8)
+        template = SlotTemplate.objects.get(name='Evenings')
+        self.assertEqual(template.weekdays, [1, 3])
+        out = StringIO()
+        call_command('generate_slots', str(template.id), batch_size=3, stdout=out)
+        self.assertIn('0 slot(s) created, 8 already existed', out.getvalue())
+
+
+class BookingSeriesTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.student)
+        self.workspace = Workspace.objects.create(name='Bench', lab='IVE', location='Room 1', capacity=4)
+        self.tuesday = date.today() + timedelta(days=(1 - date.today().weekday()) % 7 or 7)
+        self.series = {
+            'resource_type': 'WORKSPACE', 'workspace': self.workspace.id, 'rule': 'FREQ=WEEKLY;BYDAY=TU;COUNT=4',
+            'start_date': self.tuesday.isoformat(), 'start_time': '14:00', 'end_time': '16:00',
+            'purpose': 'Term project', 'participants_count': 2,
+        }
+
+    def test_rules(self):
+        monday = date(2027, 1, 4)
+        self.assertEqual(
+            occurrences(parse_rule('FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;UNTIL=20270121'), monday),
+            [date(2027, 1, 5), date(2027, 1, 7), date(2027, 1, 19), date(2027, 1, 21)]
+        )
+        self.assertEqual(
+            occurrences(parse_rule('RRULE:FREQ=DAILY;INTERVAL=3;COUNT=3'), monday),
+            [date(2027, 1, 4), date(2027, 1, 7), date(2027, 1, 10)]
+        )
+        # Without BYDAY a weekly rule repeats the start date's weekday
+        self.assertEqual(occurrences(parse_rule('FREQ=WEEKLY;COUNT=2'), date(2027, 1, 6))[1], date(2027, 1, 13))
+        for rule in ['FREQ=MONTHLY;COUNT=2', 'FREQ=WEEKLY', 'FREQ=WEEKLY;COUNT=2;UNTIL=20270101',
+                     'FREQ=DAILY;BYDAY=MO;COUNT=2', 'FREQ=WEEKLY;BYDAY=XX;COUNT=2', 'FREQ=DAILY;COUNT=1000',
+                     'FREQ=WEEKLY;INTERVAL=100000;COUNT=10', 'FREQ=DAILY;INTERVAL=10000000;COUNT=2']:
+            with self.subTest(rule=rule), self.assertRaises(ValueError):
+                occurrences(parse_rule(rule), monday)
+
+    def test_free_occurrences_are_booked_and_conflicts_listed(self):
+        taken = self.tuesday + timedelta(weeks=1)
+        slot = BookingSlot.objects.create(date=taken, start_time=time(15), end_time=time(17))
+        WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=slot, purpose='Other')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/bookings/series/', self.series, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual([conflict['date'] for conflict in response.data['conflicts']], [taken.isoformat()])
+        # Every occurrence is checked in a single overlap query
+        self.assertEqual(sum('"end_at" >' in query['sql'] for query in queries.captured_queries), 1)
+
+        series = BookingSeries.objects.get(pk=response.data['id'])
+        bookings = WorkspaceBooking.objects.filter(series=series).order_by('start_at')
+        self.assertEqual([booking.slot.date for booking in bookings], [
+            self.tuesday, self.tuesday + timedelta(weeks=2), self.tuesday + timedelta(weeks=3)
+        ])
+        self.assertEqual(bookings[0].start_at, slot_interval(self.tuesday, time(14), time(16))[0])
+        self.assertEqual((bookings[0].participants_count, bookings[0].status), (2, 'PENDING'))
+        self.assertEqual(BookingIndex.objects.filter(booking_id__in=bookings.values('id')).count(), 3)
+
+        # A second identical series has nothing left to book
+        response = self.client.post('/api/bookings/series/', self.series, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(len(response.data['conflicts']), 4)
+        self.assertEqual(BookingSeries.objects.count(), 1)
+
+    def test_conflicting_series_can_be_retried_with_the_same_key(self):
+        slot = BookingSlot.objects.create(date=self.tuesday, start_time=time(14), end_time=time(16))
+        other = WorkspaceBooking.objects.create(workspace=self.workspace, user=self.student, slot=slot, purpose='Other')
+        series = {**self.series, 'rule': 'FREQ=WEEKLY;COUNT=1'}
+        response = self.client.post('/api/bookings/series/', series, format='json', HTTP_IDEMPOTENCY_KEY='term')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['conflicts'][0]['date'], self.tuesday.isoformat())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        other.status = 'CANCELLED'
+        other.save()
+        response = self.client.post('/api/bookings/series/', series, format='json', HTTP_IDEMPOTENCY_KEY='term')
+        self.assertEqual((response.status_code, response.data['created']), (201, 1))
+
+    def test_validation(self):
+        for change in [{'rule': 'FREQ=YEARLY;COUNT=2'}, {'rule': 'FREQ=WEEKLY;INTERVAL=100000;COUNT=10'},
+                       {'end_time': '13:00'}, {'participants_count': 9}, {'resource_type': 'EQUIPMENT'}]:
+            with self.subTest(change=change):
+                response = self.client.post('/api/bookings/series/', {**self.series, **change}, format='json')
+                self.assertEqual(response.status_code, 400)
+
+    def test_cancel_series_as_a_unit(self):
+        response = self.client.post('/api/bookings/series/', self.series, format='json')
+        url = f"/api/bookings/series/{response.data['id']}/cancel/"
+        bookings = WorkspaceBooking.objects.filter(series=response.data['id'])
+        # An occurrence that already took place keeps its status
+        past = bookings.order_by('start_at').first()
+        WorkspaceBooking.objects.filter(pk=past.pk).update(
+            start_at=timezone.now() - timedelta(hours=2), end_at=timezone.now() - timedelta(hours=1)
+        )
+
+        technician = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN', lab='IVE')
+        self.client.force_authenticate(technician)
+        self.assertEqual(self.client.post(url).status_code, 403)
+
+        self.client.force_authenticate(self.student)
+        response = self.client.post(url)
+        self.assertEqual((response.status_code, response.data['cancelled'], response.data['status']), (200, 3, 'CANCELLED'))
+        self.assertEqual(list(bookings.exclude(pk=past.pk).values_list('status', flat=True).distinct()), ['CANCELLED'])
+        self.assertEqual(bookings.get(pk=past.pk).status, 'PENDING')
+        self.assertEqual(BookingIndex.objects.filter(status='CANCELLED').count(), 3)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        # The slots are free again
+        self.assertFalse(overlapping(
+            WorkspaceBooking.objects.all(), *slot_interval(self.tuesday + timedelta(weeks=1), time(14), time(16))
+        ).exists())
 
-# Create your tests here.
@@ -5,10 +5,11 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.http import HttpRequest
+from .idempotency import respond_once
 from .views import (
-    WorkspaceViewSet, BookingSlotViewSet, EquipmentBookingViewSet, 
-    WorkspaceBookingViewSet, CalendarView, MyBookingsView,
-    ResourceAvailabilityView, BookingsListView
+    WorkspaceViewSet, BookingSlotViewSet, SlotTemplateViewSet, EquipmentBookingViewSet, 
+    WorkspaceBookingViewSet, BookingSeriesViewSet, CalendarView, MyBookingsView,
+    ResourceAvailabilityView, BatchAvailabilityView, BookingsListView
 )
 
 # Create a class for handling generic bookings
@@ -16,6 +17,10 @@ class BookingCreateRouter(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        # Retries sent with the same Idempotency-Key get the first response back
+        return respond_once(request, lambda: self.create(request))
+    
+    def create(self, request):
         # Store the data from request.data before it gets consumed
         resource_type = request.data.get('resource_type')
         data = request.data.copy()
@@ -61,8 +66,10 @@ class BookingsRouter(APIView):
 router = DefaultRouter()
 router.register(r'workspaces', WorkspaceViewSet)
 router.register(r'slots', BookingSlotViewSet)
+router.register(r'slot-templates', SlotTemplateViewSet)
 router.register(r'equipment-bookings', EquipmentBookingViewSet)
 router.register(r'workspace-bookings', WorkspaceBookingViewSet)
+router.register(r'series', BookingSeriesViewSet)
 
 urlpatterns = [
     path('', BookingsRouter.as_view()),  # Add this line for root POST requests
@@ -70,4 +77,5 @@ urlpatterns = [
     path('calendar/', CalendarView.as_view(), name='booking-calendar'),
     path('my_bookings/', MyBookingsView.as_view(), name='my-bookings'),
     path('availability/', ResourceAvailabilityView.as_view(), name='resource-availability'),
+    path('availability/batch/', BatchAvailabilityView.as_view(), name='batch-availability'),
 ]
\ No newline at end of file
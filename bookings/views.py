@@ -4,16 +4,27 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from django.utils import timezone
-from rest_framework.pagination import PageNumberPagination
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
+from functools import partial
 from rest_framework.permissions import OR
 
-from .models import Workspace, BookingSlot, EquipmentBooking, WorkspaceBooking
+from inventory.models import Equipment
+from . import calendar
+from .conflicts import BookingConflict
+from .idempotency import respond_once
+from .intervals import free_intervals, overlapping
+from .listing import BookingListPagination, search_filter, serialize_bookings
+from .models import (
+    Workspace, BookingSeries, BookingSlot, BookingIndex, EquipmentBooking, SlotTemplate, WorkspaceBooking
+)
 from .serializers import (
-    WorkspaceSerializer, BookingSlotSerializer, 
+    WorkspaceSerializer, BookingSlotSerializer, SlotTemplateSerializer,
     EquipmentBookingSerializer, EquipmentBookingCreateSerializer,
-    WorkspaceBookingSerializer, WorkspaceBookingCreateSerializer
+    WorkspaceBookingSerializer, WorkspaceBookingCreateSerializer,
+    BookingSeriesSerializer, BookingSeriesCreateSerializer
 )
+from .series import book_series, cancel_series
+from .slot_templates import generate_slots
 from users.permissions import IsAdminUser, IsLabManagerUser, IsTechnicianUser
 
 class WorkspaceViewSet(viewsets.ModelViewSet):
@@ -48,15 +59,17 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
         # Get all slots for the date
         all_slots = BookingSlot.objects.filter(date=target_date)
         
-        # Get booked slots for the workspace
-        booked_slot_ids = WorkspaceBooking.objects.filter(
-            workspace=workspace,
-            slot__date=target_date,
-            status__in=['PENDING', 'APPROVED']
-        ).values_list('slot_id', flat=True)
+        # Get the booked intervals that could touch them (a slot may run past midnight)
+        day_start = timezone.make_aware(datetime.combine(target_date, time.min))
+        booked = list(overlapping(
+            WorkspaceBooking.objects.filter(workspace=workspace), day_start, day_start + timedelta(days=2)
+        ).values_list('start_at', 'end_at'))
         
-        # Filter available slots
-        available_slots = all_slots.exclude(id__in=booked_slot_ids)
+        # Keep the slots that intersect none of them
+        available_slots = [
+            slot for slot in all_slots
+            if not any(start < slot.interval[1] and end > slot.interval[0] for start, end in booked)
+        ]
         
         return Response(BookingSlotSerializer(available_slots, many=True).data)
 
@@ -162,6 +175,37 @@ class BookingSlotViewSet(viewsets.ModelViewSet):
         })
 
 
+class SlotTemplateViewSet(viewsets.ModelViewSet):
+    """
+    Recurring slot patterns. POST .../{id}/generate/ expands one into
+    booking slots in a few bulk inserts instead of one request per slot.
+    """
+    queryset = SlotTemplate.objects.all()
+    serializer_class = SlotTemplateSerializer
+    
+    def get_permissions(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'generate']:
+            return [
+                permissions.IsAuthenticated(),
+                OR(IsAdminUser(), OR(IsLabManagerUser(), IsTechnicianUser()))
+            ]
+        return [permissions.IsAuthenticated()]
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+    
+    @action(detail=True, methods=['post'])
+    def generate(self, request, pk=None):
+        template = self.get_object()
+        total, created = generate_slots(template)
+        return Response({
+            "template": template.id,
+            "slots": total,
+            "created": created,
+            "existing": total - created,
+        })
+
+
 class EquipmentBookingViewSet(viewsets.ModelViewSet):
     queryset = EquipmentBooking.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -188,6 +232,10 @@ class EquipmentBookingViewSet(viewsets.ModelViewSet):
         # Students can only see their own bookings
         return EquipmentBooking.objects.filter(user=user)
     
+    def create(self, request, *args, **kwargs):
+        # Retries sent with the same Idempotency-Key get the first response back
+        return respond_once(request, partial(super().create, request, *args, **kwargs))
+    
     def perform_create(self, serializer):
         serializer.save(user=self.request.user, status='PENDING')
     
@@ -307,6 +355,10 @@ class WorkspaceBookingViewSet(viewsets.ModelViewSet):
         # Students can only see their own bookings
         return WorkspaceBooking.objects.filter(user=user)
     
+    def create(self, request, *args, **kwargs):
+        # Retries sent with the same Idempotency-Key get the first response back
+        return respond_once(request, partial(super().create, request, *args, **kwargs))
+    
     def perform_create(self, serializer):
         serializer.save(user=self.request.user, status='PENDING')
     
@@ -399,7 +451,78 @@ class WorkspaceBookingViewSet(viewsets.ModelViewSet):
         booking.save()
         
         return Response(WorkspaceBookingSerializer(booking).data)
-    
+
+
+class BookingSeriesViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Recurring bookings. POST takes a resource, a daily slot and an
+    RRULE-like rule (FREQ=DAILY|WEEKLY, INTERVAL, BYDAY, COUNT or UNTIL),
+    books every free occurrence at once and lists the dates that conflict.
+    POST .../{id}/cancel/ cancels the series' upcoming bookings together.
+    """
+    queryset = BookingSeries.objects.all()
+    serializer_class = BookingSeriesSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'resource_type', 'equipment', 'workspace', 'user']
+
+    def get_queryset(self):
+        user = self.request.user
+
+        if user.is_admin or user.is_lab_manager:
+            return BookingSeries.objects.all()
+
+        if user.is_technician:
+            return BookingSeries.objects.filter(Q(equipment__lab=user.lab) | Q(workspace__lab=user.lab))
+
+        return BookingSeries.objects.filter(user=user)
+
+    def create(self, request, *args, **kwargs):
+        return respond_once(request, partial(self._create, request))
+
+    def _create(self, request):
+        serializer = BookingSeriesCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        series, conflicts = book_series(user=request.user, **data)
+        conflicts = [
+            {"date": day.isoformat(), "start": start.isoformat(), "end": end.isoformat()}
+            for day, start, end in conflicts
+        ]
+
+        if series is None:
+            # Raised rather than returned, so an Idempotency-Key claim is rolled back
+            raise BookingConflict("Every occurrence overlaps an existing booking.", conflicts=conflicts)
+
+        return Response({
+            **BookingSeriesSerializer(series).data,
+            "created": len(data['dates']) - len(conflicts),
+            "conflicts": conflicts,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        series = self.get_object()
+
+        # Only the user who created the series or an admin can cancel it
+        if series.user != request.user and not (request.user.is_admin or request.user.is_lab_manager):
+            return Response(
+                {"error": "You don't have permission to cancel this series."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if series.status == 'CANCELLED':
+            return Response(
+                {"error": "Series is already cancelled."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cancelled = cancel_series(series)
+
+        return Response({
+            **BookingSeriesSerializer(series).data,
+            "cancelled": cancelled,
+        })
 
 
 from django_filters.rest_framework import DjangoFilterBackend
@@ -434,114 +557,22 @@ class CalendarView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Initialize result
-        calendar_events = []
-        
-        # Get equipment bookings
-        equipment_bookings = EquipmentBooking.objects.filter(
-            slot__date__gte=start_date,
-            slot__date__lte=end_date
-        )
-        
-        # Apply filters for equipment bookings
-        if status_param:
-            equipment_bookings = equipment_bookings.filter(status=status_param)
-        
-        if equipment_id:
-            equipment_bookings = equipment_bookings.filter(equipment_id=equipment_id)
-        
-        if lab:
-            equipment_bookings = equipment_bookings.filter(equipment__lab=lab)
-        
-        # Get workspace bookings
-        workspace_bookings = WorkspaceBooking.objects.filter(
-            slot__date__gte=start_date,
-            slot__date__lte=end_date
-        )
-        
-        # Apply filters for workspace bookings
-        if status_param:
-            workspace_bookings = workspace_bookings.filter(status=status_param)
-        
-        if workspace_id:
-            workspace_bookings = workspace_bookings.filter(workspace_id=workspace_id)
-        
-        if lab:
-            workspace_bookings = workspace_bookings.filter(workspace__lab=lab)
+        for name, value in [('equipment_id', equipment_id), ('workspace_id', workspace_id)]:
+            if value and not value.isdigit():
+                return Response(
+                    {"error": f"{name} must be an integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        # Filter by resource type if specified
-        if resource_type == 'EQUIPMENT':
-            workspace_bookings = WorkspaceBooking.objects.none()
-        elif resource_type == 'WORKSPACE':
-            equipment_bookings = EquipmentBooking.objects.none()
-        
-        # Process equipment bookings
-        for booking in equipment_bookings:
-            slot = booking.slot
-            event = {
-                'id': f"equipment_{booking.id}",
-                'title': f"{booking.equipment.name} - {booking.user.get_full_name()}",
-                'start': f"{slot.date}T{slot.start_time}",
-                'end': f"{slot.date}T{slot.end_time}",
-                'resourceType': 'EQUIPMENT',
-                'resourceId': booking.equipment.id,
-                'resourceName': booking.equipment.name,
-                'status': booking.status,
-                'userId': booking.user.id,
-                'userName': booking.user.get_full_name(),
-                'lab': booking.equipment.lab,
-                'purpose': booking.purpose,
-                'projectName': booking.project_name,
-                'notes': booking.notes,
-                'color': self._get_status_color(booking.status)
-            }
-            calendar_events.append(event)
-        
-        # Process workspace bookings
-        for booking in workspace_bookings:
-            slot = booking.slot
-            event = {
-                'id': f"workspace_{booking.id}",
-                'title': f"{booking.workspace.name} - {booking.user.get_full_name()}",
-                'start': f"{slot.date}T{slot.start_time}",
-                'end': f"{slot.date}T{slot.end_time}",
-                'resourceType': 'WORKSPACE',
-                'resourceId': booking.workspace.id,
-                'resourceName': booking.workspace.name,
-                'status': booking.status,
-                'userId': booking.user.id,
-                'userName': booking.user.get_full_name(),
-                'lab': booking.workspace.lab,
-                'purpose': booking.purpose,
-                'projectName': booking.project_name,
-                'participantsCount': booking.participants_count,
-                'notes': booking.notes,
-                'color': self._get_status_color(booking.status)
-            }
-            calendar_events.append(event)
-        
-        return Response(calendar_events)
-    
-    def _get_status_color(self, status):
-        """Return a color code for each booking status."""
-        status_colors = {
-            'PENDING': '#FFC107',   # Yellow
-            'APPROVED': '#4CAF50',  # Green
-            'REJECTED': '#F44336',  # Red
-            'CANCELLED': '#9E9E9E', # Gray
-            'COMPLETED': '#2196F3'  # Blue
-        }
-        return status_colors.get(status, '#9C27B0')  # Default purple
-
-
-class MyBookingsPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+        # Built from two joined values() queries and cached until a booking changes
+        return Response(calendar.get_events(
+            start_date=start_date, end_date=end_date, resource_type=resource_type,
+            equipment_id=equipment_id, workspace_id=workspace_id, status=status_param, lab=lab
+        ))
+
 
 class MyBookingsView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = MyBookingsPagination
     
     def get(self, request):
         # Get query parameters
@@ -549,78 +580,26 @@ class MyBookingsView(APIView):
         status = request.query_params.get('status', '')
         resource_type = request.query_params.get('resource_type', '')
         lab = request.query_params.get('lab', '')
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 10))
         
-        # Get user's equipment bookings
-        equipment_bookings = EquipmentBooking.objects.filter(user=request.user)
+        bookings = BookingIndex.objects.filter(user=request.user)
         
         # Apply filters
         if search:
-            equipment_bookings = equipment_bookings.filter(
-                Q(equipment__name__icontains=search) |
-                Q(purpose__icontains=search) |
-                Q(project_name__icontains=search)
-            )
+            bookings = bookings.filter(search_filter(search, ['purpose', 'project_name']))
         
         if status:
-            equipment_bookings = equipment_bookings.filter(status=status)
+            bookings = bookings.filter(status=status)
             
         if lab:
-            equipment_bookings = equipment_bookings.filter(equipment__lab=lab)
-            
-        # Get user's workspace bookings
-        workspace_bookings = WorkspaceBooking.objects.filter(user=request.user)
-        
-        # Apply filters
-        if search:
-            workspace_bookings = workspace_bookings.filter(
-                Q(workspace__name__icontains=search) |
-                Q(purpose__icontains=search) |
-                Q(project_name__icontains=search)
-            )
-        
-        if status:
-            workspace_bookings = workspace_bookings.filter(status=status)
-            
-        if lab:
-            workspace_bookings = workspace_bookings.filter(workspace__lab=lab)
+            bookings = bookings.filter(lab=lab)
             
         # Filter by resource type
-        if resource_type == 'EQUIPMENT':
-            workspace_bookings = WorkspaceBooking.objects.none()
-        elif resource_type == 'WORKSPACE':
-            equipment_bookings = EquipmentBooking.objects.none()
-            
-        # Serialize bookings
-        equipment_data = EquipmentBookingSerializer(equipment_bookings, many=True).data
-        workspace_data = WorkspaceBookingSerializer(workspace_bookings, many=True).data
-        
-        # Combine results
-        all_bookings = []
-        
-        for booking in equipment_data:
-            booking['resource_type'] = 'EQUIPMENT'
-            all_bookings.append(booking)
-            
-        for booking in workspace_data:
-            booking['resource_type'] = 'WORKSPACE'
-            all_bookings.append(booking)
+        if resource_type in ('EQUIPMENT', 'WORKSPACE'):
+            bookings = bookings.filter(resource_type=resource_type)
             
-        # Sort by date
-        all_bookings.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        # Paginate results
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_bookings = all_bookings[start:end]
-        
-        return Response({
-            'results': paginated_bookings,
-            'count': len(all_bookings),
-            'next': f"/api/bookings/my_bookings/?page={page+1}&page_size={page_size}" if end < len(all_bookings) else None,
-            'previous': f"/api/bookings/my_bookings/?page={page-1}&page_size={page_size}" if page > 1 else None,
-        })
+        paginator = BookingListPagination()
+        page = paginator.paginate_bookings(bookings, request)
+        return paginator.get_paginated_response(serialize_bookings(page))
     
 
 
@@ -643,15 +622,13 @@ class ResourceAvailabilityView(APIView):
         
         # Parse timestamps
         try:
-            # Parse the datetime strings
+            # Parse the datetime strings; naive ones are in the lab's local time
             start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
             end_time = datetime.fromisoformat(end_time_str.replace('Z', '+00:00'))
-            
-            # Extract the date and time components
-            start_date = start_time.date()
-            start_time_only = start_time.time()
-            end_date = end_time.date()
-            end_time_only = end_time.time()
+            if timezone.is_naive(start_time):
+                start_time = timezone.make_aware(start_time)
+            if timezone.is_naive(end_time):
+                end_time = timezone.make_aware(end_time)
             
         except ValueError:
             return Response(
@@ -659,6 +636,12 @@ class ResourceAvailabilityView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if start_time >= end_time:
+            return Response(
+                {"error": "start_time must be before end_time."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         # Check if the resource is available
         if resource_type == 'EQUIPMENT':
             # Check if equipment exists
@@ -680,18 +663,9 @@ class ResourceAvailabilityView(APIView):
                     }
                 )
             
-            # Find all slots in the time range
-            slots = BookingSlot.objects.filter(
-                date__range=[start_date, end_date],
-                start_time__gte=start_time_only if start_date == end_date else '00:00:00',
-                end_time__lte=end_time_only if start_date == end_date else '23:59:59'
-            )
-            
-            # Check for existing bookings
-            existing_bookings = EquipmentBooking.objects.filter(
-                equipment_id=resource_id,
-                slot__in=slots,
-                status__in=['PENDING', 'APPROVED']
+            # Check for existing bookings that overlap the requested period
+            existing_bookings = overlapping(
+                BookingIndex.objects.filter(resource_type='EQUIPMENT', resource_id=resource_id), start_time, end_time
             )
             
             if existing_bookings.exists():
@@ -721,18 +695,9 @@ class ResourceAvailabilityView(APIView):
                     }
                 )
             
-            # Find all slots in the time range
-            slots = BookingSlot.objects.filter(
-                date__range=[start_date, end_date],
-                start_time__gte=start_time_only if start_date == end_date else '00:00:00',
-                end_time__lte=end_time_only if start_date == end_date else '23:59:59'
-            )
-            
-            # Check for existing bookings
-            existing_bookings = WorkspaceBooking.objects.filter(
-                workspace_id=resource_id,
-                slot__in=slots,
-                status__in=['PENDING', 'APPROVED']
+            # Check for existing bookings that overlap the requested period
+            existing_bookings = overlapping(
+                BookingIndex.objects.filter(resource_type='WORKSPACE', resource_id=resource_id), start_time, end_time
             )
             
             if existing_bookings.exists():
@@ -751,6 +716,134 @@ class ResourceAvailabilityView(APIView):
         
         # If we get here, the resource is available
         return Response({"available": True})
+
+
+class BatchAvailabilityView(APIView):
+    """
+    Free intervals of many equipment items and workspaces over a date range,
+    for rendering a booking grid in one request. The active bookings of all
+    requested resources come back in one query; each resource's free time is
+    then a sweep of its merged bookings against the day windows.
+    """
+    permission_classes = [IsAuthenticated]
+    max_resources = 100
+    max_days = 31
+    
+    def _ids(self, name):
+        raw = self.request.query_params.get(name, '')
+        return sorted({int(value) for value in raw.split(',') if value.strip()})
+    
+    def _windows(self, start_date, end_date, opens, closes):
+        """Local-time windows to look for free time in: whole days, or opening hours each day."""
+        if opens is None:
+            return [(
+                timezone.make_aware(datetime.combine(start_date, time.min)),
+                timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min)),
+            )]
+        days = (end_date - start_date).days + 1
+        return [
+            (
+                timezone.make_aware(datetime.combine(start_date + timedelta(days=offset), opens)),
+                timezone.make_aware(datetime.combine(start_date + timedelta(days=offset), closes)),
+            )
+            for offset in range(days)
+        ]
+    
+    def get(self, request):
+        try:
+            equipment_ids = self._ids('equipment')
+            workspace_ids = self._ids('workspace')
+        except ValueError:
+            return Response(
+                {"error": "equipment and workspace must be comma-separated IDs."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not equipment_ids and not workspace_ids:
+            return Response(
+                {"error": "Provide equipment and/or workspace IDs."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(equipment_ids) + len(workspace_ids) > self.max_resources:
+            return Response(
+                {"error": f"At most {self.max_resources} resources can be checked at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start_date = date.fromisoformat(request.query_params.get('start', date.today().isoformat()))
+            end_date = date.fromisoformat(request.query_params.get('end', (start_date + timedelta(days=6)).isoformat()))
+        except ValueError:
+            return Response(
+                {"error": "Invalid date format. Please use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start_date > end_date or (end_date - start_date).days >= self.max_days:
+            return Response(
+                {"error": f"end must not be before start, and the range may span at most {self.max_days} days."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        opens, closes = request.query_params.get('open') or None, request.query_params.get('close') or None
+        if bool(opens) != bool(closes):
+            return Response(
+                {"error": "Provide both open and close, or neither."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if opens:
+            try:
+                opens, closes = time.fromisoformat(opens), time.fromisoformat(closes)
+            except ValueError:
+                return Response(
+                    {"error": "Invalid time format. Please use HH:MM."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if opens >= closes:
+                return Response(
+                    {"error": "open must be before close."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        windows = self._windows(start_date, end_date, opens, closes)
+        
+        # Every active booking of every requested resource that touches the range, in one query
+        requested = (
+            Q(resource_type='EQUIPMENT', resource_id__in=equipment_ids)
+            | Q(resource_type='WORKSPACE', resource_id__in=workspace_ids)
+        )
+        busy = {}
+        for row in overlapping(BookingIndex.objects.filter(requested), windows[0][0], windows[-1][1]).values(
+            'resource_type', 'resource_id', 'start_at', 'end_at'
+        ):
+            busy.setdefault((row['resource_type'], row['resource_id']), []).append((row['start_at'], row['end_at']))
+        
+        resources = []
+        for resource_type, items, ids, bookable in [
+            ('EQUIPMENT', Equipment.objects.values('id', 'name', 'status'), equipment_ids,
+             lambda item: item['status'] in ['AVAILABLE', 'IN_USE']),
+            ('WORKSPACE', Workspace.objects.values('id', 'name', 'is_active'), workspace_ids,
+             lambda item: item['is_active']),
+        ]:
+            if not ids:
+                continue
+            found = {item['id']: item for item in items.filter(id__in=ids)}
+            for resource_id in ids:
+                entry = {'resource_type': resource_type, 'resource_id': resource_id}
+                item = found.get(resource_id)
+                if item is None:
+                    entry.update(name=None, bookable=False, reason="Not found", free=[])
+                elif not bookable(item):
+                    entry.update(name=item['name'], bookable=False, reason="Not available for booking", free=[])
+                else:
+                    free = free_intervals(windows, busy.get((resource_type, resource_id), []))
+                    entry.update(name=item['name'], bookable=True, free=[
+                        {'start': timezone.localtime(start), 'end': timezone.localtime(end)} for start, end in free
+                    ])
+                resources.append(entry)
+        
+        return Response({
+            'start': start_date,
+            'end': end_date,
+            'resources': resources,
+        })
     
 class BookingsListView(APIView):
     permission_classes = [IsAuthenticated]
@@ -762,112 +855,31 @@ class BookingsListView(APIView):
         resource_type = request.query_params.get('resource_type', '')
         lab = request.query_params.get('lab', '')
         
-        try:
-            page = int(request.query_params.get('page', '1'))
-            page_size = int(request.query_params.get('page_size', '10'))
-        except ValueError:
-            page = 1
-            page_size = 10
-        
         user = request.user
         
-        # Get equipment bookings
-        if user.is_admin or user.is_lab_manager:
-            equipment_bookings = EquipmentBooking.objects.all()
-        elif user.is_technician:
-            equipment_bookings = EquipmentBooking.objects.filter(equipment__lab=user.lab)
-        else:
-            equipment_bookings = EquipmentBooking.objects.filter(user=user)
-        
-        # Apply filters
-        if search:
-            equipment_bookings = equipment_bookings.filter(
-                Q(equipment__name__icontains=search) |
-                Q(purpose__icontains=search) |
-                Q(project_name__icontains=search) |
-                Q(notes__icontains=search)
-            )
-        
-        if status_param:
-            equipment_bookings = equipment_bookings.filter(status=status_param)
-            
-        if lab:
-            equipment_bookings = equipment_bookings.filter(equipment__lab=lab)
-        
-        # Get workspace bookings
+        # One table holds both kinds of booking
         if user.is_admin or user.is_lab_manager:
-            workspace_bookings = WorkspaceBooking.objects.all()
+            bookings = BookingIndex.objects.all()
         elif user.is_technician:
-            workspace_bookings = WorkspaceBooking.objects.filter(workspace__lab=user.lab)
+            bookings = BookingIndex.objects.filter(lab=user.lab)
         else:
-            workspace_bookings = WorkspaceBooking.objects.filter(user=user)
+            bookings = BookingIndex.objects.filter(user=user)
         
         # Apply filters
         if search:
-            workspace_bookings = workspace_bookings.filter(
-                Q(workspace__name__icontains=search) |
-                Q(purpose__icontains=search) |
-                Q(project_name__icontains=search) |
-                Q(notes__icontains=search)
-            )
+            bookings = bookings.filter(search_filter(search, ['purpose', 'project_name', 'notes']))
         
         if status_param:
-            workspace_bookings = workspace_bookings.filter(status=status_param)
+            bookings = bookings.filter(status=status_param)
             
         if lab:
-            workspace_bookings = workspace_bookings.filter(workspace__lab=lab)
+            bookings = bookings.filter(lab=lab)
             
         # Filter by resource type if specified
-        if resource_type == 'EQUIPMENT':
-            workspace_bookings = WorkspaceBooking.objects.none()
-        elif resource_type == 'WORKSPACE':
-            equipment_bookings = EquipmentBooking.objects.none()
+        if resource_type in ('EQUIPMENT', 'WORKSPACE'):
+            bookings = bookings.filter(resource_type=resource_type)
             
-        # Serialize bookings
-        equipment_data = EquipmentBookingSerializer(equipment_bookings, many=True).data
-        workspace_data = WorkspaceBookingSerializer(workspace_bookings, many=True).data
-        
-        # Combine results
-        all_bookings = []
-        
-        for booking in equipment_data:
-            booking['resource_type'] = 'EQUIPMENT'
-            all_bookings.append(booking)
-            
-        for booking in workspace_data:
-            booking['resource_type'] = 'WORKSPACE'
-            all_bookings.append(booking)
-            
-        # Sort by created_at (newest first)
-        all_bookings.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        # Total count before pagination
-        total_count = len(all_bookings)
-        
-        # Apply pagination
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_bookings = all_bookings[start:end]
-        
-        # Build pagination URLs
-        base_url = "/api/bookings/"
-        query_params = request.query_params.copy()
-        
-        # Calculate next page URL
-        next_page_url = None
-        if end < total_count:
-            query_params['page'] = page + 1
-            next_page_url = f"{base_url}?{query_params.urlencode()}"
-        
-        # Calculate previous page URL
-        previous_page_url = None
-        if page > 1:
-            query_params['page'] = page - 1
-            previous_page_url = f"{base_url}?{query_params.urlencode()}"
-        
-        return Response({
-            'results': paginated_bookings,
-            'count': total_count,
-            'next': next_page_url,
-            'previous': previous_page_url,
-        })
\ No newline at end of file
+        # Order and page in SQL; only the page is serialized
+        paginator = BookingListPagination()
+        page = paginator.paginate_bookings(bookings, request)
+        return paginator.get_paginated_response(serialize_bookings(page))
\ No newline at end of file
@@ -1,8 +1,13 @@
 from django.contrib import admin
-from .models import Category, Equipment, MaintenanceRecord, EquipmentUsageLog, EquipmentTransfer
+from .models import (
+    Category, Equipment, MaintenanceRecord, EquipmentUsageLog, EquipmentTransfer,
+    EquipmentUtilizationDaily, MaintenanceAlert
+)
 
 admin.site.register(Category)
 admin.site.register(Equipment)
 admin.site.register(MaintenanceRecord)
 admin.site.register(EquipmentUsageLog)
-admin.site.register(EquipmentTransfer)
\ No newline at end of file
+admin.site.register(EquipmentTransfer)
+admin.site.register(EquipmentUtilizationDaily)
+admin.site.register(MaintenanceAlert)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class ScanCache:
+    """
+    Bounded, thread-safe LRU of scan code -> serialized equipment.
+
+    Entries are dropped by equipment id (see inventory.signals), which also
+    covers codes that were changed since they were cached. The cache lives in
+    the worker process, so each worker only sees its own invalidations; writes
+    made by other workers or management commands show up once an entry is
+    `ttl` seconds old.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._codes_by_equipment = {}
+        # Bumped on every invalidation so a lookup that raced a write does not
+        # store what it read before the write.
+        self.generation = 0
+
+    def get(self, code):
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                self._drop(code)
+                return None
+            self._entries.move_to_end(code)
+            return entry[1]
+
+    def set(self, code, equipment_id, data, generation):
+        with self._lock:
+            if generation != self.generation:
+                return
+            if code in self._entries:
+                self._drop(code)
+            self._entries[code] = (equipment_id, data, time.monotonic() + self.ttl)
+            self._codes_by_equipment.setdefault(equipment_id, set()).add(code)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, code):
+        # Callers hold the lock
+        equipment_id = self._entries.pop(code)[0]
+        codes = self._codes_by_equipment.get(equipment_id)
+        if codes is not None:
+            codes.discard(code)
+            if not codes:
+                del self._codes_by_equipment[equipment_id]
+
+    def invalidate(self, equipment_id):
+        with self._lock:
+            self.generation += 1
+            for code in self._codes_by_equipment.pop(equipment_id, ()):
+                self._entries.pop(code, None)
+
+    def invalidate_many(self, equipment_ids):
+        for equipment_id in equipment_ids:
+            self.invalidate(equipment_id)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._codes_by_equipment.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+scan_cache = ScanCache(
+    getattr(settings, 'INVENTORY_SCAN_CACHE_SIZE', 4096),
+    getattr(settings, 'INVENTORY_SCAN_CACHE_TTL', 10),
+)
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import EquipmentUsageLog
+
+# A checkout held longer than this is reported as overdue
+OVERDUE_AFTER_HOURS = getattr(settings, 'INVENTORY_CHECKOUT_OVERDUE_HOURS', 24)
+
+
+def open_checkouts(lab=None, user_id=None, overdue_only=False, now=None):
+    """
+    Rows for every open usage log, oldest checkout first. Reads
+    inventory_usage_open_idx, which only holds open logs, so the cost follows
+    the number of items out rather than the size of the usage history.
+    """
+    now = now or timezone.now()
+    queryset = EquipmentUsageLog.objects.filter(check_in_time__isnull=True)
+    if lab:
+        queryset = queryset.filter(equipment__lab=lab)
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    if overdue_only:
+        queryset = queryset.filter(check_out_time__lt=now - timedelta(hours=OVERDUE_AFTER_HOURS))
+    return queryset.order_by('check_out_time', 'id').values(
+        'id', 'check_out_time', 'purpose', 'equipment_id', 'user_id',
+        'equipment__name', 'equipment__barcode', 'equipment__lab',
+        'user__username', 'user__first_name', 'user__last_name'
+    )
+
+
+def group_by_holder(rows, now=None):
+    """
+    Nest open checkouts as lab -> holder -> items, each item with how long it
+    has been out and by how much it is overdue (both in seconds).
+    """
+    now = now or timezone.now()
+    limit = OVERDUE_AFTER_HOURS * 3600
+    labs, totals = {}, {'active': 0, 'overdue': 0}
+    for row in rows:
+        held = int((now - row['check_out_time']).total_seconds())
+        overdue = max(held - limit, 0)
+        lab = labs.setdefault(row['equipment__lab'], {
+            'lab': row['equipment__lab'], 'active': 0, 'overdue': 0, 'holders': {},
+        })
+        holder = lab['holders'].setdefault(row['user_id'], {
+            'user': row['user_id'],
+            'username': row['user__username'],
+            'user_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            'items': [],
+        })
+        holder['items'].append({
+            'usage_log': row['id'],
+            'equipment': row['equipment_id'],
+            'equipment_name': row['equipment__name'],
+            'barcode': row['equipment__barcode'],
+            'check_out_time': row['check_out_time'],
+            'purpose': row['purpose'],
+            'held_seconds': held,
+            'overdue_seconds': overdue,
+        })
+        for counts in (lab, totals):
+            counts['active'] += 1
+            counts['overdue'] += bool(overdue)
+
+    for lab in labs.values():
+        lab['holders'] = list(lab['holders'].values())
+    return {
+        'generated_at': now,
+        'overdue_after_hours': OVERDUE_AFTER_HOURS,
+        'totals': totals,
+        'labs': list(labs.values()),
+    }
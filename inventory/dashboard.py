@@ -0,0 +1,96 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Equipment, EquipmentUsageLog
+
+VERSION_KEY = 'inventory:dashboard:version'
+CACHE_TIMEOUT = getattr(settings, 'INVENTORY_DASHBOARD_CACHE_TIMEOUT', 300)
+
+
+def current_version():
+    """
+    The stamp cached dashboards are keyed by. It is kept in the shared cache so
+    every process sees a bump; the dashboards themselves stay in the local one.
+    """
+    stamps = caches['shared']
+    version = stamps.get(VERSION_KEY)
+    if version is None:
+        # A fresh stamp can never match entries cached under an evicted one
+        stamps.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = stamps.get(VERSION_KEY)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached dashboard. Call it once the write has committed."""
+    # A new stamp rather than incr(): the file backend's incr is a read and a
+    # write, and two processes bumping at once could land on the same value
+    caches['shared'].set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def build_dashboard(today=None):
+    """Compute the dashboard with one GROUP BY query per aggregate."""
+    today = today or timezone.localdate()
+    counts = list(
+        Equipment.objects.values('status', 'lab', 'category_id', 'category__name')
+        .annotate(count=Count('id')).order_by('status', 'lab', 'category__name')
+    )
+    active_checkouts = dict(
+        EquipmentUsageLog.objects.filter(check_in_time__isnull=True)
+        .values_list('equipment__lab').annotate(count=Count('id')).order_by()
+    )
+    overdue = dict(
+        Equipment.objects.filter(next_maintenance_date__lt=today)
+        .values_list('lab').annotate(count=Count('id')).order_by()
+    )
+
+    by_status, by_lab, in_maintenance = Counter(), Counter(), Counter()
+    for row in counts:
+        by_status[row['status']] += row['count']
+        by_lab[row['lab']] += row['count']
+        if row['status'] == 'MAINTENANCE':
+            in_maintenance[row['lab']] += row['count']
+
+    return {
+        'generated_at': timezone.now(),
+        'totals': {
+            'equipment': sum(by_status.values()),
+            'active_checkouts': sum(active_checkouts.values()),
+            'in_maintenance': sum(in_maintenance.values()),
+            'overdue_maintenance': sum(overdue.values()),
+        },
+        'by_status': dict(by_status),
+        'by_lab': dict(by_lab),
+        'by_status_lab_category': [
+            {
+                'status': row['status'],
+                'lab': row['lab'],
+                'category': row['category_id'],
+                'category_name': row['category__name'],
+                'count': row['count'],
+            }
+            for row in counts
+        ],
+        'active_checkouts_by_lab': active_checkouts,
+        'in_maintenance_by_lab': dict(in_maintenance),
+        'overdue_maintenance_by_lab': overdue,
+    }
+
+
+def get_dashboard():
+    """
+    The dashboard for today, cached under the current version stamp. The
+    date is part of the key because "overdue" moves at midnight.
+    """
+    today = timezone.localdate()
+    key = f'inventory:dashboard:{current_version()}:{today.isoformat()}'
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard(today)
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
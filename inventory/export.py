@@ -0,0 +1,158 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import Equipment, EquipmentUsageLog, MaintenanceRecord
+
+CHUNK_SIZE = 2000
+
+# Exportable columns (output name -> ORM path) and the lab/status/category
+# filters of each resource, as used by the management command.
+EXPORTS = {
+    'equipment': {
+        'model': Equipment,
+        'columns': {
+            'id': 'id',
+            'name': 'name',
+            'description': 'description',
+            'serial_number': 'serial_number',
+            'barcode': 'barcode',
+            'category': 'category__name',
+            'status': 'status',
+            'lab': 'lab',
+            'location': 'location',
+            'purchase_date': 'purchase_date',
+            'last_maintenance_date': 'last_maintenance_date',
+            'next_maintenance_date': 'next_maintenance_date',
+            'image': 'image',
+        },
+        'filters': {'lab': 'lab', 'status': 'status', 'category': 'category_id'},
+    },
+    'usage-logs': {
+        'model': EquipmentUsageLog,
+        'columns': {
+            'id': 'id',
+            'equipment': 'equipment_id',
+            'equipment_name': 'equipment__name',
+            'lab': 'equipment__lab',
+            'user': 'user_id',
+            'username': 'user__username',
+            'check_out_time': 'check_out_time',
+            'check_in_time': 'check_in_time',
+            'purpose': 'purpose',
+            'notes': 'notes',
+        },
+        'filters': {'lab': 'equipment__lab', 'status': 'equipment__status', 'category': 'equipment__category_id'},
+    },
+    'maintenance': {
+        'model': MaintenanceRecord,
+        'columns': {
+            'id': 'id',
+            'equipment': 'equipment_id',
+            'equipment_name': 'equipment__name',
+            'lab': 'equipment__lab',
+            'maintenance_date': 'maintenance_date',
+            'description': 'description',
+            'performed_by': 'performed_by_id',
+            'performed_by_username': 'performed_by__username',
+            'is_completed': 'is_completed',
+            'notes': 'notes',
+            'created_at': 'created_at',
+        },
+        'filters': {'lab': 'equipment__lab', 'status': 'equipment__status', 'category': 'equipment__category_id'},
+    },
+}
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def select_columns(resource, fields=None):
+    """
+    Return the {name: path} columns for a comma-separated `fields` selection
+    (all columns when empty). Raises ValueError for unknown names.
+    """
+    available = EXPORTS[resource]['columns']
+    if not fields:
+        return dict(available)
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}.")
+    return {name: available[name] for name in names}
+
+
+def apply_filters(queryset, resource, params):
+    """Apply the lab/status/category filters present in `params` (a mapping)."""
+    for name, path in EXPORTS[resource]['filters'].items():
+        value = params.get(name)
+        if value:
+            queryset = queryset.filter(**{path: value})
+    return queryset
+
+
+def iter_export(queryset, columns, export_format):
+    """
+    Yield the export line by line. Rows are pulled with values_list() in
+    chunks, so memory use does not depend on the size of the table.
+    """
+    rows = queryset.values_list(*columns.values()).iterator(chunk_size=CHUNK_SIZE)
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(list(columns))
+        for row in rows:
+            yield writer.writerow(row)
+    else:
+        names = list(columns)
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+class ExportMixin:
+    """
+    Adds a streaming `export/` list route to a viewset. The export reuses
+    the viewset's own query-param filters, search and ordering, plus the
+    lab/status/category filters of EXPORTS unless `export_filters` is off
+    (for viewsets whose get_queryset already handles them).
+    """
+    export_resource = None
+    export_filters = True
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get('output', 'csv')
+        if export_format not in FORMATS:
+            return Response(
+                {"error": f"Invalid output. Must be one of: {', '.join(FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            columns = select_columns(self.export_resource, request.query_params.get('fields'))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.export_filters:
+            queryset = apply_filters(queryset, self.export_resource, request.query_params)
+        response = StreamingHttpResponse(
+            iter_export(queryset, columns, export_format),
+            content_type=FORMATS[export_format]
+        )
+        filename = f"{self.export_resource}-{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,77 @@
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# (max width, max height, WebP quality) per rendition
+RENDITIONS = {
+    'image_thumbnail': ('equipment/thumbnails', (320, 320), 75),
+    'image_medium': ('equipment/medium', (1024, 1024), 82),
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def _render(source, size, quality):
+    image = source.copy()
+    image.thumbnail(size, Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format='WEBP', quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def _open(content):
+    try:
+        image = Image.open(io.BytesIO(content))
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise InvalidImage("Uploaded file is not a valid image.") from exc
+    # Bake in the camera rotation before the EXIF data is dropped
+    image = ImageOps.exif_transpose(image)
+    return image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+
+
+def _store(name, content):
+    # Names are content addressed, so an existing file is already the right one
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def build_renditions(content, digest=None, source=None):
+    """
+    Generate (or reuse) the WebP renditions for `content`. Returns the
+    rendition field values to set on an Equipment.
+    """
+    digest = digest or hashlib.sha256(content).hexdigest()
+    fields = {'image_hash': digest}
+    for field, (folder, size, quality) in RENDITIONS.items():
+        name = f"{folder}/{digest}.webp"
+        if not default_storage.exists(name):
+            if source is None:
+                source = _open(content)
+            name = _store(name, _render(source, size, quality))
+        fields[field] = name
+    return fields
+
+
+def store_image(upload):
+    """
+    Store an uploaded original under its SHA-256 and build its renditions.
+    Identical uploads, for this or any other item, share the same files.
+    Returns the image field values to set on an Equipment; raises
+    InvalidImage for files Pillow cannot decode.
+    """
+    content = upload.read()
+    digest = hashlib.sha256(content).hexdigest()
+    # Validate before anything is written to storage
+    source = _open(content)
+    extension = os.path.splitext(upload.name or '')[1].lower() or '.jpg'
+    fields = build_renditions(content, digest, source)
+    fields['image'] = _store(f"equipment/originals/{digest}{extension}", content)
+    return fields
@@ -0,0 +1,178 @@
+import csv
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from . import dashboard
+from .models import Category, Equipment
+from .serializers import EquipmentImportRowSerializer
+
+REQUIRED_COLUMNS = ['name', 'serial_number', 'barcode', 'category', 'lab']
+OPTIONAL_COLUMNS = [
+    'description', 'status', 'location',
+    'purchase_date', 'last_maintenance_date', 'next_maintenance_date',
+]
+# Cap the per-row report so a badly broken 50k-row file stays readable
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFileError(ValueError):
+    """The file itself is unusable (e.g. missing columns)."""
+
+
+class EquipmentImporter:
+    """
+    Stream a CSV of equipment into the database in chunks.
+
+    Each chunk is validated with one serializer pass, one query for
+    serial/barcode collisions and the in-memory category map, then inserted
+    with bulk_create. With `atomic` the whole file is one transaction that
+    is rolled back if any row fails; otherwise valid rows are kept chunk by
+    chunk. `dry_run` validates without writing anything.
+    """
+
+    def __init__(self, chunk_size=1000, atomic=True, dry_run=False, create_categories=False, progress=None):
+        self.chunk_size = chunk_size
+        self.atomic = atomic
+        self.dry_run = dry_run
+        self.create_categories = create_categories
+        self.progress = progress
+        self.validator = EquipmentImportRowSerializer()
+
+    def run(self, lines):
+        reader = csv.DictReader(lines)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFileError(f"Missing required column(s): {', '.join(missing)}.")
+
+        self.categories = {name.lower(): pk for name, pk in Category.objects.values_list('name', 'id')}
+        self.seen_serials, self.seen_barcodes = set(), set()
+        self.result = {'rows': 0, 'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+
+        # Row numbers match what a spreadsheet shows (the header is row 1)
+        rows = enumerate(reader, start=2)
+        if self.atomic or self.dry_run:
+            with transaction.atomic():
+                self._run_chunks(rows)
+                if self.dry_run or self.result['failed']:
+                    transaction.set_rollback(True)
+                    self.result['created'] = 0
+        else:
+            self._run_chunks(rows)
+        self.result['committed'] = not self.dry_run and not (self.atomic and self.result['failed'])
+        return self.result
+
+    def _run_chunks(self, rows):
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+            if self.progress:
+                self.progress(self.result)
+
+    def _import_chunk(self, chunk):
+        self.result['rows'] += len(chunk)
+        data = [
+            {key: (value.strip() or None) if isinstance(value, str) else value
+             for key, value in row.items() if key in REQUIRED_COLUMNS or key in OPTIONAL_COLUMNS}
+            for _, row in chunk
+        ]
+        for row in data:
+            if row.get('status') is None:
+                row.pop('status', None)
+        # One serializer validates the whole chunk, as many=True would, but
+        # keeps the validated values of the good rows when others fail
+        row_errors = []
+        for index, row in enumerate(data):
+            try:
+                data[index] = self.validator.run_validation(row)
+                row_errors.append({})
+            except ValidationError as exc:
+                row_errors.append(dict(exc.detail))
+
+        # Every collision with existing rows in one query
+        valid = [row for row, errors in zip(data, row_errors) if not errors]
+        existing = Equipment.objects.filter(
+            Q(serial_number__in=[row['serial_number'] for row in valid]) |
+            Q(barcode__in=[row['barcode'] for row in valid])
+        ).values_list('serial_number', 'barcode')
+        taken_serials, taken_barcodes = set(), set()
+        for serial_number, barcode in existing:
+            taken_serials.add(serial_number)
+            taken_barcodes.add(barcode)
+
+        accepted, new_categories = [], {}
+        for (line, _), row, errors in zip(chunk, data, row_errors):
+            if not errors:
+                errors = self._check_row(row, taken_serials, taken_barcodes)
+            if errors:
+                self._report(line, errors)
+                continue
+            if row['category'].lower() not in self.categories:
+                # Only created for rows that are inserted, see below
+                new_categories.setdefault(row['category'].lower(), row['category'])
+            accepted.append(row)
+
+        if not accepted or (self.atomic and self.result['failed']):
+            # The whole import will be rolled back anyway
+            return
+        try:
+            with transaction.atomic():
+                for key, name in new_categories.items():
+                    self.categories[key] = Category.objects.create(name=name).id
+                Equipment.objects.bulk_create([self._equipment(row) for row in accepted], batch_size=500)
+                # bulk_create sends no post_save
+                transaction.on_commit(dashboard.bump_version)
+        except IntegrityError as exc:
+            # Only reachable if another writer inserted the same codes meanwhile
+            for key in new_categories:
+                self.categories.pop(key, None)
+            self.result['failed'] += len(accepted)
+            self._report(None, {'non_field_errors': [f"Chunk could not be inserted: {exc}"]}, count=False)
+            return
+        self.result['created'] += len(accepted)
+
+    def _equipment(self, row):
+        return Equipment(
+            name=row['name'],
+            description=row.get('description'),
+            serial_number=row['serial_number'],
+            barcode=row['barcode'],
+            category_id=self.categories[row['category'].lower()],
+            status=row.get('status') or 'AVAILABLE',
+            lab=row['lab'],
+            location=row.get('location'),
+            purchase_date=row.get('purchase_date'),
+            last_maintenance_date=row.get('last_maintenance_date'),
+            next_maintenance_date=row.get('next_maintenance_date'),
+        )
+
+    def _check_row(self, row, taken_serials, taken_barcodes):
+        errors = {}
+        serial_number, barcode = row['serial_number'], row['barcode']
+        if serial_number in taken_serials:
+            errors['serial_number'] = ["Equipment with this serial number already exists."]
+        elif serial_number in self.seen_serials:
+            errors['serial_number'] = ["Serial number appears more than once in the file."]
+        if barcode in taken_barcodes:
+            errors['barcode'] = ["Equipment with this barcode already exists."]
+        elif barcode in self.seen_barcodes:
+            errors['barcode'] = ["Barcode appears more than once in the file."]
+
+        if row['category'].lower() not in self.categories and not self.create_categories:
+            errors['category'] = [f"Unknown category '{row['category']}'."]
+
+        self.seen_serials.add(serial_number)
+        self.seen_barcodes.add(barcode)
+        return errors
+
+    def _report(self, line, errors, count=True):
+        if count:
+            self.result['failed'] += 1
+        if len(self.result['errors']) < MAX_REPORTED_ERRORS:
+            self.result['errors'].append({'row': line, 'errors': errors})
+        else:
+            self.result['errors_truncated'] = True
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Equipment, MaintenanceAlert
+
+DUE_SOON_DAYS = getattr(settings, 'INVENTORY_MAINTENANCE_DUE_SOON_DAYS', 7)
+
+
+def due_status(due_date, today=None):
+    return 'OVERDUE' if due_date < (today or timezone.localdate()) else 'DUE_SOON'
+
+
+def iter_due_batches(horizon, batch_size=500):
+    """
+    Yield lists of (id, next_maintenance_date) for equipment due on or
+    before `horizon`, walking the (next_maintenance_date, id) index with a
+    keyset instead of OFFSET so each batch is a short range scan.
+    """
+    queryset = Equipment.objects.filter(next_maintenance_date__lte=horizon).order_by('next_maintenance_date', 'id')
+    last = None
+    while True:
+        batch = queryset
+        if last:
+            batch = batch.filter(
+                Q(next_maintenance_date__gt=last[1]) | Q(next_maintenance_date=last[1], id__gt=last[0])
+            )
+        rows = list(batch.values_list('id', 'next_maintenance_date')[:batch_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+
+
+def refresh_maintenance_queue(today=None, due_soon_days=None, batch_size=500):
+    """
+    Bring the MaintenanceAlert queue in line with the equipment due dates:
+    flag everything due within `due_soon_days` (or overdue) and drop alerts
+    for items that are no longer due. Returns a summary dict.
+    """
+    today = today or timezone.localdate()
+    horizon = today + timedelta(days=DUE_SOON_DAYS if due_soon_days is None else due_soon_days)
+    summary = {'due_soon': 0, 'overdue': 0, 'cleared': 0}
+
+    for rows in iter_due_batches(horizon, batch_size):
+        alerts = []
+        for equipment_id, due_date in rows:
+            level = due_status(due_date, today)
+            summary['overdue' if level == 'OVERDUE' else 'due_soon'] += 1
+            alerts.append(MaintenanceAlert(equipment_id=equipment_id, level=level, due_date=due_date))
+        # One upsert per batch; flagged_at keeps the time the item was first queued
+        with transaction.atomic():
+            MaintenanceAlert.objects.bulk_create(
+                alerts, update_conflicts=True, unique_fields=['equipment'],
+                update_fields=['level', 'due_date', 'updated_at']
+            )
+
+    summary['cleared'], _ = MaintenanceAlert.objects.filter(
+        Q(equipment__next_maintenance_date__isnull=True) | Q(equipment__next_maintenance_date__gt=horizon)
+    ).delete()
+    return summary
@@ -0,0 +1,78 @@
+import random
+import statistics
+import time
+from functools import reduce
+from operator import and_, or_
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from inventory.models import Category, Equipment
+from inventory.search import search_equipment, search_supported
+
+WORDS = [
+    'microscope', 'centrifuge', 'oscilloscope', 'soldering', 'printer', 'sieve',
+    'homogenizer', 'spectrometer', 'incubator', 'pipette', 'scanner', 'laser',
+    'olympus', 'prusa', 'fluke', 'tektronix', 'digital', 'portable', 'bench',
+]
+LIKE_FIELDS = ['name', 'serial_number', 'barcode', 'status']
+
+
+def like_search(term):
+    # Same predicate DRF's SearchFilter builds for search_fields
+    return Equipment.objects.filter(reduce(and_, [
+        reduce(or_, [Q(**{f'{field}__icontains': word}) for field in LIKE_FIELDS])
+        for word in term.split()
+    ]))
+
+
+class Command(BaseCommand):
+    help = 'Compare the equipment FTS5 search against the LIKE-based SearchFilter on synthetic data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=4000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            raise CommandError('The full-text index is only available on SQLite.')
+
+        terms = ['micro', 'olympus scope', 'BC-00012', 'shelf 7', 'tek osc', 'nothing']
+        # Everything is seeded inside a transaction that is rolled back
+        with transaction.atomic():
+            self.seed(options['rows'])
+            self.stdout.write(f"{options['rows']} synthetic rows, {options['repeat']} runs per term (median ms)")
+            self.stdout.write(f"{'term':<16}{'LIKE':>10}{'FTS5':>10}{'LIKE hits':>11}{'FTS hits':>10}")
+            for term in terms:
+                like_ms, like_hits = self.time(lambda: list(like_search(term).order_by('id')[:51]), options['repeat'])
+                fts_ms, fts_hits = self.time(
+                    lambda: list(search_equipment(Equipment.objects.all(), term).order_by('search_rank', 'id')[:51]),
+                    options['repeat']
+                )
+                self.stdout.write(f"{term:<16}{like_ms:>10.2f}{fts_ms:>10.2f}{like_hits:>11}{fts_hits:>10}")
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        rng = random.Random(0)
+        categories = [Category.objects.create(name=f"Bench category {i}") for i in range(10)]
+        Equipment.objects.bulk_create([
+            Equipment(
+                name=' '.join(rng.sample(WORDS, 3)).title(),
+                description=' '.join(rng.sample(WORDS, 8)),
+                serial_number=f"BENCH-SN-{i:07d}",
+                barcode=f"BC-{i:07d}",
+                category=rng.choice(categories),
+                lab=rng.choice(['IVE', 'CEZERI', 'MEDTECH']),
+                location=f"Shelf {rng.randint(1, 40)}",
+            )
+            for i in range(rows)
+        ], batch_size=500)
+
+    def time(self, fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), len(result)
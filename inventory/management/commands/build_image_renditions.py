@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from inventory.images import InvalidImage, build_renditions
+from inventory.models import Equipment
+
+
+class Command(BaseCommand):
+    help = 'Generate missing thumbnail/medium WebP renditions for equipment images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Process every image, not only those without renditions.')
+
+    def handle(self, *args, **options):
+        queryset = Equipment.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['all']:
+            queryset = queryset.filter(image_hash__isnull=True)
+
+        built = failed = 0
+        for equipment in queryset.only('id', 'image').iterator(chunk_size=200):
+            try:
+                with equipment.image.open('rb') as original:
+                    fields = build_renditions(original.read())
+            except (InvalidImage, OSError) as exc:
+                failed += 1
+                self.stderr.write(f"Equipment {equipment.id} ({equipment.image.name}): {exc}")
+                continue
+            # update() skips the save signals, so go through save()
+            for field, value in fields.items():
+                setattr(equipment, field, value)
+            equipment.save(update_fields=list(fields))
+            built += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Built renditions for {built} item(s), {failed} failed."))
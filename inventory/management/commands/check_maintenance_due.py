@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventory.maintenance import DUE_SOON_DAYS, refresh_maintenance_queue
+
+
+class Command(BaseCommand):
+    help = 'Queue equipment whose maintenance is due soon or overdue, in batches over the due-date index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DUE_SOON_DAYS, help='Flag items due within this many days.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=int,
+            help='Keep running as a worker, re-checking every INTERVAL seconds.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            summary = refresh_maintenance_queue(due_soon_days=options['days'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{summary['overdue']} overdue, {summary['due_soon']} due soon, {summary['cleared']} alert(s) cleared."
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
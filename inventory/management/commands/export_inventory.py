@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.export import EXPORTS, FORMATS, apply_filters, iter_export, select_columns
+
+
+class Command(BaseCommand):
+    help = 'Stream equipment, usage logs or maintenance records to CSV or NDJSON with flat memory use.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=list(EXPORTS))
+        parser.add_argument('--output', choices=list(FORMATS), default='csv', help='Output format.')
+        parser.add_argument('--fields', help='Comma-separated columns to include (default: all).')
+        parser.add_argument('--lab')
+        parser.add_argument('--status')
+        parser.add_argument('--category', help='Category ID.')
+        parser.add_argument('--file', help='Write to this path instead of stdout.')
+
+    def handle(self, *args, **options):
+        resource = options['resource']
+        try:
+            columns = select_columns(resource, options['fields'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        queryset = apply_filters(EXPORTS[resource]['model'].objects.order_by('id'), resource, options)
+        lines = iter_export(queryset, columns, options['output'])
+        if options['file']:
+            with open(options['file'], 'w', newline='', encoding='utf-8') as handle:
+                handle.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.importer import EquipmentImporter, ImportFileError
+
+
+class Command(BaseCommand):
+    help = 'Bulk import equipment from a CSV file (columns: name, serial_number, barcode, category, lab, ...).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--partial', action='store_true', help='Keep valid rows even if others fail.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; write nothing.')
+        parser.add_argument('--create-categories', action='store_true', help='Create categories that do not exist yet.')
+
+    def handle(self, *args, **options):
+        importer = EquipmentImporter(
+            chunk_size=options['chunk_size'],
+            atomic=not options['partial'],
+            dry_run=options['dry_run'],
+            create_categories=options['create_categories'],
+            progress=lambda result: self.stdout.write(
+                f"{result['rows']} rows processed, {result['created']} created, {result['failed']} failed"
+            ),
+        )
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as handle:
+                result = importer.run(handle)
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result['errors_truncated']:
+            self.stderr.write("More errors were found; only the first ones are listed.")
+
+        if result['committed']:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} of {result['rows']} row(s)."))
+        elif options['dry_run']:
+            self.stdout.write(f"Dry run: {result['rows'] - result['failed']} of {result['rows']} row(s) are valid.")
+        else:
+            raise CommandError(f"{result['failed']} row(s) failed; nothing was imported.")
@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from inventory.models import EquipmentUsageLog, EquipmentUtilizationDaily
+from inventory.rollups import aggregate_sessions
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily equipment utilization rollup from closed usage logs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild days from this date on (YYYY-MM-DD). Default: everything.')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("Invalid --since date. Please use YYYY-MM-DD.")
+
+        logs = EquipmentUsageLog.objects.filter(check_in_time__isnull=False)
+        rollups = EquipmentUtilizationDaily.objects.all()
+        if since:
+            # Sessions that started earlier still count for the days after `since`
+            logs = logs.filter(check_in_time__gte=timezone.make_aware(datetime.combine(since, time.min)))
+            rollups = rollups.filter(day__gte=since)
+
+        sessions = logs.values_list('equipment_id', 'equipment__lab', 'check_out_time', 'check_in_time')
+        # Read and replace in one transaction so concurrent check-ins are not lost
+        with transaction.atomic():
+            totals = aggregate_sessions(sessions.iterator(chunk_size=2000), since)
+            deleted, _ = rollups.delete()
+            EquipmentUtilizationDaily.objects.bulk_create(
+                [
+                    EquipmentUtilizationDaily(
+                        equipment_id=equipment_id, lab=lab, day=day,
+                        seconds_in_use=seconds, sessions=count
+                    )
+                    for (equipment_id, lab, day), (seconds, count) in totals.items()
+                ],
+                batch_size=500
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Replaced {deleted} rollup row(s) with {len(totals)} row(s)."
+        ))
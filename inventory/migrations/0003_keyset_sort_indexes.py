@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmenttransfer',
+            index=models.Index(fields=['transfer_date', 'id'], name='inventory_e_transfe_ead6b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentusagelog',
+            index=models.Index(fields=['check_out_time', 'id'], name='inventory_e_check_o_2c88ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(fields=['maintenance_date', 'id'], name='inventory_m_mainten_fa1d2b_idx'),
+        ),
+    ]
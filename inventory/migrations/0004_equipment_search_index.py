@@ -0,0 +1,105 @@
+import django.db.models.deletion
+import inventory.models
+from django.db import migrations, models
+
+# SQLite-only: an FTS5 index over the searchable equipment columns plus the
+# category name, maintained by triggers so that bulk inserts and queryset
+# updates stay in sync too. Other backends keep using the LIKE search.
+
+INDEXED_COLUMNS = "name, description, serial_number, barcode, location, category_name"
+
+NEW_ROW = (
+    "new.id, new.name, new.description, new.serial_number, new.barcode, new.location, "
+    "(SELECT name FROM inventory_category WHERE id = new.category_id)"
+)
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE inventory_equipment_fts USING fts5(
+        {INDEXED_COLUMNS},
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER inventory_equipment_fts_insert AFTER INSERT ON inventory_equipment
+    BEGIN
+        INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS}) VALUES ({NEW_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER inventory_equipment_fts_update AFTER UPDATE ON inventory_equipment
+    WHEN old.name IS NOT new.name
+        OR old.description IS NOT new.description
+        OR old.serial_number IS NOT new.serial_number
+        OR old.barcode IS NOT new.barcode
+        OR old.location IS NOT new.location
+        OR old.category_id IS NOT new.category_id
+    BEGIN
+        DELETE FROM inventory_equipment_fts WHERE rowid = old.id;
+        INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS}) VALUES ({NEW_ROW});
+    END
+    """,
+    """
+    CREATE TRIGGER inventory_equipment_fts_delete AFTER DELETE ON inventory_equipment
+    BEGIN
+        DELETE FROM inventory_equipment_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER inventory_category_fts_update AFTER UPDATE OF name ON inventory_category
+    BEGIN
+        UPDATE inventory_equipment_fts SET category_name = new.name
+        WHERE rowid IN (SELECT id FROM inventory_equipment WHERE category_id = new.id);
+    END
+    """,
+    f"""
+    INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS})
+    SELECT e.id, e.name, e.description, e.serial_number, e.barcode, e.location, c.name
+    FROM inventory_equipment e LEFT JOIN inventory_category c ON c.id = e.category_id
+    """,
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS inventory_category_fts_update",
+    "DROP TRIGGER IF EXISTS inventory_equipment_fts_delete",
+    "DROP TRIGGER IF EXISTS inventory_equipment_fts_update",
+    "DROP TRIGGER IF EXISTS inventory_equipment_fts_insert",
+    "DROP TABLE IF EXISTS inventory_equipment_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_keyset_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.CreateModel(
+            name='EquipmentSearchIndex',
+            fields=[
+                ('equipment', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='inventory.equipment')),
+                ('document', inventory.models.SearchDocumentField(db_column='inventory_equipment_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'inventory_equipment_fts',
+                'managed': False,
+            },
+        ),
+    ]
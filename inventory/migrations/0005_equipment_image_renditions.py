@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_equipment_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='image_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='image_medium',
+            field=models.ImageField(blank=True, null=True, upload_to='equipment/medium/'),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='equipment/thumbnails/'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_equipment_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentUtilizationDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lab', models.CharField(choices=[('IVE', 'IvE Design Studio'), ('CEZERI', 'Cezeri Lab'), ('MEDTECH', 'MedTech Lab')], max_length=20)),
+                ('day', models.DateField()),
+                ('seconds_in_use', models.PositiveIntegerField(default=0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('equipment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utilization', to='inventory.equipment')),
+            ],
+            options={
+                'verbose_name_plural': 'Equipment utilization (daily)',
+                'indexes': [models.Index(fields=['lab', 'day'], name='inventory_e_lab_9cf989_idx'), models.Index(fields=['day'], name='inventory_e_day_5ccd1c_idx')],
+                'unique_together': {('equipment', 'day', 'lab')},
+            },
+        ),
+    ]
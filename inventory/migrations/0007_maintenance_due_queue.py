@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_equipment_utilization_daily'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenanceAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(choices=[('DUE_SOON', 'Due soon'), ('OVERDUE', 'Overdue')], max_length=10)),
+                ('due_date', models.DateField()),
+                ('flagged_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['next_maintenance_date', 'id'], name='inventory_e_next_ma_779645_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['maintenance_date', 'id'], name='inventory_maint_open_idx'),
+        ),
+        migrations.AddField(
+            model_name='maintenancealert',
+            name='equipment',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_alert', to='inventory.equipment'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancealert',
+            index=models.Index(fields=['level', 'due_date'], name='inventory_m_level_3e1f46_idx'),
+        ),
+    ]
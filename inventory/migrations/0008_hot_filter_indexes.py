@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_maintenance_due_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['lab', 'status', 'category'], name='inventory_e_lab_8777b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentusagelog',
+            index=models.Index(fields=['equipment', 'check_in_time'], name='inventory_e_equipme_3c08bc_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_hot_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmenttransfer',
+            index=models.Index(fields=['equipment', 'transfer_date', 'id'], name='inventory_e_equipme_852eb9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentusagelog',
+            index=models.Index(fields=['equipment', 'check_out_time', 'id'], name='inventory_e_equipme_fc3be6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(fields=['equipment', 'maintenance_date', 'id'], name='inventory_m_equipme_61bcb8_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_equipment_history_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerecord',
+            index=models.Index(fields=['equipment', 'created_at', 'id'], name='inventory_m_equipme_26800c_idx'),
+        ),
+    ]
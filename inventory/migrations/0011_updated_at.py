@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:55
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+search_index = import_module('inventory.migrations.0004_equipment_search_index')
+
+# Adding a column with a non-constant default makes SQLite rebuild both
+# tables, which drops the FTS triggers on inventory_equipment and trips over
+# the ones that reference the table being swapped. Take the triggers down
+# for the rebuild and put them back afterwards; the FTS table keeps its rows.
+TRIGGERS = search_index.CREATE_STATEMENTS[1:5]
+DROP_TRIGGERS = search_index.DROP_STATEMENTS[:4]
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_triggers, create_triggers),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='equipment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
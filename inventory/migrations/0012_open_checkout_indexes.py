@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-17 02:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='equipmentusagelog',
+            name='inventory_e_equipme_3c08bc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='equipmentusagelog',
+            index=models.Index(condition=models.Q(('check_in_time__isnull', True)), fields=['equipment', 'check_out_time'], name='inventory_usage_open_item_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentusagelog',
+            index=models.Index(condition=models.Q(('check_in_time__isnull', True)), fields=['check_out_time', 'id'], name='inventory_usage_open_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from importlib import import_module
+
+from django.db import migrations
+
+search_index = import_module('inventory.migrations.0004_equipment_search_index')
+
+# `status` was one of the LIKE search_fields, so ?search=AVAILABLE matched
+# before the FTS index took over. Rebuild the index with a status column so
+# it still does; the update trigger now also fires on status changes.
+
+INDEXED_COLUMNS = "name, description, serial_number, barcode, location, category_name, status"
+
+NEW_ROW = (
+    "new.id, new.name, new.description, new.serial_number, new.barcode, new.location, "
+    "(SELECT name FROM inventory_category WHERE id = new.category_id), new.status"
+)
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE inventory_equipment_fts USING fts5(
+        {INDEXED_COLUMNS},
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER inventory_equipment_fts_insert AFTER INSERT ON inventory_equipment
+    BEGIN
+        INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS}) VALUES ({NEW_ROW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER inventory_equipment_fts_update AFTER UPDATE ON inventory_equipment
+    WHEN old.name IS NOT new.name
+        OR old.description IS NOT new.description
+        OR old.serial_number IS NOT new.serial_number
+        OR old.barcode IS NOT new.barcode
+        OR old.location IS NOT new.location
+        OR old.category_id IS NOT new.category_id
+        OR old.status IS NOT new.status
+    BEGIN
+        DELETE FROM inventory_equipment_fts WHERE rowid = old.id;
+        INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS}) VALUES ({NEW_ROW});
+    END
+    """,
+    search_index.CREATE_STATEMENTS[3],
+    search_index.CREATE_STATEMENTS[4],
+    f"""
+    INSERT INTO inventory_equipment_fts (rowid, {INDEXED_COLUMNS})
+    SELECT e.id, e.name, e.description, e.serial_number, e.barcode, e.location, c.name, e.status
+    FROM inventory_equipment e LEFT JOIN inventory_category c ON c.id = e.category_id
+    """,
+]
+
+
+def rebuild(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in search_index.DROP_STATEMENTS + statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_open_checkout_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild(CREATE_STATEMENTS), rebuild(search_index.CREATE_STATEMENTS)),
+    ]
@@ -4,6 +4,7 @@ from django.conf import settings
 class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name_plural = 'Categories'
@@ -37,10 +38,56 @@ class Equipment(models.Model):
     last_maintenance_date = models.DateField(blank=True, null=True)
     next_maintenance_date = models.DateField(blank=True, null=True)
     image = models.ImageField(upload_to='equipment/', blank=True, null=True)
+    # WebP renditions of `image`, generated by inventory.images
+    image_thumbnail = models.ImageField(upload_to='equipment/thumbnails/', blank=True, null=True)
+    image_medium = models.ImageField(upload_to='equipment/medium/', blank=True, null=True)
+    image_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    # Also bumped when the item's maintenance, usage or transfer history changes
+    # (inventory.signals), so it stands for everything the API renders for it
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        indexes = [
+            # Walked in order by the maintenance scheduler and due_maintenance
+            models.Index(fields=['next_maintenance_date', 'id']),
+            # The list's lab/status/category filters, in that order of use
+            models.Index(fields=['lab', 'status', 'category']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.serial_number}"
 
+class SearchDocumentField(models.TextField):
+    """The hidden FTS5 column named after its table; only supports `__match`."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+class EquipmentSearchIndex(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 index over equipment, created and
+    kept in sync by triggers in migrations 0004_equipment_search_index and
+    0013_search_index_status.
+    """
+    equipment = models.OneToOneField(
+        Equipment, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_index'
+    )
+    document = SearchDocumentField(db_column='inventory_equipment_fts')
+    rank = models.FloatField()
+    
+    class Meta:
+        managed = False
+        db_table = 'inventory_equipment_fts'
+
 class MaintenanceRecord(models.Model):
     equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='maintenance_records')
     maintenance_date = models.DateField()
@@ -50,6 +97,20 @@ class MaintenanceRecord(models.Model):
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['maintenance_date', 'id']),
+            # Per-item history, newest first
+            models.Index(fields=['equipment', 'maintenance_date', 'id']),
+            # Per-item timeline
+            models.Index(fields=['equipment', 'created_at', 'id']),
+            # Open work orders only; backs ?is_completed=false
+            models.Index(
+                fields=['maintenance_date', 'id'], condition=models.Q(is_completed=False),
+                name='inventory_maint_open_idx'
+            ),
+        ]
+    
     def __str__(self):
         return f"{self.equipment.name} - {self.maintenance_date}"
 
@@ -61,6 +122,24 @@ class EquipmentUsageLog(models.Model):
     purpose = models.TextField()
     notes = models.TextField(blank=True, null=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['check_out_time', 'id']),
+            # Per-item history, newest first
+            models.Index(fields=['equipment', 'check_out_time', 'id']),
+            # Open checkouts only, so their size follows what is out right now
+            # rather than the whole history: the latest open log per item on
+            # checkin, and everything out, oldest first, for active_checkouts
+            models.Index(
+                fields=['equipment', 'check_out_time'], condition=models.Q(check_in_time__isnull=True),
+                name='inventory_usage_open_item_idx'
+            ),
+            models.Index(
+                fields=['check_out_time', 'id'], condition=models.Q(check_in_time__isnull=True),
+                name='inventory_usage_open_idx'
+            ),
+        ]
+    
     def __str__(self):
         return f"{self.equipment.name} used by {self.user.username}"
 
@@ -73,5 +152,63 @@ class EquipmentTransfer(models.Model):
     return_date = models.DateTimeField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['transfer_date', 'id']),
+            # Per-item history, newest first
+            models.Index(fields=['equipment', 'transfer_date', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.equipment.name} transferred from {self.from_lab} to {self.to_lab}"
+
+
+class EquipmentUtilizationDaily(models.Model):
+    """
+    Seconds each item spent checked out per local day and lab. Maintained by
+    inventory.rollups when a usage log is closed or edited through the API;
+    rebuild with the `rebuild_utilization` command.
+    """
+    equipment = models.ForeignKey(Equipment, on_delete=models.CASCADE, related_name='utilization')
+    lab = models.CharField(max_length=20, choices=Equipment.LAB_CHOICES)
+    day = models.DateField()
+    seconds_in_use = models.PositiveIntegerField(default=0)
+    sessions = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = 'Equipment utilization (daily)'
+        # equipment, day first so per-item date-range probes use the unique index
+        unique_together = ('equipment', 'day', 'lab')
+        indexes = [
+            models.Index(fields=['lab', 'day']),
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.equipment_id} in {self.lab} on {self.day}: {self.seconds_in_use}s"
+
+
+class MaintenanceAlert(models.Model):
+    """
+    Queue of equipment whose maintenance is due soon or overdue, filled by
+    the `check_maintenance_due` scheduler and cleared when the item is
+    serviced or rescheduled.
+    """
+    LEVEL_CHOICES = [
+        ('DUE_SOON', 'Due soon'),
+        ('OVERDUE', 'Overdue'),
+    ]
+    
+    equipment = models.OneToOneField(Equipment, on_delete=models.CASCADE, related_name='maintenance_alert')
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    due_date = models.DateField()
+    flagged_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['level', 'due_date']),
+        ]
+    
     def __str__(self):
-        return f"{self.equipment.name} transferred from {self.from_lab} to {self.to_lab}"
\ No newline at end of file
+        return f"{self.equipment_id}: {self.level} since {self.due_date}"
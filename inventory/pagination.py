@@ -0,0 +1,241 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque-cursor keyset pagination over a (sort key, id) pair.
+
+    The sort key is the first field the queryset is ordered by (normally set
+    by OrderingFilter from `?ordering=` or the view's default `ordering`);
+    `id` breaks ties in the same direction. Each page is fetched with a
+    `WHERE (key, id) > (cursor)` predicate, so the cost per page does not
+    grow with the table and no COUNT(*) is issued.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        self.pk_name = queryset.model._meta.pk.attname
+        self.key, self.key_field, self.descending = self.get_sort_key(queryset)
+        cursor = self.decode_cursor(request)
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor['r'])
+
+        # A "previous" page is read by walking the index the other way
+        # and flipping the rows back afterwards.
+        descending = self.descending != self.reverse
+        queryset = queryset.order_by(*self.get_ordering(descending))
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(cursor['v'], cursor['id'], descending))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_sort_key(self, queryset):
+        """
+        Return the (name, field, descending) triple for the first field the
+        queryset is ordered by. The name is a column attname or an annotation.
+        """
+        model = queryset.model
+        for ordering in queryset.query.order_by:
+            if not isinstance(ordering, str):
+                continue
+            descending = ordering.startswith('-')
+            name = ordering.lstrip('-')
+            if name in queryset.query.annotations:
+                return name, queryset.query.annotations[name].output_field, descending
+            if name == 'pk':
+                name = model._meta.pk.name
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            # Ordering by a relation is ordering by its column
+            if field.is_relation:
+                return field.attname, field.target_field, descending
+            return field.attname, field, descending
+        return self.pk_name, model._meta.pk, False
+
+    def get_ordering(self, descending):
+        if self.key == self.pk_name:
+            return [F(self.pk_name).desc() if descending else F(self.pk_name).asc()]
+        if descending:
+            return [F(self.key).desc(nulls_last=True), F(self.pk_name).desc()]
+        return [F(self.key).asc(nulls_first=True), F(self.pk_name).asc()]
+
+    def get_keyset_filter(self, value, pk, descending):
+        """Rows strictly after (value, pk) in the given direction, with NULLs kept at the low end."""
+        after = 'lt' if descending else 'gt'
+        pk_after = Q(**{f'{self.pk_name}__{after}': pk})
+        if self.key == self.pk_name:
+            return pk_after
+
+        key = self.key
+        if value is None:
+            if descending:
+                return Q(**{f'{key}__isnull': True}) & pk_after
+            return (Q(**{f'{key}__isnull': True}) & pk_after) | Q(**{f'{key}__isnull': False})
+
+        condition = Q(**{f'{key}__{after}': value}) | (Q(**{key: value}) & pk_after)
+        if descending:
+            condition |= Q(**{f'{key}__isnull': True})
+        return condition
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.key)
+        if isinstance(value, (datetime.date, datetime.time)):
+            # Full precision: a truncated timestamp would skip or repeat rows
+            value = value.isoformat()
+        payload = {
+            'k': self.key,
+            'v': value,
+            'id': obj.pk,
+            'r': reverse,
+        }
+        raw = json.dumps(payload, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if payload['k'] != self.key:
+                raise ValueError('Cursor was issued for a different ordering')
+            value = payload['v']
+            if value is not None:
+                value = self.key_field.to_python(value)
+            return {'v': value, 'id': int(payload['id']), 'r': bool(payload['r'])}
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+def merged_keyset_filter(kind, field, cursor, descending):
+    """
+    Keyset predicate for one branch of a merged (at, kind, id) ordering:
+    rows strictly after the cursor. `kind` is constant within a branch, so
+    the comparison on it is made here and only plain column predicates remain.
+    """
+    at, cursor_kind, pk = cursor
+    before = 'lt' if descending else 'gt'
+    if kind == cursor_kind:
+        return Q(**{f'{field}__{before}': at}) | Q(**{field: at, f'id__{before}': pk})
+    if (kind < cursor_kind) == descending:
+        return Q(**{f'{field}__{before}e': at})
+    return Q(**{f'{field}__{before}': at})
+
+
+class MergedKeysetPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over a UNION ALL of several sources whose rows are
+    {'id', 'kind', 'at', ...} dicts ordered by (at, kind, id), newest first.
+    The cursor carries the (at, kind, id) of the boundary row; `kinds` lists
+    the values a cursor may name.
+    """
+    kinds = ()
+
+    def paginate_union(self, build, request):
+        """
+        `build(cursor, descending)` returns the merged queryset for rows after
+        `cursor` (an (at, kind, id) tuple, or None) in that direction.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        cursor = self.decode_cursor(request)
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor[3])
+        queryset = build(cursor and cursor[:3], not self.reverse)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.has_cursor
+
+        self.page = results
+        return results
+
+    def cursor_key(self, obj):
+        """The (at, kind, id) position of a row."""
+        return obj['at'], obj['kind'], obj['id']
+
+    def encode_cursor(self, obj, reverse):
+        at, kind, pk = self.cursor_key(obj)
+        payload = {'at': at.isoformat(), 'kind': kind, 'id': pk, 'r': reverse}
+        raw = json.dumps(payload, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            at = parse_datetime(payload['at'])
+            if at is None or payload['kind'] not in self.kinds:
+                raise ValueError('Malformed cursor')
+            return at, payload['kind'], int(payload['id']), bool(payload['r'])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
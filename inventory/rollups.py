@@ -0,0 +1,90 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EquipmentUsageLog, EquipmentUtilizationDaily
+
+
+def split_by_day(start, end, since=None):
+    """
+    Yield (local date, seconds) for each local day the interval [start, end)
+    touches, skipping days before `since`.
+    """
+    tz = timezone.get_current_timezone()
+    cursor, end = timezone.localtime(start, tz), timezone.localtime(end, tz)
+    while cursor < end:
+        next_day = timezone.make_aware(datetime.combine(cursor.date() + timedelta(days=1), time.min), tz)
+        segment_end = min(next_day, end)
+        if since is None or cursor.date() >= since:
+            yield cursor.date(), int((segment_end - cursor).total_seconds())
+        cursor = segment_end
+
+
+def aggregate_sessions(sessions, since=None):
+    """
+    Fold (equipment_id, lab, check_out_time, check_in_time) tuples into
+    {(equipment_id, lab, day): [seconds, sessions]}.
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for equipment_id, lab, start, end in sessions:
+        for day, seconds in split_by_day(start, end, since):
+            total = totals[(equipment_id, lab, day)]
+            total[0] += seconds
+            total[1] += 1
+    return totals
+
+
+def record_usage(sessions):
+    """
+    Add closed usage sessions to the daily rollup. Call it inside the
+    transaction that closes the usage logs so both commit together.
+    """
+    totals = aggregate_sessions(sessions)
+    if not totals:
+        return
+    EquipmentUtilizationDaily.objects.bulk_create(
+        [EquipmentUtilizationDaily(equipment_id=equipment_id, lab=lab, day=day) for equipment_id, lab, day in totals],
+        ignore_conflicts=True
+    )
+    for (equipment_id, lab, day), (seconds, count) in totals.items():
+        EquipmentUtilizationDaily.objects.filter(equipment_id=equipment_id, lab=lab, day=day).update(
+            seconds_in_use=F('seconds_in_use') + seconds,
+            sessions=F('sessions') + count
+        )
+
+
+def usage_days(log):
+    """The (equipment_id, day) rollup rows a usage log contributes to; none while it is open."""
+    if log.check_in_time is None:
+        return set()
+    return {(log.equipment_id, day) for day, _ in split_by_day(log.check_out_time, log.check_in_time)}
+
+
+def rebuild_usage(keys):
+    """
+    Recompute the rollup rows named by (equipment_id, day) `keys` from the
+    closed usage logs, for edits that can't be applied incrementally. Call
+    it inside the transaction that changes the logs.
+    """
+    days_by_equipment = defaultdict(set)
+    for equipment_id, day in keys:
+        days_by_equipment[equipment_id].add(day)
+
+    tz = timezone.get_current_timezone()
+    for equipment_id, days in days_by_equipment.items():
+        start = timezone.make_aware(datetime.combine(min(days), time.min), tz)
+        end = timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min), tz)
+        sessions = EquipmentUsageLog.objects.filter(
+            equipment_id=equipment_id, check_in_time__gt=start, check_out_time__lt=end
+        ).values_list('equipment_id', 'equipment__lab', 'check_out_time', 'check_in_time')
+        totals = aggregate_sessions(sessions, min(days))
+        EquipmentUtilizationDaily.objects.filter(equipment_id=equipment_id, day__in=days).delete()
+        EquipmentUtilizationDaily.objects.bulk_create([
+            EquipmentUtilizationDaily(
+                equipment_id=equipment_id, lab=lab, day=day, seconds_in_use=seconds, sessions=count
+            )
+            for (_, lab, day), (seconds, count) in totals.items()
+            if day in days
+        ])
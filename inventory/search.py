@@ -0,0 +1,62 @@
+import re
+
+from django.db import connection
+from django.db.models import F
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(term):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every whitespace-separated word becomes a prefix phrase, so "olym micro"
+    matches "Olympus Microscope" and "BC-001" matches the barcode "BC-00123".
+    Returns None if the term has nothing searchable in it.
+    """
+    phrases = []
+    for word in term.split():
+        tokens = TOKEN_RE.findall(word)
+        if tokens:
+            phrases.append('"%s"*' % ' '.join(tokens))
+    return ' AND '.join(phrases) or None
+
+
+def search_supported():
+    return connection.vendor == 'sqlite'
+
+
+def search_equipment(queryset, term):
+    """
+    Restrict an Equipment queryset to full-text matches for `term` and
+    annotate each row with its bm25 `search_rank` (lower is better).
+    """
+    # An empty phrase is valid FTS5 syntax that matches nothing
+    match = build_match_query(term) or '""'
+    return queryset.filter(search_index__document__match=match).annotate(search_rank=F('search_index__rank'))
+
+
+class EquipmentSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the equipment FTS5 index.
+
+    Results are ordered by relevance unless the client asked for an explicit
+    `?ordering=`. Place it after OrderingFilter in `filter_backends`. Falls
+    back to the regular `search_fields` LIKE filter on databases without FTS5.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not search_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+
+        queryset = search_equipment(queryset, term)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('search_rank', 'id')
+        return queryset
+
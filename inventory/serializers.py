@@ -47,16 +47,66 @@ class EquipmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipment
         fields = '__all__'
+        read_only_fields = ('image_thumbnail', 'image_medium', 'image_hash')
     
     def get_category_name(self, obj):
         return obj.category.name
 
+class EquipmentListSerializer(EquipmentSerializer):
+    """Equipment lists show each item's open maintenance work, prefetched into `open_maintenance_records`."""
+    maintenance_records = MaintenanceRecordSerializer(source='open_maintenance_records', many=True, read_only=True)
+
 class EquipmentDetailSerializer(serializers.ModelSerializer):
+    """
+    An item with its history counts and only the latest entries of each
+    history (prefetched into `recent_*` by the viewset). The full history is
+    paginated under /equipment/{id}/maintenance/, usage-logs/ and transfers/.
+    """
     category = CategorySerializer(read_only=True)
-    maintenance_records = MaintenanceRecordSerializer(many=True, read_only=True)
-    usage_logs = EquipmentUsageLogSerializer(many=True, read_only=True)
-    transfers = EquipmentTransferSerializer(many=True, read_only=True)
+    maintenance_records = MaintenanceRecordSerializer(source='recent_maintenance_records', many=True, read_only=True)
+    usage_logs = EquipmentUsageLogSerializer(source='recent_usage_logs', many=True, read_only=True)
+    transfers = EquipmentTransferSerializer(source='recent_transfers', many=True, read_only=True)
+    maintenance_records_count = serializers.IntegerField(read_only=True)
+    usage_logs_count = serializers.IntegerField(read_only=True)
+    transfers_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Equipment
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        read_only_fields = ('image_thumbnail', 'image_medium', 'image_hash')
+
+class BulkCheckoutSerializer(serializers.Serializer):
+    """Input for bulk checkout/checkin of a kit, identified by IDs and/or barcodes."""
+    MAX_ITEMS = 200
+    
+    equipment_ids = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    barcodes = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    purpose = serializers.CharField(required=False, allow_blank=True, default='')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    atomic = serializers.BooleanField(required=False, default=True)
+    
+    def validate(self, data):
+        count = len(data['equipment_ids']) + len(data['barcodes'])
+        if not count:
+            raise serializers.ValidationError("Provide at least one equipment ID or barcode.")
+        if count > self.MAX_ITEMS:
+            raise serializers.ValidationError(f"At most {self.MAX_ITEMS} items can be processed at once.")
+        return data
+
+
+class EquipmentImportRowSerializer(serializers.Serializer):
+    """
+    One CSV row of an equipment import. Uniqueness and the category name are
+    checked per chunk by inventory.importer rather than row by row here.
+    """
+    name = serializers.CharField(max_length=100)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    serial_number = serializers.CharField(max_length=100)
+    barcode = serializers.CharField(max_length=100)
+    category = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=Equipment.STATUS_CHOICES, required=False, default='AVAILABLE')
+    lab = serializers.ChoiceField(choices=Equipment.LAB_CHOICES)
+    location = serializers.CharField(max_length=100, required=False, allow_blank=True, allow_null=True)
+    purchase_date = serializers.DateField(required=False, allow_null=True)
+    last_maintenance_date = serializers.DateField(required=False, allow_null=True)
+    next_maintenance_date = serializers.DateField(required=False, allow_null=True)
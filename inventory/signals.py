@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import dashboard
+from .cache import scan_cache
+from .models import Category, Equipment, EquipmentTransfer, EquipmentUsageLog, MaintenanceRecord
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+def invalidate_equipment_scan(sender, instance, **kwargs):
+    scan_cache.invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=MaintenanceRecord)
+def invalidate_maintenance_scan(sender, instance, **kwargs):
+    # Scan results embed the maintenance records
+    scan_cache.invalidate(instance.equipment_id)
+
+
+@receiver([post_save, post_delete], sender=MaintenanceRecord)
+@receiver([post_save, post_delete], sender=EquipmentUsageLog)
+@receiver([post_save, post_delete], sender=EquipmentTransfer)
+def touch_equipment(sender, instance, **kwargs):
+    # Equipment responses embed this history, so it moves the item's ETag
+    Equipment.objects.filter(pk=instance.equipment_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_scan(sender, instance, **kwargs):
+    scan_cache.clear()
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+@receiver([post_save, post_delete], sender=EquipmentUsageLog)
+@receiver([post_save, post_delete], sender=MaintenanceRecord)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_dashboard(sender, instance, **kwargs):
+    # queryset.update() and bulk_create() skip these; their callers bump too
+    transaction.on_commit(dashboard.bump_version)
@@ -1,3 +1,963 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient, APITestCase
+
+from offlineIMS.testing import QueryPlanMixin, make_equipment, query_plan
+from .cache import scan_cache
+from .models import (
+    Category, Equipment, MaintenanceRecord, EquipmentUsageLog, EquipmentTransfer,
+    EquipmentUtilizationDaily, MaintenanceAlert
+)
+
+User = get_user_model()
+
+
+class EquipmentQueryBudgetTests(APITestCase):
+    """
+    The equipment endpoints must run a fixed number of queries no matter how
+    many rows (or nested history rows) they render.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='tech', password='pass', role='TECHNICIAN', lab='IVE',
+            first_name='Tess', last_name='Tech'
+        )
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Microscopes')
+
+    def add_history(self, equipment, count):
+        for i in range(count):
+            MaintenanceRecord.objects.create(
+                equipment=equipment, maintenance_date=date.today() - timedelta(days=i),
+                description='Service', performed_by=self.user
+            )
+            EquipmentUsageLog.objects.create(
+                equipment=equipment, user=self.user,
+                check_out_time=timezone.now(), check_in_time=timezone.now(), purpose='Lab'
+            )
+            EquipmentTransfer.objects.create(
+                equipment=equipment, from_lab='IVE', to_lab='CEZERI',
+                transferred_by=self.user, transfer_date=timezone.now()
+            )
+
+    def test_list_query_count_is_constant(self):
+        for i in range(20):
+            self.add_history(make_equipment(self.category, i), 2)
+
+        MaintenanceRecord.objects.filter(maintenance_date__lt=date.today()).update(is_completed=True)
+
+        # ETag fingerprint, equipment + category join, prefetched open maintenance records
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/inventory/equipment/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 3)
+        # Only open records are loaded, and only the performer's names
+        self.assertNotIn('"password"', queries.captured_queries[-1]['sql'])
+        records = response.data['results'][0]['maintenance_records']
+        self.assertEqual([(record['is_completed'], record['performed_by_name']) for record in records], [(False, 'Tess Tech')])
+
+    def test_retrieve_query_count_is_constant(self):
+        equipment = make_equipment(self.category, 1)
+        self.add_history(equipment, 10)
+
+        # ETag fingerprint, equipment + category join with the counts, then one
+        # query per recent history set
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/inventory/equipment/{equipment.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['usage_logs']), 5)
+        self.assertEqual(len(response.data['transfers']), 5)
+        self.assertEqual(
+            (response.data['maintenance_records_count'], response.data['usage_logs_count'], response.data['transfers_count']),
+            (10, 10, 10)
+        )
+        dates = [record['maintenance_date'] for record in response.data['maintenance_records']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertEqual(dates[0], date.today().isoformat())
+
+    def test_history_routes_are_paginated(self):
+        equipment = make_equipment(self.category, 1)
+        other = make_equipment(self.category, 2)
+        self.add_history(equipment, 7)
+        self.add_history(other, 2)
+
+        for route in ['maintenance', 'usage-logs', 'transfers']:
+            url, seen = f'/api/inventory/equipment/{equipment.id}/{route}/?page_size=3', []
+            while url:
+                # item lookup, then one page query
+                with self.assertNumQueries(2):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('count', response.data)
+                seen += [row['id'] for row in response.data['results']]
+                url = response.data['next']
+            self.assertEqual(len(seen), 7, route)
+            self.assertEqual(len(set(seen)), 7, route)
+
+    def test_history_lists_query_count_is_constant(self):
+        for i in range(5):
+            self.add_history(make_equipment(self.category, i), 3)
+
+        for url in ['/api/inventory/maintenance/', '/api/inventory/usage-logs/', '/api/inventory/transfers/']:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+        self.equipment = make_equipment(Category.objects.create(name='Tools'), 1)
+        now = timezone.now()
+        # Repeated timestamps and NULL check-in times exercise the id tiebreak
+        self.logs = [
+            EquipmentUsageLog.objects.create(
+                equipment=self.equipment, user=self.user, purpose='Lab',
+                check_out_time=now - timedelta(hours=i // 3),
+                check_in_time=None if i % 4 == 0 else now - timedelta(minutes=i // 2),
+            )
+            for i in range(25)
+        ]
+
+    def collect(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_pages_follow_sort_key_and_id(self):
+        ids, pages = self.collect('/api/inventory/usage-logs/?page_size=10')
+        expected = [log.id for log in sorted(self.logs, key=lambda log: (log.check_out_time, log.id), reverse=True)]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_nullable_sort_key(self):
+        for ordering in ['check_in_time', '-check_in_time']:
+            ids, _ = self.collect(f'/api/inventory/usage-logs/?page_size=4&ordering={ordering}')
+            self.assertEqual(sorted(ids), sorted(log.id for log in self.logs))
+            self.assertEqual(len(ids), len(set(ids)))
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/api/inventory/usage-logs/?page_size=10')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']]
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/inventory/usage-logs/?cursor=bogus')
+        self.assertEqual(response.status_code, 404)
+
+
+class EquipmentSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Optics')
+        self.microscope = make_equipment(self.category, 1, name='Olympus Microscope', location='Shelf 4')
+        self.microtome = make_equipment(self.category, 2, name='Microtome', description='Microtome for micro sections')
+        self.printer = make_equipment(Category.objects.create(name='Printers'), 3, name='Prusa MK4')
+
+    def search(self, term, **params):
+        response = self.client.get('/api/inventory/equipment/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_prefix_matching_across_columns(self):
+        self.assertEqual(set(self.search('micro')), {self.microscope.id, self.microtome.id})
+        self.assertEqual(self.search('olym micro'), [self.microscope.id])
+        self.assertEqual(self.search('BC-00003'), [self.printer.id])
+        self.assertEqual(self.search('shelf 4'), [self.microscope.id])
+        self.assertEqual(self.search('printers'), [self.printer.id])
+        self.assertEqual(self.search('"*'), [])
+
+    def test_status_is_searchable(self):
+        # status was a LIKE search field before the FTS index
+        self.assertEqual(self.search('maintenance'), [])
+        Equipment.objects.filter(pk=self.printer.pk).update(status='MAINTENANCE')
+        self.microtome.status = 'IN_USE'
+        self.microtome.save()
+        self.assertEqual(self.search('MAINTENANCE'), [self.printer.id])
+        self.assertEqual(self.search('in_use'), [self.microtome.id])
+        self.assertEqual(set(self.search('available')), {self.microscope.id})
+
+    def test_results_are_ranked(self):
+        # The microtome mentions "micro" three times
+        self.assertEqual(self.search('micro')[0], self.microtome.id)
+        self.assertEqual(self.search('micro', ordering='-name'), [self.microscope.id, self.microtome.id])
+
+    def test_index_follows_writes(self):
+        self.microscope.name = 'Zeiss Stereo'
+        self.microscope.save()
+        self.assertEqual(self.search('olympus'), [])
+        self.assertEqual(self.search('zeiss'), [self.microscope.id])
+
+        self.category.name = 'Imaging'
+        self.category.save()
+        self.assertEqual(set(self.search('imaging')), {self.microscope.id, self.microtome.id})
+
+        Equipment.objects.filter(id=self.printer.id).update(name='Bambu X1')
+        self.assertEqual(self.search('bambu'), [self.printer.id])
+
+        self.microtome.delete()
+        self.assertEqual(self.search('microtome'), [])
+
+
+class EquipmentScanTests(APITestCase):
+    def setUp(self):
+        scan_cache.clear()
+        self.user = User.objects.create_user(username='kiosk', password='pass')
+        self.client.force_authenticate(self.user)
+        self.equipment = make_equipment(Category.objects.create(name='Tools'), 7)
+
+    def test_lookup_by_barcode_and_serial(self):
+        for code in ['BC-00007', 'SN-00007']:
+            response = self.client.get(f'/api/inventory/equipment/scan/{code}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['id'], self.equipment.id)
+        self.assertEqual(self.client.get('/api/inventory/equipment/scan/BC-404/').status_code, 404)
+
+    def test_repeat_scans_are_cached_until_the_item_changes(self):
+        url = '/api/inventory/equipment/scan/BC-00007/'
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data['status'], 'AVAILABLE')
+
+        self.equipment.status = 'MAINTENANCE'
+        self.equipment.save()
+        self.assertEqual(self.client.get(url).data['status'], 'MAINTENANCE')
+
+        MaintenanceRecord.objects.create(
+            equipment=self.equipment, maintenance_date=date.today(), description='Calibrate'
+        )
+        self.assertEqual(len(self.client.get(url).data['maintenance_records']), 1)
+
+        self.equipment.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_entries_expire(self):
+        # Writes from other processes never reach this worker's invalidations
+        url = '/api/inventory/equipment/scan/BC-00007/'
+        self.client.get(url)
+        Equipment.objects.filter(pk=self.equipment.pk).update(status='IN_USE')
+        self.assertEqual(self.client.get(url).data['status'], 'AVAILABLE')
+        with mock.patch('inventory.cache.time.monotonic', return_value=float('inf')):
+            self.assertEqual(self.client.get(url).data['status'], 'IN_USE')
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """Many kiosks hitting the same item at once against one SQLite file."""
+    threads = 16
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'kiosk{i}', password='pass') for i in range(self.threads)]
+        self.equipment = make_equipment(Category.objects.create(name='Tools'), 1)
+
+    def race(self, action):
+        barrier = threading.Barrier(self.threads)
+        results = []
+
+        def worker(user):
+            try:
+                client = APIClient()
+                client.force_authenticate(user)
+                barrier.wait()
+                response = client.post(f'/api/inventory/equipment/{self.equipment.id}/{action}/', {'purpose': 'Lab'})
+                results.append(response.status_code)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker, args=(user,)) for user in self.users]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return Counter(results)
+
+    def test_only_one_checkout_and_one_checkin_win(self):
+        for _ in range(3):
+            self.assertEqual(self.race('checkout'), {201: 1, 409: self.threads - 1})
+            self.equipment.refresh_from_db()
+            self.assertEqual(self.equipment.status, 'IN_USE')
+            self.assertEqual(EquipmentUsageLog.objects.filter(check_in_time__isnull=True).count(), 1)
+
+            self.assertEqual(self.race('checkin'), {200: 1, 409: self.threads - 1})
+            self.equipment.refresh_from_db()
+            self.assertEqual(self.equipment.status, 'AVAILABLE')
+            self.assertEqual(EquipmentUsageLog.objects.filter(check_in_time__isnull=True).count(), 0)
+
+        self.assertEqual(EquipmentUsageLog.objects.count(), 3)
+
+
+class BulkCheckoutTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Kit')
+        self.kit = [make_equipment(category, i) for i in range(5)]
+
+    def test_all_or_nothing_kit(self):
+        self.kit[4].status = 'MAINTENANCE'
+        self.kit[4].save()
+        payload = {'equipment_ids': [item.id for item in self.kit[:3]], 'barcodes': ['BC-00004', 'BC-99999']}
+
+        response = self.client.post('/api/inventory/equipment/bulk_checkout/', payload, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['skipped', 'skipped', 'skipped', 'error', 'error']
+        )
+        self.assertFalse(EquipmentUsageLog.objects.exists())
+        self.assertFalse(Equipment.objects.filter(status='IN_USE').exists())
+
+    def test_partial_kit_checkout_and_checkin(self):
+        self.kit[4].status = 'MAINTENANCE'
+        self.kit[4].save()
+        payload = {'barcodes': [item.barcode for item in self.kit], 'purpose': 'Session', 'atomic': False}
+
+        # savepoint, resolve, one UPDATE, one multi-row INSERT, release
+        with self.assertNumQueries(5):
+            response = self.client.post('/api/inventory/equipment/bulk_checkout/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['succeeded'], response.data['failed']), (4, 1))
+        self.assertEqual(Equipment.objects.filter(status='IN_USE').count(), 4)
+        self.assertEqual(EquipmentUsageLog.objects.filter(check_in_time__isnull=True).count(), 4)
+
+        payload = {'equipment_ids': [item.id for item in self.kit[:4]], 'notes': 'All returned'}
+        response = self.client.post('/api/inventory/equipment/bulk_checkin/', payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['succeeded'], 4)
+        self.assertFalse(EquipmentUsageLog.objects.filter(check_in_time__isnull=True).exists())
+        self.assertEqual(Equipment.objects.filter(status='AVAILABLE').count(), 4)
+
+    def test_duplicates_and_empty_requests(self):
+        response = self.client.post('/api/inventory/equipment/bulk_checkout/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        payload = {'equipment_ids': [self.kit[0].id], 'barcodes': [self.kit[0].barcode], 'atomic': False}
+        response = self.client.post('/api/inventory/equipment/bulk_checkout/', payload, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], ['checked_out', 'error'])
+
+
+class EquipmentImageTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Tools')
+        self.first = make_equipment(category, 1)
+        self.second = make_equipment(category, 2)
+
+    def photo(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (2400, 1600), (40, 120, 200)).save(buffer, format='JPEG')
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_upload_builds_webp_renditions(self):
+        response = self.client.post(f'/api/inventory/equipment/{self.first.id}/upload_image/', {'image': self.photo()})
+        self.assertEqual(response.status_code, 200)
+        self.first.refresh_from_db()
+
+        with default_storage.open(self.first.image_thumbnail.name) as thumbnail:
+            image = Image.open(thumbnail)
+            self.assertEqual((image.format, image.size), ('WEBP', (320, 213)))
+        with default_storage.open(self.first.image_medium.name) as medium:
+            self.assertEqual(Image.open(medium).size, (1024, 683))
+
+        listing = self.client.get('/api/inventory/equipment/')
+        self.assertTrue(listing.data['results'][0]['image_thumbnail'].endswith('.webp'))
+
+    def test_identical_uploads_share_files(self):
+        self.client.post(f'/api/inventory/equipment/{self.first.id}/upload_image/', {'image': self.photo()})
+        self.client.post(f'/api/inventory/equipment/{self.second.id}/upload_image/', {'image': self.photo()})
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+
+        self.assertEqual(self.first.image_hash, self.second.image_hash)
+        self.assertEqual(self.first.image.name, self.second.image.name)
+        self.assertEqual(self.first.image_thumbnail.name, self.second.image_thumbnail.name)
+        _, originals = default_storage.listdir('equipment/originals')
+        self.assertEqual(len(originals), 1)
+
+    def test_backfill_command(self):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (800, 800), (0, 0, 0, 0)).save(buffer, format='PNG')
+        self.first.image = default_storage.save('equipment/legacy.png', io.BytesIO(buffer.getvalue()))
+        self.first.save()
+
+        call_command('build_image_renditions', stdout=io.StringIO())
+        self.first.refresh_from_db()
+        self.assertTrue(default_storage.exists(self.first.image_thumbnail.name))
+        self.assertEqual(self.first.image.name, 'equipment/legacy.png')
+
+    def test_rejects_non_images(self):
+        upload = SimpleUploadedFile('notes.jpg', b'not an image', content_type='image/jpeg')
+        response = self.client.post(f'/api/inventory/equipment/{self.first.id}/upload_image/', {'image': upload})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='auditor', password='pass', role='ADMIN')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Tools')
+        for i in range(5):
+            equipment = make_equipment(category, i, lab='IVE' if i % 2 else 'CEZERI')
+            EquipmentUsageLog.objects.create(
+                equipment=equipment, user=self.user, check_out_time=timezone.now(), purpose='Audit, "quoted"'
+            )
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_with_column_selection_and_filters(self):
+        response = self.client.get('/api/inventory/equipment/export/', {'fields': 'id,barcode,category', 'lab': 'IVE'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0], 'id,barcode,category')
+        self.assertEqual(lines[1:], [f'{e.id},{e.barcode},Tools' for e in Equipment.objects.filter(lab='IVE').order_by('id')])
+
+    def test_ndjson_usage_logs(self):
+        response = self.client.get('/api/inventory/usage-logs/export/', {'output': 'ndjson', 'lab': 'CEZERI'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['purpose'], 'Audit, "quoted"')
+        self.assertEqual(rows[0]['username'], 'auditor')
+
+    def test_rejects_unknown_fields_and_students(self):
+        self.assertEqual(self.client.get('/api/inventory/maintenance/export/', {'fields': 'secret'}).status_code, 400)
+        self.client.force_authenticate(User.objects.create_user(username='student', password='pass'))
+        self.assertEqual(self.client.get('/api/inventory/equipment/export/').status_code, 403)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command('export_inventory', 'usage-logs', '--fields', 'id,equipment_name', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 6)
+
+
+class EquipmentImportTests(APITestCase):
+    HEADER = 'name,serial_number,barcode,category,lab,status,purchase_date\n'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Microscopes')
+        make_equipment(self.category, 1)
+
+    def upload(self, body, **options):
+        upload = SimpleUploadedFile('items.csv', (self.HEADER + body).encode(), content_type='text/csv')
+        return self.client.post('/api/inventory/equipment/import/', {'file': upload, **options})
+
+    def test_valid_file_is_imported_in_batches(self):
+        body = ''.join(f'Scope {i},NEW-SN-{i},NEW-BC-{i},microscopes,IVE,,2024-01-0{i % 9 + 1}\n' for i in range(30))
+        with self.assertNumQueries(7):
+            response = self.upload(body)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 30)
+        self.assertEqual(Equipment.objects.filter(category=self.category).count(), 31)
+        imported = Equipment.objects.get(serial_number='NEW-SN-0')
+        self.assertEqual((imported.purchase_date, imported.status), (date(2024, 1, 1), 'AVAILABLE'))
+
+    def test_errors_are_reported_per_row(self):
+        body = (
+            'Scope A,NEW-SN-1,NEW-BC-1,Microscopes,IVE,,\n'
+            'Scope B,SN-00001,NEW-BC-2,Microscopes,IVE,,\n'   # serial already in the database
+            'Scope C,NEW-SN-1,NEW-BC-3,Microscopes,IVE,,\n'   # serial repeated in the file
+            'Scope D,NEW-SN-4,NEW-BC-4,Lasers,MARS,,\n'       # unknown category and lab
+            'Scope E,SN-00001,NEW-BC-5,Lenses,IVE,,\n'        # new category, serial already in the database
+        )
+        response = self.upload(body)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['committed'])
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 5, 6])
+        self.assertEqual(set(response.data['errors'][2]['errors']), {'lab'})
+        self.assertEqual(Equipment.objects.count(), 1)
+
+        response = self.upload(body, atomic='false', create_categories='true')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 4))
+        self.assertTrue(Equipment.objects.filter(serial_number='NEW-SN-1').exists())
+        # Categories are only created for rows that are inserted
+        self.assertEqual(list(Category.objects.values_list('name', flat=True)), ['Microscopes'])
+        response = self.upload('Lens F,NEW-SN-6,NEW-BC-6,Lenses,IVE,,\n', create_categories='true')
+        self.assertEqual(Equipment.objects.get(serial_number='NEW-SN-6').category.name, 'Lenses')
+
+    def test_missing_columns(self):
+        upload = SimpleUploadedFile('items.csv', b'name,barcode\nA,B\n', content_type='text/csv')
+        response = self.client.post('/api/inventory/equipment/import/', {'file': upload})
+        self.assertEqual(response.status_code, 400)
+
+
+class UtilizationRollupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Scopes')
+        self.busy = make_equipment(category, 1)
+        self.idle = make_equipment(category, 2)
+        self.other_lab = make_equipment(category, 3, lab='CEZERI')
+        self.today = timezone.localdate()
+
+    def at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour)))
+
+    def checkout_since(self, equipment, started):
+        self.client.post(f'/api/inventory/equipment/{equipment.id}/checkout/', {'purpose': 'Run'}, format='json')
+        EquipmentUsageLog.objects.filter(equipment=equipment).update(check_out_time=started)
+
+    def test_checkin_updates_rollup_across_midnight(self):
+        yesterday = self.today - timedelta(days=1)
+        started = timezone.localtime() - timedelta(hours=50)
+        self.checkout_since(self.busy, started)
+        response = self.client.post(f'/api/inventory/equipment/{self.busy.id}/checkin/')
+        self.assertEqual(response.status_code, 200)
+
+        rows = {row.day: row for row in EquipmentUtilizationDaily.objects.filter(equipment=self.busy)}
+        self.assertEqual(set(rows), {started.date(), yesterday, self.today})
+        self.assertEqual(rows[yesterday].seconds_in_use, 86400)
+        self.assertEqual({row.sessions for row in rows.values()}, {1})
+        log = EquipmentUsageLog.objects.get(equipment=self.busy)
+        total = sum(row.seconds_in_use for row in rows.values())
+        self.assertAlmostEqual(total, (log.check_in_time - log.check_out_time).total_seconds(), delta=3)
+
+        # A second session on the same day adds to the existing row
+        self.client.post(f'/api/inventory/equipment/{self.busy.id}/checkout/', {'purpose': 'Run'}, format='json')
+        self.client.post('/api/inventory/equipment/bulk_checkin/', {'equipment_ids': [self.busy.id]}, format='json')
+        self.assertEqual(EquipmentUtilizationDaily.objects.get(equipment=self.busy, day=self.today).sessions, 2)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.checkout_since(self.busy, timezone.localtime() - timedelta(hours=50))
+        self.client.post(f'/api/inventory/equipment/{self.busy.id}/checkin/')
+        self.checkout_since(self.other_lab, timezone.localtime() - timedelta(hours=2))
+        self.client.post(f'/api/inventory/equipment/{self.other_lab.id}/checkin/')
+        expected = set(EquipmentUtilizationDaily.objects.values_list('equipment', 'lab', 'day', 'seconds_in_use', 'sessions'))
+
+        EquipmentUtilizationDaily.objects.update(seconds_in_use=0)
+        call_command('rebuild_utilization', stdout=io.StringIO())
+        self.assertEqual(
+            set(EquipmentUtilizationDaily.objects.values_list('equipment', 'lab', 'day', 'seconds_in_use', 'sessions')),
+            expected
+        )
+
+        # --since leaves older days alone
+        EquipmentUtilizationDaily.objects.update(seconds_in_use=1)
+        call_command('rebuild_utilization', '--since', self.today.isoformat(), stdout=io.StringIO())
+        rebuilt = EquipmentUtilizationDaily.objects.filter(day=self.today, equipment=self.busy).get()
+        self.assertGreater(rebuilt.seconds_in_use, 1)
+        self.assertFalse(EquipmentUtilizationDaily.objects.filter(day__lt=self.today).exclude(seconds_in_use=1).exists())
+
+    def test_usage_log_edits_rebuild_affected_days(self):
+        yesterday = self.today - timedelta(days=1)
+        log = EquipmentUsageLog.objects.create(
+            equipment=self.busy, user=self.user, purpose='Run',
+            check_out_time=self.at(yesterday, 9), check_in_time=self.at(yesterday, 10)
+        )
+        url = f'/api/inventory/usage-logs/{log.id}/'
+        self.client.patch(url, {'check_out_time': self.at(self.today, 8), 'check_in_time': self.at(self.today, 11)}, format='json')
+        rows = EquipmentUtilizationDaily.objects.filter(equipment=self.busy)
+        self.assertEqual(list(rows.values_list('day', 'seconds_in_use', 'sessions')), [(self.today, 3 * 3600, 1)])
+
+        self.client.delete(url)
+        self.assertFalse(rows.exists())
+
+    def test_heatmap_and_top(self):
+        for day_offset, seconds in [(1, 3600), (2, 7200)]:
+            EquipmentUtilizationDaily.objects.create(
+                equipment=self.busy, lab='IVE', day=self.today - timedelta(days=day_offset),
+                seconds_in_use=seconds, sessions=1
+            )
+        EquipmentUtilizationDaily.objects.create(
+            equipment=self.other_lab, lab='CEZERI', day=self.today, seconds_in_use=600, sessions=2
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/inventory/utilization/heatmap/', {'lab': 'IVE'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(cell['equipment'], cell['seconds_in_use']) for cell in response.data['cells']],
+            [(self.busy.id, 7200), (self.busy.id, 3600)]
+        )
+        response = self.client.get('/api/inventory/utilization/heatmap/', {'group_by': 'lab'})
+        self.assertEqual({cell['lab'] for cell in response.data['cells']}, {'IVE', 'CEZERI'})
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/inventory/utilization/top/', {'order': 'busy', 'limit': 2})
+        self.assertEqual([row['equipment'] for row in response.data['results']], [self.busy.id, self.other_lab.id])
+        self.assertEqual(response.data['results'][0]['hours_in_use'], 3.0)
+
+        # Never-used equipment is the most idle
+        response = self.client.get('/api/inventory/utilization/top/', {'order': 'idle', 'limit': 1})
+        self.assertEqual(response.data['results'][0]['equipment'], self.idle.id)
+        self.assertEqual(response.data['results'][0]['seconds_in_use'], 0)
+
+    def test_rejects_bad_parameters(self):
+        for url, params in [
+            ('/api/inventory/utilization/heatmap/', {'start': 'yesterday'}),
+            ('/api/inventory/utilization/heatmap/', {'group_by': 'user'}),
+            ('/api/inventory/utilization/top/', {'order': 'random'}),
+            ('/api/inventory/utilization/top/', {'start': '2024-02-01', 'end': '2024-01-01'}),
+        ]:
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+class MaintenanceDueTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Printers')
+        today = timezone.localdate()
+        self.overdue = [make_equipment(category, i, next_maintenance_date=today - timedelta(days=i + 1)) for i in range(3)]
+        self.due_soon = make_equipment(category, 3, next_maintenance_date=today + timedelta(days=2))
+        self.later = make_equipment(category, 4, next_maintenance_date=today + timedelta(days=60))
+        self.unscheduled = make_equipment(category, 5)
+
+    def test_scheduler_queues_and_clears_alerts(self):
+        out = io.StringIO()
+        call_command('check_maintenance_due', '--batch-size', '2', stdout=out)
+        self.assertIn('3 overdue, 1 due soon', out.getvalue())
+        alerts = dict(MaintenanceAlert.objects.values_list('equipment_id', 'level'))
+        self.assertEqual(alerts, {**{item.id: 'OVERDUE' for item in self.overdue}, self.due_soon.id: 'DUE_SOON'})
+
+        # Re-running keeps the original flag time; rescheduled items drop off the queue
+        flagged_at = MaintenanceAlert.objects.get(equipment=self.due_soon).flagged_at
+        Equipment.objects.filter(pk=self.overdue[0].pk).update(next_maintenance_date=None)
+        call_command('check_maintenance_due', stdout=out)
+        self.assertEqual(MaintenanceAlert.objects.get(equipment=self.due_soon).flagged_at, flagged_at)
+        self.assertFalse(MaintenanceAlert.objects.filter(equipment=self.overdue[0]).exists())
+
+    def test_due_maintenance_endpoint(self):
+        call_command('check_maintenance_due', stdout=io.StringIO())
+        response = self.client.get('/api/inventory/equipment/due_maintenance/')
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([item['id'] for item in results], [item.id for item in reversed(self.overdue)] + [self.due_soon.id])
+        self.assertEqual([item['due_status'] for item in results], ['OVERDUE'] * 3 + ['DUE_SOON'])
+        self.assertIsNotNone(results[0]['flagged_at'])
+
+        response = self.client.get('/api/inventory/equipment/due_maintenance/', {'overdue': 'true'})
+        self.assertEqual(len(response.data['results']), 3)
+        response = self.client.get('/api/inventory/equipment/due_maintenance/', {'days': 90})
+        self.assertEqual(len(response.data['results']), 5)
+        for days in ['soon', '-1', '100000000']:
+            response = self.client.get('/api/inventory/equipment/due_maintenance/', {'days': days})
+            self.assertEqual(response.status_code, 400)
+
+        # Completing the work removes the item from the queue
+        record = MaintenanceRecord.objects.create(
+            equipment=self.due_soon, maintenance_date=timezone.localdate(), description='Service'
+        )
+        self.client.post(f'/api/inventory/equipment/{self.due_soon.id}/complete_maintenance/', {'maintenance_id': record.id})
+        self.assertFalse(MaintenanceAlert.objects.filter(equipment=self.due_soon).exists())
+
+    def test_due_queries_use_indexes(self):
+        horizon = timezone.localdate() + timedelta(days=7)
+        plan = query_plan(Equipment.objects.filter(next_maintenance_date__lte=horizon).order_by('next_maintenance_date', 'id'))
+        self.assertIn('inventory_e_next_ma_779645_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        plan = query_plan(MaintenanceRecord.objects.filter(is_completed=False).order_by('-maintenance_date', '-id'))
+        self.assertIn('inventory_maint_open_idx', plan)
+
+
+class InventoryQueryPlanTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN', lab='IVE')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Lasers')
+        self.items = [make_equipment(self.category, i, lab='IVE' if i % 2 else 'CEZERI') for i in range(6)]
+        for item in self.items[:3]:
+            EquipmentUsageLog.objects.create(equipment=item, user=self.user, check_out_time=timezone.now(), purpose='Cut')
+            MaintenanceRecord.objects.create(equipment=item, maintenance_date=date.today(), description='Align')
+
+    def test_filtered_endpoints_use_indexes(self):
+        item = self.items[0]
+        for url, params in [
+            ('/api/inventory/equipment/', {'lab': 'IVE'}),
+            ('/api/inventory/equipment/', {'lab': 'IVE', 'status': 'AVAILABLE', 'category': self.category.id}),
+            ('/api/inventory/equipment/due_maintenance/', None),
+            (f'/api/inventory/equipment/scan/{item.barcode}/', None),
+            (f'/api/inventory/equipment/{item.id}/', None),
+            (f'/api/inventory/equipment/{item.id}/maintenance/', None),
+            (f'/api/inventory/equipment/{item.id}/usage-logs/', None),
+            (f'/api/inventory/equipment/{item.id}/transfers/', None),
+            ('/api/inventory/usage-logs/', {'equipment': item.id}),
+            ('/api/inventory/maintenance/', {'is_completed': 'false'}),
+            ('/api/inventory/maintenance/', {'equipment': item.id}),
+            ('/api/inventory/transfers/', {'equipment': item.id}),
+            ('/api/inventory/utilization/heatmap/', {'lab': 'IVE'}),
+            ('/api/inventory/utilization/heatmap/', {'equipment': item.id}),
+            ('/api/inventory/active-checkouts/', None),
+            ('/api/inventory/active-checkouts/', {'overdue': 'true'}),
+        ]:
+            with self.subTest(url=url, params=params):
+                self.assertNoFullScans(url, params)
+
+    def test_open_usage_log_lookup_uses_index(self):
+        plan = query_plan(EquipmentUsageLog.objects.filter(
+            equipment=self.items[0], check_in_time__isnull=True
+        ).order_by('-check_out_time'))
+        self.assertRegex(plan, r'^SEARCH inventory_equipmentusagelog USING INDEX inventory_usage_open_item_idx \(equipment_id=\?')
+
+
+class EquipmentTimelineTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        from bookings.models import BookingSlot, EquipmentBooking
+
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        self.equipment = make_equipment(Category.objects.create(name='Scopes'), 1)
+        other = make_equipment(Category.objects.get(), 2)
+        base = timezone.now().replace(microsecond=0) - timedelta(days=10)
+        # Shared timestamps across sources exercise the (kind, id) tiebreak
+        self.expected = []
+        for i in range(4):
+            at = base + timedelta(hours=i // 2)
+            log = EquipmentUsageLog.objects.create(
+                equipment=self.equipment, user=self.user, check_out_time=at, check_in_time=at + timedelta(minutes=5),
+                purpose='Imaging'
+            )
+            record = MaintenanceRecord.objects.create(equipment=self.equipment, maintenance_date=at.date(), description='Clean')
+            MaintenanceRecord.objects.filter(pk=record.pk).update(created_at=at)
+            transfer = EquipmentTransfer.objects.create(
+                equipment=self.equipment, from_lab='IVE', to_lab='CEZERI', transferred_by=self.user, transfer_date=at
+            )
+            slot = BookingSlot.objects.create(date=at.date() + timedelta(days=i), start_time=time(9), end_time=time(10))
+            booking = EquipmentBooking.objects.create(equipment=self.equipment, user=self.user, slot=slot, purpose='Demo')
+            EquipmentBooking.objects.filter(pk=booking.pk).update(created_at=at)
+            EquipmentUsageLog.objects.create(equipment=other, user=self.user, check_out_time=at, purpose='Other')
+            self.expected += [(at, 'usage', log.id), (at, 'maintenance', record.id), (at, 'transfer', transfer.id), (at, 'booking', booking.id)]
+        self.expected.sort(reverse=True)
+        self.url = f'/api/inventory/equipment/{self.equipment.id}/timeline/'
+
+    def test_pages_merge_all_sources_in_order(self):
+        url, events, pages = f'{self.url}?page_size=3', [], []
+        while url:
+            # item lookup, then one UNION ALL per page
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            events += response.data['results']
+            url = response.data['next']
+        self.assertEqual(len(pages), 6)
+        self.assertEqual([(event['kind'], event['id']) for event in events], [(kind, pk) for _, kind, pk in self.expected])
+
+        usage = next(event for event in events if event['kind'] == 'usage')
+        self.assertEqual(usage['username'], 'tech')
+        self.assertEqual(usage['check_in_time'] - usage['at'], timedelta(minutes=5))
+        maintenance = next(event for event in events if event['kind'] == 'maintenance')
+        self.assertIs(maintenance['is_completed'], False)
+
+        # Walking back from the last page returns the same pages
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual(response.data['results'], pages[-2]['results'])
+
+    def test_kind_filter_and_errors(self):
+        response = self.client.get(self.url, {'kinds': 'transfer,booking'})
+        self.assertEqual({event['kind'] for event in response.data['results']}, {'transfer', 'booking'})
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertEqual(self.client.get(self.url, {'kinds': 'audit'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, 404)
+
+    def test_timeline_uses_indexes(self):
+        first = self.client.get(self.url, {'page_size': 5})
+        self.assertNoFullScans(first.data['next'])
+
+
+class InventoryDashboardTests(APITestCase):
+    url = '/api/inventory/dashboard/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        scopes, lasers = Category.objects.create(name='Scopes'), Category.objects.create(name='Lasers')
+        self.items = [make_equipment(scopes, i) for i in range(3)]
+        make_equipment(lasers, 3, lab='CEZERI', status='MAINTENANCE')
+        make_equipment(lasers, 4, lab='CEZERI', next_maintenance_date=timezone.localdate() - timedelta(days=1))
+
+    def test_aggregates_are_cached(self):
+        # one GROUP BY each for counts, active checkouts and overdue items
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals'], {
+            'equipment': 5, 'active_checkouts': 0, 'in_maintenance': 1, 'overdue_maintenance': 1,
+        })
+        self.assertEqual(response.data['by_lab'], {'IVE': 3, 'CEZERI': 2})
+        self.assertIn(
+            {'status': 'AVAILABLE', 'lab': 'IVE', 'category': self.items[0].category_id, 'category_name': 'Scopes', 'count': 3},
+            response.data['by_status_lab_category']
+        )
+        self.assertEqual(response.data['overdue_maintenance_by_lab'], {'CEZERI': 1})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, response.data)
+
+    def test_writes_invalidate_the_cache(self):
+        self.client.get(self.url)
+        item = self.items[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/inventory/equipment/{item.id}/checkout/', {'purpose': 'Demo'}, format='json')
+        data = self.client.get(self.url).data
+        self.assertEqual(data['totals']['active_checkouts'], 1)
+        self.assertEqual(data['by_status']['IN_USE'], 1)
+
+        # checkin only runs queryset updates, so it bumps the version itself
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/inventory/equipment/{item.id}/checkin/')
+        self.assertEqual(self.client.get(self.url).data['totals']['active_checkouts'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Equipment.objects.filter(pk=item.pk).get().delete()
+        self.assertEqual(self.client.get(self.url).data['totals']['equipment'], 4)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Scopes')
+        self.items = [make_equipment(self.category, i) for i in range(3)]
+
+    def assertNotModified(self, url, etag):
+        # Only the fingerprint query runs; nothing is loaded or serialized
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_revalidates_until_something_changes(self):
+        url = '/api/inventory/equipment/?lab=IVE'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertNotModified(url, etag)
+        # Another filter or page is another representation
+        self.assertNotEqual(self.client.get('/api/inventory/equipment/?lab=CEZERI')['ETag'], etag)
+
+        # A deletion leaves MAX(updated_at) alone but changes the count
+        Equipment.objects.filter(pk=self.items[0].pk).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        # So do edits to embedded history and to the category
+        MaintenanceRecord.objects.create(equipment=self.items[1], maintenance_date=date.today(), description='Clean')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.category.name = 'Microscopes'
+        self.category.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['category_name'], 'Microscopes')
+
+    def test_detail_honours_etag_and_last_modified(self):
+        item = self.items[0]
+        url = f'/api/inventory/equipment/{item.id}/'
+        response = self.client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertNotModified(url, etag)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # checkout only runs queryset updates but still moves the validator
+        self.client.post(f'/api/inventory/equipment/{item.id}/checkout/', {'purpose': 'Demo'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'IN_USE')
+        self.assertEqual(self.client.get('/api/inventory/equipment/999999/').status_code, 404)
+
+    def test_category_list(self):
+        response = self.client.get('/api/inventory/categories/')
+        self.assertNotModified('/api/inventory/categories/', response['ETag'])
+        Category.objects.create(name='Lasers')
+        response = self.client.get('/api/inventory/categories/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+
+class ActiveCheckoutsTests(APITestCase):
+    url = '/api/inventory/active-checkouts/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tech', password='pass', role='TECHNICIAN', first_name='Tess', last_name='Tech')
+        self.other = User.objects.create_user(username='student', password='pass')
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='Scopes')
+        self.items = [make_equipment(category, i, status='IN_USE') for i in range(3)]
+        self.items.append(make_equipment(category, 3, lab='CEZERI', status='IN_USE'))
+        now = timezone.now()
+        for item, user, hours in [
+            (self.items[0], self.user, 30), (self.items[1], self.user, 1),
+            (self.items[2], self.other, 2), (self.items[3], self.other, 50),
+        ]:
+            EquipmentUsageLog.objects.create(equipment=item, user=user, check_out_time=now - timedelta(hours=hours), purpose='Lab')
+        # Closed history is not part of the answer, however long it gets
+        for i in range(5):
+            EquipmentUsageLog.objects.create(
+                equipment=self.items[0], user=self.other, purpose='Old',
+                check_out_time=now - timedelta(days=10 + i), check_in_time=now - timedelta(days=9 + i)
+            )
+
+    def test_groups_open_checkouts_by_lab_and_holder(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals'], {'active': 4, 'overdue': 2})
+        labs = {lab['lab']: lab for lab in response.data['labs']}
+        self.assertEqual((labs['IVE']['active'], labs['IVE']['overdue']), (3, 1))
+        ive = {holder['username']: holder for holder in labs['IVE']['holders']}
+        self.assertEqual(ive['tech']['user_name'], 'Tess Tech')
+        # Oldest checkout first within each holder
+        self.assertEqual([entry['equipment'] for entry in ive['tech']['items']], [self.items[0].id, self.items[1].id])
+        overdue = ive['tech']['items'][0]
+        self.assertAlmostEqual(overdue['held_seconds'], 30 * 3600, delta=60)
+        self.assertAlmostEqual(overdue['overdue_seconds'], 6 * 3600, delta=60)
+        self.assertEqual(ive['tech']['items'][1]['overdue_seconds'], 0)
+
+    def test_filters(self):
+        response = self.client.get(self.url, {'overdue': 'true'})
+        self.assertEqual(response.data['totals'], {'active': 2, 'overdue': 2})
+        response = self.client.get(self.url, {'lab': 'CEZERI', 'user': self.other.id})
+        self.assertEqual([lab['lab'] for lab in response.data['labs']], ['CEZERI'])
+        self.assertEqual(response.data['totals']['active'], 1)
+        self.assertEqual(self.client.get(self.url, {'user': 'me'}).status_code, 400)
+
+        self.client.post(f'/api/inventory/equipment/{self.items[0].id}/checkin/')
+        self.assertEqual(self.client.get(self.url).data['totals'], {'active': 3, 'overdue': 1})
@@ -0,0 +1,105 @@
+import datetime
+
+from django.db import models
+from django.db.models import CharField, F, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from bookings.models import EquipmentBooking
+from .models import EquipmentTransfer, EquipmentUsageLog, MaintenanceRecord
+from .pagination import MergedKeysetPagination, merged_keyset_filter
+
+# kind -> (model, timestamp field, payload columns). Every timestamp is a
+# non-null DateTimeField with an (equipment, timestamp, id) index, so each
+# branch of the UNION ALL is an ordered range scan that SQLite can merge.
+SOURCES = {
+    'usage': (EquipmentUsageLog, 'check_out_time', {
+        'user': 'user_id',
+        'username': 'user__username',
+        'check_in_time': 'check_in_time',
+        'purpose': 'purpose',
+        'notes': 'notes',
+    }),
+    'maintenance': (MaintenanceRecord, 'created_at', {
+        'maintenance_date': 'maintenance_date',
+        'description': 'description',
+        'performed_by': 'performed_by_id',
+        'is_completed': 'is_completed',
+        'notes': 'notes',
+    }),
+    'transfer': (EquipmentTransfer, 'transfer_date', {
+        'from_lab': 'from_lab',
+        'to_lab': 'to_lab',
+        'transferred_by': 'transferred_by_id',
+        'return_date': 'return_date',
+        'notes': 'notes',
+    }),
+    'booking': (EquipmentBooking, 'created_at', {
+        'user': 'user_id',
+        'username': 'user__username',
+        'status': 'status',
+        'date': 'slot__date',
+        'start_time': 'slot__start_time',
+        'end_time': 'slot__end_time',
+        'purpose': 'purpose',
+    }),
+}
+
+
+def timeline_queryset(equipment_id, kinds=None, cursor=None, descending=True):
+    """
+    One UNION ALL over the requested sources, ordered by (at, kind, id).
+    Rows come back as {'id', 'kind', 'at', 'data'} dicts.
+    """
+    branches = []
+    for kind in kinds or SOURCES:
+        model, field, columns = SOURCES[kind]
+        queryset = model.objects.filter(equipment_id=equipment_id)
+        if cursor is not None:
+            queryset = queryset.filter(merged_keyset_filter(kind, field, cursor, descending))
+        branches.append(queryset.annotate(
+            kind=Value(kind, output_field=CharField()),
+            at=F(field),
+            data=JSONObject(**columns),
+        ).values('id', 'kind', 'at', 'data'))
+    combined = branches[0].union(*branches[1:], all=True)
+    if descending:
+        return combined.order_by('-at', '-kind', '-id')
+    return combined.order_by('at', 'kind', 'id')
+
+
+def _resolve(model, path):
+    for name in path.split(LOOKUP_SEP):
+        field = model._meta.get_field(name)
+        model = field.related_model
+    return field
+
+
+def render_event(row):
+    """
+    Turn a timeline row into the API shape. JSON_OBJECT hands booleans back
+    as 0/1 and datetimes as naive UTC text, so those are converted here.
+    """
+    model, _, columns = SOURCES[row['kind']]
+    data = row['data']
+    for name, path in columns.items():
+        field, value = _resolve(model, path), data.get(name)
+        if value is None:
+            continue
+        if isinstance(field, models.BooleanField):
+            data[name] = bool(value)
+        elif isinstance(field, models.DateTimeField):
+            data[name] = timezone.localtime(parse_datetime(value).replace(tzinfo=datetime.timezone.utc))
+    return {'kind': row['kind'], 'id': row['id'], 'at': timezone.localtime(row['at']), **data}
+
+
+class TimelinePagination(MergedKeysetPagination):
+    """Keyset pagination over the merged timeline, newest first."""
+    kinds = SOURCES
+
+    def paginate_timeline(self, equipment_id, kinds, request):
+        return self.paginate_union(
+            lambda cursor, descending: timeline_queryset(equipment_id, kinds, cursor, descending), request
+        )
@@ -2,7 +2,8 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     CategoryViewSet, EquipmentViewSet, MaintenanceRecordViewSet, 
-    EquipmentUsageLogViewSet, EquipmentTransferViewSet
+    EquipmentUsageLogViewSet, EquipmentTransferViewSet,
+    ActiveCheckoutsView, InventoryDashboardView, UtilizationHeatmapView, UtilizationTopView
 )
 
 router = DefaultRouter()
@@ -13,5 +14,9 @@ router.register(r'usage-logs', EquipmentUsageLogViewSet)
 router.register(r'transfers', EquipmentTransferViewSet)
 
 urlpatterns = [
+    path('active-checkouts/', ActiveCheckoutsView.as_view(), name='active-checkouts'),
+    path('dashboard/', InventoryDashboardView.as_view(), name='inventory-dashboard'),
+    path('utilization/heatmap/', UtilizationHeatmapView.as_view(), name='utilization-heatmap'),
+    path('utilization/top/', UtilizationTopView.as_view(), name='utilization-top'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,16 +1,60 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import OR
+from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, FilteredRelation, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from .models import Category, Equipment, MaintenanceRecord, EquipmentUsageLog, EquipmentTransfer
+from .models import (
+    Category, Equipment, MaintenanceRecord, EquipmentUsageLog, EquipmentTransfer,
+    EquipmentUtilizationDaily, MaintenanceAlert
+)
+from . import dashboard
+from .cache import scan_cache
+from .checkouts import group_by_holder, open_checkouts
+from .conditional import ConditionalGetMixin
+from .export import ExportMixin
+from .images import InvalidImage, store_image
+from .importer import EquipmentImporter, ImportFileError
+from .maintenance import DUE_SOON_DAYS, due_status
+from .pagination import KeysetCursorPagination
+from .rollups import rebuild_usage, record_usage, usage_days
+from .search import EquipmentSearchFilter
+from .timeline import SOURCES as TIMELINE_SOURCES, TimelinePagination, render_event
 from .serializers import (
-    CategorySerializer, EquipmentSerializer, EquipmentDetailSerializer,
-    MaintenanceRecordSerializer, EquipmentUsageLogSerializer, EquipmentTransferSerializer
+    CategorySerializer, EquipmentSerializer, EquipmentListSerializer, EquipmentDetailSerializer,
+    MaintenanceRecordSerializer, EquipmentUsageLogSerializer, EquipmentTransferSerializer,
+    BulkCheckoutSerializer
 )
 from users.permissions import IsAdminUser, IsLabManagerUser, IsTechnicianUser
 
-class CategoryViewSet(viewsets.ModelViewSet):
+# Latest entries of each history embedded in the equipment detail view
+DETAIL_HISTORY_SIZE = getattr(settings, 'INVENTORY_DETAIL_HISTORY_SIZE', 5)
+
+# What MaintenanceRecordSerializer reads of a record and of who performed it
+OPEN_MAINTENANCE_FIELDS = [
+    'id', 'equipment', 'maintenance_date', 'description', 'performed_by', 'is_completed', 'notes',
+    'created_at', 'performed_by__first_name', 'performed_by__last_name',
+]
+
+
+def history_count(model):
+    """Correlated COUNT of `model` rows for the outer equipment row."""
+    return Coalesce(Subquery(
+        model.objects.filter(equipment=OuterRef('pk')).order_by()
+        .values('equipment').annotate(total=Count('id')).values('total')
+    ), 0)
+
+
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -26,27 +70,100 @@ class CategoryViewSet(viewsets.ModelViewSet):
             ]
         return [permissions.IsAuthenticated()]
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(ConditionalGetMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Equipment.objects.all()
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # List and detail both render the category alongside the item
+    conditional_fields = ['updated_at', 'category__updated_at']
+    # Search runs last so it can order by relevance when no ?ordering= is given
+    filter_backends = [filters.OrderingFilter, EquipmentSearchFilter]
     search_fields = ['name', 'serial_number', 'barcode', 'status']
     ordering_fields = ['name', 'status', 'lab', 'category']
+    ordering = ['id']
+    pagination_class = KeysetCursorPagination
+    export_resource = 'equipment'
+    # get_queryset already filters by lab/status/category
+    export_filters = False
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return EquipmentDetailSerializer
+        if self.action in ['list', 'due_maintenance']:
+            return EquipmentListSerializer
         return EquipmentSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'export', 'import_csv']:
             return [
                 permissions.IsAuthenticated(),
                 OR(IsAdminUser(), OR(IsLabManagerUser(), IsTechnicianUser()))
             ]
         return [permissions.IsAuthenticated()]
     
+    def perform_create(self, serializer):
+        self._save_with_image(serializer)
+    
+    def perform_update(self, serializer):
+        self._save_with_image(serializer)
+    
+    def _save_with_image(self, serializer):
+        # Images sent with create/update go through the same rendition
+        # pipeline as upload_image
+        image_fields = {}
+        if 'image' in serializer.validated_data:
+            upload = serializer.validated_data.pop('image')
+            if upload:
+                try:
+                    image_fields = store_image(upload)
+                except InvalidImage as exc:
+                    raise ValidationError({'image': [str(exc)]})
+            else:
+                # Clearing the image clears its renditions too
+                image_fields = dict.fromkeys(['image', 'image_thumbnail', 'image_medium', 'image_hash'])
+        serializer.save(**image_fields)
+    
     def get_queryset(self):
-        queryset = Equipment.objects.all()
+        # Join the category in for every action; the nested history sets are
+        # only prefetched for the actions whose serializer renders them.
+        queryset = Equipment.objects.select_related('category')
+        if self.action == 'retrieve':
+            # Counts plus the latest few entries; the rest is on the history routes
+            size = DETAIL_HISTORY_SIZE
+            queryset = queryset.annotate(
+                maintenance_records_count=history_count(MaintenanceRecord),
+                usage_logs_count=history_count(EquipmentUsageLog),
+                transfers_count=history_count(EquipmentTransfer),
+            ).prefetch_related(
+                Prefetch(
+                    'maintenance_records', to_attr='recent_maintenance_records',
+                    queryset=MaintenanceRecord.objects.select_related('performed_by')
+                    .order_by('-maintenance_date', '-id')[:size]
+                ),
+                Prefetch(
+                    'usage_logs', to_attr='recent_usage_logs',
+                    queryset=EquipmentUsageLog.objects.select_related('user').order_by('-check_out_time', '-id')[:size]
+                ),
+                Prefetch(
+                    'transfers', to_attr='recent_transfers',
+                    queryset=EquipmentTransfer.objects.select_related('transferred_by')
+                    .order_by('-transfer_date', '-id')[:size]
+                ),
+            )
+        elif self.action in ['list', 'due_maintenance']:
+            # Only open work orders, and only the names of who performed them
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'maintenance_records', to_attr='open_maintenance_records',
+                    queryset=MaintenanceRecord.objects.filter(is_completed=False)
+                    .select_related('performed_by')
+                    .only(*OPEN_MAINTENANCE_FIELDS)
+                    .order_by('-maintenance_date', '-id')
+                ),
+            )
+        elif self.action == 'upload_image':
+            queryset = queryset.prefetch_related(
+                Prefetch('maintenance_records', queryset=MaintenanceRecord.objects.select_related('performed_by')),
+            )
+        
         # Filter by lab if specified
         lab = self.request.query_params.get('lab')
         if lab:
@@ -64,60 +181,346 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             
         return queryset
     
-    @action(detail=True, methods=['post'])
-    def checkout(self, request, pk=None):
-        equipment = self.get_object()
+    @action(detail=False, methods=['get'], url_path=r'scan/(?P<code>[^/]+)')
+    def scan(self, request, code=None):
+        # Exact barcode/serial lookup for scanner kiosks, served from the
+        # in-process LRU on repeat scans within INVENTORY_SCAN_CACHE_TTL
+        data = scan_cache.get(code)
+        if data is not None:
+            return Response(data)
         
-        if equipment.status != 'AVAILABLE':
+        generation = scan_cache.generation
+        matches = list(
+            Equipment.objects.select_related('category')
+            .prefetch_related(
+                Prefetch('maintenance_records', queryset=MaintenanceRecord.objects.select_related('performed_by'))
+            )
+            .filter(Q(barcode=code) | Q(serial_number=code))
+        )
+        if not matches:
             return Response(
-                {"error": f"Equipment is currently {equipment.status.lower()}, not available for checkout."},
+                {"error": "No equipment matches this code."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        # A barcode match wins over another item's serial number
+        equipment = next((item for item in matches if item.barcode == code), matches[0])
+        data = EquipmentSerializer(equipment).data
+        scan_cache.set(code, equipment.id, data, generation)
+        return Response(data)
+    
+    def _history_page(self, queryset, serializer_class):
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            serializer_class(page, many=True, context=self.get_serializer_context()).data
+        )
+    
+    @action(detail=True, methods=['get'], url_path='maintenance')
+    def maintenance_history(self, request, pk=None):
+        equipment = self.get_object()
+        return self._history_page(
+            equipment.maintenance_records.select_related('performed_by').order_by('-maintenance_date'),
+            MaintenanceRecordSerializer
+        )
+    
+    @action(detail=True, methods=['get'], url_path='usage-logs')
+    def usage_history(self, request, pk=None):
+        equipment = self.get_object()
+        return self._history_page(
+            equipment.usage_logs.select_related('user').order_by('-check_out_time'),
+            EquipmentUsageLogSerializer
+        )
+    
+    @action(detail=True, methods=['get'], url_path='transfers')
+    def transfer_history(self, request, pk=None):
+        equipment = self.get_object()
+        return self._history_page(
+            equipment.transfers.select_related('equipment', 'transferred_by').order_by('-transfer_date'),
+            EquipmentTransferSerializer
+        )
+    
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        # Usage, maintenance, transfers and bookings merged newest first in one UNION ALL
+        equipment = self.get_object()
+        kinds = [kind.strip() for kind in request.query_params.get('kinds', '').split(',') if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in TIMELINE_SOURCES]
+        if unknown:
+            return Response(
+                {"error": f"Unknown kind(s): {', '.join(unknown)}. Available: {', '.join(TIMELINE_SOURCES)}."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        paginator = TimelinePagination()
+        page = paginator.paginate_timeline(equipment.pk, kinds or None, request)
+        return paginator.get_paginated_response([render_event(row) for row in page])
+    
+    @action(detail=True, methods=['post'])
+    def checkout(self, request, pk=None):
+        equipment = self.get_object()
+        
         serializer = EquipmentUsageLogSerializer(data={
             'equipment': equipment.id,
             'user': request.user.id,
             'check_out_time': timezone.now(),
             'purpose': request.data.get('purpose', '')
         })
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        if serializer.is_valid():
+        with transaction.atomic():
+            # Only one of several concurrent checkouts can flip the status
+            claimed = Equipment.objects.filter(pk=equipment.pk, status='AVAILABLE').update(
+                status='IN_USE', updated_at=timezone.now()
+            )
+            if not claimed:
+                current = Equipment.objects.filter(pk=equipment.pk).values_list('status', flat=True).first()
+                return Response(
+                    {"error": f"Equipment is currently {(current or 'unavailable').lower()}, not available for checkout."},
+                    status=status.HTTP_409_CONFLICT
+                )
             serializer.save()
-            equipment.status = 'IN_USE'
-            equipment.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            transaction.on_commit(lambda: scan_cache.invalidate(equipment.pk))
+            transaction.on_commit(dashboard.bump_version)
+        
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def checkin(self, request, pk=None):
         equipment = self.get_object()
         
-        if equipment.status != 'IN_USE':
-            return Response(
-                {"error": "Equipment is not currently checked out."},
-                status=status.HTTP_400_BAD_REQUEST
+        with transaction.atomic():
+            released = Equipment.objects.filter(pk=equipment.pk, status='IN_USE').update(
+                status='AVAILABLE', updated_at=timezone.now()
+            )
+            if not released:
+                return Response(
+                    {"error": "Equipment is not currently checked out."},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            # Find the most recent usage log without a check-in time
+            usage_log = EquipmentUsageLog.objects.filter(
+                equipment=equipment,
+                check_in_time__isnull=True
+            ).order_by('-check_out_time').first()
+            
+            if not usage_log:
+                transaction.set_rollback(True)
+                return Response(
+                    {"error": "No active checkout found for this equipment."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            usage_log.check_in_time = timezone.now()
+            usage_log.notes = request.data.get('notes', '')
+            closed = EquipmentUsageLog.objects.filter(pk=usage_log.pk, check_in_time__isnull=True).update(
+                check_in_time=usage_log.check_in_time,
+                notes=usage_log.notes
+            )
+            if not closed:
+                transaction.set_rollback(True)
+                return Response(
+                    {"error": "This checkout was already closed."},
+                    status=status.HTTP_409_CONFLICT
+                )
+            record_usage([(equipment.pk, equipment.lab, usage_log.check_out_time, usage_log.check_in_time)])
+            transaction.on_commit(lambda: scan_cache.invalidate(equipment.pk))
+            transaction.on_commit(dashboard.bump_version)
+        
+        return Response(EquipmentUsageLogSerializer(usage_log).data)
+    
+    def _resolve_kit(self, data):
+        """
+        Fetch every requested item in one query, locking the rows on backends
+        that support it. Returns (item, equipment) pairs in request order, with
+        None for items that do not exist.
+        """
+        found = list(Equipment.objects.select_for_update().filter(
+            Q(id__in=data['equipment_ids']) | Q(barcode__in=data['barcodes'])
+        ).only('id', 'name', 'barcode', 'status'))
+        by_id = {item.id: item for item in found}
+        by_barcode = {item.barcode: item for item in found}
+        pairs = [({'equipment_id': pk}, by_id.get(pk)) for pk in data['equipment_ids']]
+        pairs += [({'barcode': code}, by_barcode.get(code)) for code in data['barcodes']]
+        return pairs
+    
+    def _check_kit(self, pairs, required_status, error_message):
+        """Build one result per requested item; returns (results, ready) where ready maps equipment id -> result."""
+        results, ready = [], {}
+        for item, equipment in pairs:
+            result = {**item, 'equipment': equipment.id if equipment else None, 'status': 'error', 'error': None}
+            if equipment is None:
+                result['error'] = "Equipment not found."
+            elif equipment.id in ready:
+                result['error'] = "Equipment is listed more than once."
+            elif equipment.status != required_status:
+                result['error'] = error_message.format(status=equipment.status.lower())
+            else:
+                result['status'] = 'ready'
+                ready[equipment.id] = result
+            results.append(result)
+        return results, ready
+    
+    def _kit_response(self, results, http_status):
+        for result in results:
+            if result['status'] == 'ready':
+                # Valid, but not processed because another item failed
+                result['status'] = 'skipped'
+        succeeded = sum(1 for result in results if result['status'] not in ['error', 'skipped'])
+        return Response(
+            {'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results},
+            status=http_status
+        )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_checkout(self, request):
+        params = BulkCheckoutSerializer(data=request.data)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = params.validated_data
+        
+        with transaction.atomic():
+            results, ready = self._check_kit(
+                self._resolve_kit(data), 'AVAILABLE',
+                "Equipment is currently {status}, not available for checkout."
             )
+            if not ready or (data['atomic'] and len(ready) < len(results)):
+                return self._kit_response(results, status.HTTP_409_CONFLICT)
+            
+            claimed = Equipment.objects.filter(id__in=ready, status='AVAILABLE').update(
+                status='IN_USE', updated_at=timezone.now()
+            )
+            if claimed != len(ready):
+                # Only reachable on backends without row locks
+                transaction.set_rollback(True)
+                return Response(
+                    {"error": "Some items changed while the kit was being checked out. Please retry."},
+                    status=status.HTTP_409_CONFLICT
+                )
+            
+            now = timezone.now()
+            logs = EquipmentUsageLog.objects.bulk_create([
+                EquipmentUsageLog(
+                    equipment_id=equipment_id, user=request.user,
+                    check_out_time=now, purpose=data['purpose'], notes=data['notes'] or None
+                )
+                for equipment_id in ready
+            ])
+            for log in logs:
+                ready[log.equipment_id].update(status='checked_out', usage_log=log.id)
+            equipment_ids = list(ready)
+            transaction.on_commit(lambda: scan_cache.invalidate_many(equipment_ids))
+            transaction.on_commit(dashboard.bump_version)
+        
+        return self._kit_response(results, status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_checkin(self, request):
+        params = BulkCheckoutSerializer(data=request.data)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = params.validated_data
         
-        # Find the most recent usage log without a check-in time
-        usage_log = EquipmentUsageLog.objects.filter(
-            equipment=equipment,
-            check_in_time__isnull=True
-        ).order_by('-check_out_time').first()
+        with transaction.atomic():
+            results, ready = self._check_kit(
+                self._resolve_kit(data), 'IN_USE',
+                "Equipment is {status}, not currently checked out."
+            )
+            
+            # Latest open usage log per item, all in one query (later rows win)
+            open_logs, sessions = {}, {}
+            for log_id, equipment_id, check_out_time, lab in EquipmentUsageLog.objects.filter(
+                equipment_id__in=ready, check_in_time__isnull=True
+            ).order_by('check_out_time').values_list('id', 'equipment_id', 'check_out_time', 'equipment__lab'):
+                open_logs[equipment_id] = log_id
+                sessions[equipment_id] = (lab, check_out_time)
+            for equipment_id, result in list(ready.items()):
+                if equipment_id not in open_logs:
+                    result.update(status='error', error="No active checkout found for this equipment.")
+                    del ready[equipment_id]
+            
+            if not ready or (data['atomic'] and len(ready) < len(results)):
+                return self._kit_response(results, status.HTTP_409_CONFLICT)
+            
+            released = Equipment.objects.filter(id__in=ready, status='IN_USE').update(
+                status='AVAILABLE', updated_at=timezone.now()
+            )
+            log_ids = [open_logs[equipment_id] for equipment_id in ready]
+            check_in_time = timezone.now()
+            closed = EquipmentUsageLog.objects.filter(id__in=log_ids, check_in_time__isnull=True).update(
+                check_in_time=check_in_time, notes=data['notes']
+            )
+            if released != len(ready) or closed != len(ready):
+                transaction.set_rollback(True)
+                return Response(
+                    {"error": "Some items changed while the kit was being checked in. Please retry."},
+                    status=status.HTTP_409_CONFLICT
+                )
+            record_usage([
+                (equipment_id, sessions[equipment_id][0], sessions[equipment_id][1], check_in_time)
+                for equipment_id in ready
+            ])
+            
+            for equipment_id, result in ready.items():
+                result.update(status='checked_in', usage_log=open_logs[equipment_id])
+            equipment_ids = list(ready)
+            transaction.on_commit(lambda: scan_cache.invalidate_many(equipment_ids))
+            transaction.on_commit(dashboard.bump_version)
         
-        if not usage_log:
+        return self._kit_response(results, status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_csv(self, request):
+        if 'file' not in request.FILES:
             return Response(
-                {"error": "No active checkout found for this equipment."},
+                {"error": "No CSV file provided."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        usage_log.check_in_time = timezone.now()
-        usage_log.notes = request.data.get('notes', '')
-        usage_log.save()
+        def flag(name, default):
+            return str(request.data.get(name, default)).lower() == 'true'
         
-        equipment.status = 'AVAILABLE'
-        equipment.save()
+        importer = EquipmentImporter(
+            atomic=flag('atomic', 'true'),
+            dry_run=flag('dry_run', 'false'),
+            create_categories=flag('create_categories', 'false'),
+        )
+        lines = io.TextIOWrapper(request.FILES['file'].file, encoding='utf-8-sig', newline='')
+        try:
+            result = importer.run(lines)
+        except (ImportFileError, UnicodeDecodeError, csv.Error) as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(EquipmentUsageLogSerializer(usage_log).data)
+        if not result['committed'] and not importer.dry_run:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def due_maintenance(self, request):
+        try:
+            days = int(request.query_params.get('days', DUE_SOON_DAYS))
+        except ValueError:
+            return Response({"error": "days must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        # Far enough for any schedule, and keeps the horizon a valid date
+        if not 0 <= days <= 3650:
+            return Response({"error": "days must be between 0 and 3650."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # A range scan over the (next_maintenance_date, id) index, earliest first
+        today = timezone.localdate()
+        queryset = self.get_queryset().select_related('maintenance_alert').filter(
+            next_maintenance_date__lte=today + timedelta(days=days)
+        )
+        if request.query_params.get('overdue', '').lower() == 'true':
+            queryset = queryset.filter(next_maintenance_date__lt=today)
+        page = self.paginate_queryset(queryset.order_by('next_maintenance_date', 'id'))
+        
+        data = self.get_serializer(page, many=True).data
+        for item, equipment in zip(data, page):
+            alert = getattr(equipment, 'maintenance_alert', None)
+            item['due_status'] = due_status(equipment.next_maintenance_date, today)
+            item['flagged_at'] = alert.flagged_at if alert else None
+        return self.get_paginated_response(data)
     
     @action(detail=True, methods=['post'])
     def schedule_maintenance(self, request, pk=None):
@@ -166,6 +569,7 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         equipment.last_maintenance_date = timezone.now().date()
         equipment.next_maintenance_date = None
         equipment.save()
+        MaintenanceAlert.objects.filter(equipment=equipment).delete()
         
         return Response(MaintenanceRecordSerializer(maintenance).data)
     
@@ -179,8 +583,12 @@ class EquipmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        image_file = request.FILES['image']
-        equipment.image = image_file
+        try:
+            image_fields = store_image(request.FILES['image'])
+        except InvalidImage as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        for field, value in image_fields.items():
+            setattr(equipment, field, value)
         equipment.save()
         
         return Response(
@@ -222,16 +630,19 @@ class EquipmentViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class MaintenanceRecordViewSet(viewsets.ModelViewSet):
+class MaintenanceRecordViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = MaintenanceRecord.objects.all()
     serializer_class = MaintenanceRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['equipment__name', 'description']
     ordering_fields = ['maintenance_date', 'is_completed']
+    ordering = ['-maintenance_date']
+    pagination_class = KeysetCursorPagination
+    export_resource = 'maintenance'
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'export']:
             return [
                 permissions.IsAuthenticated(),
                 OR(IsAdminUser(), OR(IsLabManagerUser(), IsTechnicianUser()))
@@ -239,7 +650,7 @@ class MaintenanceRecordViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
     
     def get_queryset(self):
-        queryset = MaintenanceRecord.objects.all()
+        queryset = MaintenanceRecord.objects.select_related('performed_by')
         
         # Filter by equipment if specified
         equipment_id = self.request.query_params.get('equipment')
@@ -254,16 +665,27 @@ class MaintenanceRecordViewSet(viewsets.ModelViewSet):
             
         return queryset
 
-class EquipmentUsageLogViewSet(viewsets.ModelViewSet):
+class EquipmentUsageLogViewSet(ExportMixin, viewsets.ModelViewSet):
     queryset = EquipmentUsageLog.objects.all()
     serializer_class = EquipmentUsageLogSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['equipment__name', 'user__username', 'purpose']
     ordering_fields = ['check_out_time', 'check_in_time']
+    ordering = ['-check_out_time']
+    pagination_class = KeysetCursorPagination
+    export_resource = 'usage-logs'
+    
+    def get_permissions(self):
+        if self.action == 'export':
+            return [
+                permissions.IsAuthenticated(),
+                OR(IsAdminUser(), OR(IsLabManagerUser(), IsTechnicianUser()))
+            ]
+        return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
-        queryset = EquipmentUsageLog.objects.all()
+        queryset = EquipmentUsageLog.objects.select_related('user')
         
         # Filter by equipment if specified
         equipment_id = self.request.query_params.get('equipment')
@@ -285,6 +707,23 @@ class EquipmentUsageLogViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(check_in_time__isnull=False)
                 
         return queryset
+    
+    # Logs written here bypass checkout/checkin, so the days they touch (before
+    # and after the change) are recomputed in the daily utilization rollup
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            rebuild_usage(usage_days(serializer.save()))
+    
+    def perform_update(self, serializer):
+        before = usage_days(serializer.instance)
+        with transaction.atomic():
+            rebuild_usage(before | usage_days(serializer.save()))
+    
+    def perform_destroy(self, instance):
+        before = usage_days(instance)
+        with transaction.atomic():
+            instance.delete()
+            rebuild_usage(before)
 
 class EquipmentTransferViewSet(viewsets.ModelViewSet):
     queryset = EquipmentTransfer.objects.all()
@@ -293,6 +732,8 @@ class EquipmentTransferViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['equipment__name', 'from_lab', 'to_lab']
     ordering_fields = ['transfer_date', 'return_date']
+    ordering = ['-transfer_date']
+    pagination_class = KeysetCursorPagination
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -303,7 +744,7 @@ class EquipmentTransferViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
     
     def get_queryset(self):
-        queryset = EquipmentTransfer.objects.all()
+        queryset = EquipmentTransfer.objects.select_related('equipment', 'transferred_by')
         
         # Filter by equipment if specified
         equipment_id = self.request.query_params.get('equipment')
@@ -324,4 +765,166 @@ class EquipmentTransferViewSet(viewsets.ModelViewSet):
             else:
                 queryset = queryset.filter(return_date__isnull=False)
                 
-        return queryset
\ No newline at end of file
+        return queryset
+
+
+class InventoryDashboardView(APIView):
+    """
+    Status x lab x category counts, active checkouts, items in maintenance
+    and overdue maintenance, cached until the inventory next changes.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        return Response(dashboard.get_dashboard())
+
+
+class ActiveCheckoutsView(APIView):
+    """
+    Who has what right now: open checkouts grouped by lab and holder, with
+    how long each item has been out and how far past the overdue limit it is.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        user = request.query_params.get('user')
+        if user and not user.isdigit():
+            return Response({"error": "user must be a user ID."}, status=status.HTTP_400_BAD_REQUEST)
+        now = timezone.now()
+        rows = open_checkouts(
+            lab=request.query_params.get('lab'),
+            user_id=user,
+            overdue_only=request.query_params.get('overdue', '').lower() == 'true',
+            now=now
+        )
+        return Response(group_by_holder(rows, now))
+
+
+class UtilizationRangeMixin:
+    """Shared start/end parsing for the utilization endpoints (default: last 30 days)."""
+    max_days = 366
+    
+    def get_range(self, request):
+        """Return (start, end) dates; raises ValueError with a user-facing message."""
+        try:
+            end = datetime.strptime(request.query_params['end'], '%Y-%m-%d').date() \
+                if request.query_params.get('end') else timezone.localdate()
+            start = datetime.strptime(request.query_params['start'], '%Y-%m-%d').date() \
+                if request.query_params.get('start') else end - timedelta(days=29)
+        except ValueError:
+            raise ValueError("Invalid date format. Please use YYYY-MM-DD.")
+        if start > end:
+            raise ValueError("start must not be after end.")
+        if (end - start).days >= self.max_days:
+            raise ValueError(f"The range may span at most {self.max_days} days.")
+        return start, end
+
+
+class UtilizationHeatmapView(UtilizationRangeMixin, APIView):
+    """
+    Seconds in use per day from the daily rollup, one cell per
+    (equipment or lab, day) that saw any use.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        try:
+            start, end = self.get_range(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        group_by = request.query_params.get('group_by', 'equipment')
+        if group_by not in ['equipment', 'lab']:
+            return Response(
+                {"error": "Invalid group_by. Must be 'equipment' or 'lab'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = EquipmentUtilizationDaily.objects.filter(day__range=(start, end))
+        for param, lookup in [('lab', 'lab'), ('equipment', 'equipment_id'), ('category', 'equipment__category_id')]:
+            value = request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        
+        keys = ['equipment_id', 'equipment__name'] if group_by == 'equipment' else ['lab']
+        cells = queryset.values(*keys, 'day').annotate(
+            total_seconds=Sum('seconds_in_use'), total_sessions=Sum('sessions')
+        ).order_by(*keys, 'day')
+        
+        return Response({
+            'start': start,
+            'end': end,
+            'group_by': group_by,
+            'cells': [
+                {
+                    **({'equipment': cell['equipment_id'], 'equipment_name': cell['equipment__name']}
+                       if group_by == 'equipment' else {'lab': cell['lab']}),
+                    'day': cell['day'],
+                    'seconds_in_use': cell['total_seconds'],
+                    'sessions': cell['total_sessions'],
+                }
+                for cell in cells
+            ],
+        })
+
+
+class UtilizationTopView(UtilizationRangeMixin, APIView):
+    """
+    Top-N busiest (`order=busy`) or most idle (`order=idle`) equipment over a
+    range. Items without any rollup rows count as zero use, so never-used
+    equipment shows up as idle.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+    
+    def get(self, request):
+        try:
+            start, end = self.get_range(request)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        order = request.query_params.get('order', 'busy')
+        if order not in ['busy', 'idle']:
+            return Response(
+                {"error": "Invalid order. Must be 'busy' or 'idle'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Restrict the join itself to the range so only those rollup rows are read
+        queryset = Equipment.objects.annotate(
+            in_range=FilteredRelation('utilization', condition=Q(utilization__day__range=(start, end)))
+        ).annotate(
+            total_seconds=Coalesce(Sum('in_range__seconds_in_use'), 0),
+            total_sessions=Coalesce(Sum('in_range__sessions'), 0)
+        )
+        lab = request.query_params.get('lab')
+        if lab:
+            queryset = queryset.filter(lab=lab)
+        category = request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category_id=category)
+        
+        ordering = ['-total_seconds', 'id'] if order == 'busy' else ['total_seconds', 'id']
+        rows = queryset.order_by(*ordering).values(
+            'id', 'name', 'lab', 'status', 'total_seconds', 'total_sessions'
+        )[:max(limit, 0)]
+        
+        return Response({
+            'start': start,
+            'end': end,
+            'order': order,
+            'results': [
+                {
+                    'equipment': row['id'],
+                    'name': row['name'],
+                    'lab': row['lab'],
+                    'status': row['status'],
+                    'seconds_in_use': row['total_seconds'],
+                    'hours_in_use': round(row['total_seconds'] / 3600, 2),
+                    'sessions': row['total_sessions'],
+                }
+                for row in rows
+            ],
+        })
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -94,9 +95,41 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Take the write lock when a transaction starts so concurrent
+            # writers queue on the busy timeout instead of failing to upgrade
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        "TEST": {
+            # A file rather than shared-cache memory, so threaded tests see
+            # the same locking behaviour as the real database
+            "NAME": BASE_DIR / "test_db.sqlite3",
+        },
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+
+CACHES = {
+    # Cached payloads (calendars, dashboards) live in each worker
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Version stamps every process must agree on, so a write made by one
+    # worker (or a management command) invalidates what the others cached
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "OFFLINEIMS_SHARED_CACHE_DIR", os.path.join(tempfile.gettempdir(), "offlineIMS-cache")
+        ),
+    },
+}
+
+# Points the shared cache at a throwaway directory for each run
+TEST_RUNNER = 'offlineIMS.testing.TestRunner'
+
 AUTH_USER_MODEL = 'users.User'
 
 # Password validation
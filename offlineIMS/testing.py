@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from inventory.models import Equipment
+
+
+def make_equipment(category, index, **kwargs):
+    defaults = {
+        'name': f"Item {index}",
+        'serial_number': f"SN-{index:05d}",
+        'barcode': f"BC-{index:05d}",
+        'category': category,
+        'lab': 'IVE',
+    }
+    defaults.update(kwargs)
+    return Equipment.objects.create(**defaults)
+
+
+def query_plan(queryset):
+    """SQLite's EXPLAIN QUERY PLAN for a queryset, as one string."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+class QueryPlanMixin:
+    """
+    Runs EXPLAIN QUERY PLAN over every SELECT an endpoint issues and fails
+    if any of them falls back to a full scan. Index searches and temp
+    B-trees for ORDER BY are fine; `SCAN <table>` is not, unless it walks
+    one of `walkable_indexes` (partial indexes that only hold the rows
+    being listed).
+    """
+    walkable_indexes = ['inventory_maint_open_idx', 'inventory_usage_open_idx', 'projects_task_open_due_idx']
+
+    def assertNoFullScans(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, url)
+        tables = set(connection.introspection.table_names())
+        for query in queries.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plan = [row[-1] for row in cursor.fetchall()]
+            # Subqueries and window-function steps show up as SCAN too; only tables count
+            scans = [
+                line for line in plan
+                if line.startswith('SCAN ') and line.split()[1] in tables
+                and line.split(' INDEX ')[-1] not in self.walkable_indexes
+            ]
+            self.assertFalse(scans, f"{url} {params or ''} scans a whole table:\n{query['sql']}\n" + '\n'.join(plan))
+        return response
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the suite with the shared cache in a fresh temporary directory, so
+    tests never read or bump the version stamps of a development server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.shared_cache_dir = tempfile.mkdtemp(prefix='offlineIMS-test-cache-')
+        caches = {**settings.CACHES, 'shared': {**settings.CACHES['shared'], 'LOCATION': self.shared_cache_dir}}
+        self.cache_override = override_settings(CACHES=caches)
+        self.cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_override.disable()
+        shutil.rmtree(self.shared_cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 01:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='projects_pr_project_91c96a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(condition=models.Q(('status__in', ['TODO', 'IN_PROGRESS'])), fields=['due_date'], name='projects_task_open_due_idx'),
+        ),
+    ]
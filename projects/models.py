@@ -65,6 +65,16 @@ class ProjectTask(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status', 'due_date']),
+            # Open tasks only; backs ?overdue=true
+            models.Index(
+                fields=['due_date'], condition=models.Q(status__in=['TODO', 'IN_PROGRESS']),
+                name='projects_task_open_due_idx'
+            ),
+        ]
+    
     def __str__(self):
         return f"{self.title} - {self.project.title}"
 
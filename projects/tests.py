@@ -1,3 +1,38 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from offlineIMS.testing import QueryPlanMixin
+from .models import Project, ProjectTask
+
+User = get_user_model()
+
+
+class ProjectQueryPlanTests(QueryPlanMixin, APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='pass', role='LAB_MANAGER')
+        self.project = Project.objects.create(
+            title='Prosthetic hand', description='Open source hand', lab='IVE',
+            start_date=date.today(), created_by=self.manager
+        )
+        for i, status in enumerate(['TODO', 'IN_PROGRESS', 'COMPLETED'] * 2):
+            ProjectTask.objects.create(
+                project=self.project, title=f"Task {i}", description='Work', status=status,
+                due_date=date.today() - timedelta(days=i), created_by=self.manager
+            )
+        self.client.force_authenticate(self.manager)
+
+    def test_task_filters_use_indexes(self):
+        for params in [
+            {'project': self.project.id},
+            {'project': self.project.id, 'status': 'TODO'},
+            {'overdue': 'true'},
+        ]:
+            with self.subTest(params=params):
+                self.assertNoFullScans('/api/projects/tasks/', params)
+
+    def test_project_routes_do_not_shadow_tasks(self):
+        response = self.client.get('/api/projects/tasks/', {'project': self.project.id})
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(self.client.get(f'/api/projects/{self.project.id}/').data['title'], 'Prosthetic hand')
@@ -5,10 +5,11 @@ from .views import (
 )
 
 router = DefaultRouter()
-router.register(r'', ProjectViewSet)
 router.register(r'documents', ProjectDocumentViewSet)
 router.register(r'tasks', ProjectTaskViewSet)
 router.register(r'resources', ProjectResourceViewSet)
+# Registered last: its detail route would otherwise swallow the prefixes above
+router.register(r'', ProjectViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),